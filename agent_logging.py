@@ -0,0 +1,51 @@
+"""
+Logging Setup for DeepAgent Financial Systems
+Routes agent/tool output through a QueueHandler so formatting and terminal writes
+happen on a background thread instead of blocking tool calls or the event loop
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+from config import config
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener = None
+
+def _start_listener() -> None:
+    """Start the shared background listener that writes queued records to stdout"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    _listener = logging.handlers.QueueListener(
+        _log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a module logger backed by the shared queue.
+    Level comes from LOG_LEVEL (set WARNING to silence progress output entirely).
+    """
+    _start_listener()
+
+    logger = logging.getLogger(name)
+    if not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        logger.setLevel(config.LOG_LEVEL.upper())
+        # Records are already handled by the queue - don't duplicate via root
+        logger.propagate = False
+    return logger
+
+def flush_logs() -> None:
+    """Block until every queued record has been written (call before interactive prompts)"""
+    if _listener is not None:
+        _log_queue.join()
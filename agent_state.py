@@ -5,26 +5,31 @@ Based on LangChain deep-agents-from-scratch patterns with financial data focus
 
 from typing import Annotated, Dict, List, Optional, Any, TypedDict, Literal
 from typing_extensions import TypedDict
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langgraph.graph.message import add_messages
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, RemoveMessage
+from langgraph.graph.message import add_messages, REMOVE_ALL_MESSAGES
+from collections import OrderedDict, deque
 from datetime import datetime
-from datetime import timedelta
-import json
+import sys
+import time
 
-# TODO Task Status Types
-TodoStatus = Literal["pending", "in_progress", "completed", "cancelled"]
+import numpy as np
 
-class TodoItem(TypedDict):
-    """Individual TODO item for task planning"""
-    id: str
-    task: str
-    status: TodoStatus
-    created_at: str
-    updated_at: str
-    priority: Literal["low", "medium", "high", "urgent"]
-    assigned_agent: Optional[str]
-    dependencies: List[str]
-    metadata: Dict[str, Any]
+from config import config
+# TODO types and reducers live in the lightweight todo_state module (re-exported here)
+from todo_state import TodoStatus, TodoItem, TodoAgentState, merge_todos, move_todo_ids
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to NumPy vectorization
+    njit = None
+
+# Intern the keys shared by every todo/file/cache item so all items reference
+# a single string object per key (keys built at runtime are not auto-interned)
+_HOT_STATE_KEYS = tuple(sys.intern(key) for key in (
+    "id", "task", "status", "created_at", "updated_at", "priority",
+    "name", "content", "timestamp", "expiry", "symbol", "data_type",
+    "data", "operation", "filename", "size"
+))
 
 class FileSystemItem(TypedDict):
     """Virtual file system item"""
@@ -41,8 +46,8 @@ class FinancialDataCache(TypedDict):
     symbol: str
     data_type: str
     data: Dict[str, Any]
-    timestamp: str
-    expiry: str
+    timestamp: float  # Epoch seconds when the data was cached
+    expiry: float  # Epoch seconds, compared directly against time.time()
 
 class SubAgentInfo(TypedDict):
     """Information about sub-agents"""
@@ -62,31 +67,34 @@ class DeepAgentState(TypedDict):
     # Core messaging
     messages: Annotated[List[BaseMessage], add_messages]
     
-    # Task Planning (from notebook 2)
-    todos: List[TodoItem]
+    # Task Planning (from notebook 2) - todos keyed by id in creation order, plus
+    # each status's ids so status reports and updates never scan the whole list
+    todos: Annotated[Dict[str, TodoItem], merge_todos]
+    todo_ids_by_status: Annotated[Dict[TodoStatus, Dict[str, None]], move_todo_ids]
     current_task: Optional[str]
     planning_context: Dict[str, Any]
     
     # Virtual File System (from notebook 3)
     files: Dict[str, FileSystemItem]
     current_directory: str
-    file_operations_log: List[Dict[str, Any]]
+    file_operations_log: "deque[Dict[str, Any]]"
     
     # Sub-Agent Management (from notebook 4)
     sub_agents: Dict[str, SubAgentInfo]
     active_sub_agents: List[str]
-    delegation_history: List[Dict[str, Any]]
+    delegation_history: "deque[Dict[str, Any]]"
     
     # Financial Data Management
-    financial_cache: Dict[str, FinancialDataCache]
+    financial_cache: "OrderedDict[str, FinancialDataCache]"
+    _last_cache_sweep: float
     watchlist: List[str]
     portfolio: Dict[str, Dict[str, Any]]
     market_data: Dict[str, Any]
     
     # Research and Analysis (from notebook 5)
     research_context: Dict[str, Any]
-    analysis_results: List[Dict[str, Any]]
-    web_search_results: List[Dict[str, Any]]
+    analysis_results: "deque[Dict[str, Any]]"
+    web_search_results: "deque[Dict[str, Any]]"
     
     # Agent Control
     iteration_count: int
@@ -100,7 +108,38 @@ class DeepAgentState(TypedDict):
     user_preferences: Dict[str, Any]
     conversation_context: Dict[str, Any]
 
-# Helper functions for state management
+# Numeric kernels
+
+def _expired_mask_numpy(expiries: np.ndarray, now: float) -> np.ndarray:
+    """Boolean mask of cache expiries that are already in the past"""
+    return expiries < now
+
+if njit is not None:
+    # Lazily compiled by the first cache sweep (cache=True reuses the machine code across
+    # runs), so importing agent state never pays for the JIT
+    @njit(cache=True)
+    def _expired_mask(expiries, now):
+        mask = np.empty(expiries.shape[0], dtype=np.bool_)
+        for i in range(expiries.shape[0]):
+            mask[i] = expiries[i] < now
+        return mask
+else:
+    _expired_mask = _expired_mask_numpy
+
+def _sweep_expired(cache: "OrderedDict[str, FinancialDataCache]", now: float) -> None:
+    """Drop every expired entry from the cache in a single vectorized pass"""
+    keys = list(cache)
+    expiries = np.fromiter(
+        (cache[key]["expiry"] for key in keys), dtype=np.float64, count=len(keys)
+    )
+    for index in np.flatnonzero(_expired_mask(expiries, now)):
+        del cache[keys[index]]
+
+# Helper functions for state management.
+# The todos and sub_agents helpers are copy-on-write: they return a new top-level state
+# with fresh containers for the branches they touch. The file and financial cache helpers
+# update the state in place instead (files, the bounded file_operations_log ring buffer and
+# the LRU financial_cache), since copying them on every call would make each write O(capacity).
 
 def create_initial_state(
     user_message: str,
@@ -108,40 +147,43 @@ def create_initial_state(
     max_iterations: int = 50
 ) -> DeepAgentState:
     """Create initial agent state"""
-    if not session_id:
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    now_dt = datetime.now()
+    now = now_dt.isoformat()
     
-    now = datetime.now().isoformat()
+    if not session_id:
+        session_id = f"session_{now_dt.strftime('%Y%m%d_%H%M%S')}"
     
     return DeepAgentState(
         # Core messaging
         messages=[HumanMessage(content=user_message)],
         
         # Task Planning
-        todos=[],
+        todos={},
+        todo_ids_by_status={"pending": {}, "in_progress": {}, "completed": {}, "cancelled": {}},
         current_task=None,
         planning_context={},
         
         # Virtual File System
         files={},
         current_directory="/",
-        file_operations_log=[],
+        file_operations_log=deque(maxlen=config.MAX_FILE_OPS_LOG),
         
         # Sub-Agent Management
         sub_agents={},
         active_sub_agents=[],
-        delegation_history=[],
+        delegation_history=deque(maxlen=config.MAX_LOG_ENTRIES),
         
         # Financial Data Management
-        financial_cache={},
+        financial_cache=OrderedDict(),
+        _last_cache_sweep=time.time(),
         watchlist=[],
         portfolio={},
         market_data={},
         
         # Research and Analysis
         research_context={},
-        analysis_results=[],
-        web_search_results=[],
+        analysis_results=deque(maxlen=config.MAX_LOG_ENTRIES),
+        web_search_results=deque(maxlen=config.MAX_LOG_ENTRIES),
         
         # Agent Control
         iteration_count=0,
@@ -163,12 +205,13 @@ def add_todo_item(
     assigned_agent: Optional[str] = None,
     dependencies: List[str] = None
 ) -> DeepAgentState:
-    """Add a new TODO item to the state"""
+    """Add a new TODO item, returning a new state that shares untouched branches"""
     if dependencies is None:
         dependencies = []
     
-    now = datetime.now().isoformat()
-    todo_id = f"todo_{len(state['todos']) + 1}_{datetime.now().strftime('%H%M%S')}"
+    now_dt = datetime.now()
+    now = now_dt.isoformat()
+    todo_id = f"todo_{len(state['todos']) + 1}_{now_dt.strftime('%H%M%S')}"
     
     new_todo = TodoItem(
         id=todo_id,
@@ -182,9 +225,13 @@ def add_todo_item(
         metadata={}
     )
     
-    state["todos"].append(new_todo)
-    state["last_activity"] = now
-    return state
+    # Copy-on-write: only the touched branches get new containers
+    return {
+        **state,
+        "todos": merge_todos(state["todos"], {todo_id: new_todo}),
+        "todo_ids_by_status": move_todo_ids(state["todo_ids_by_status"], {"pending": {todo_id: None}}),
+        "last_activity": now
+    }
 
 def update_todo_status(
     state: DeepAgentState,
@@ -192,19 +239,26 @@ def update_todo_status(
     status: TodoStatus,
     metadata: Dict[str, Any] = None
 ) -> DeepAgentState:
-    """Update the status of a TODO item"""
+    """Update the status of a TODO item, returning a new state that shares untouched branches"""
     now = datetime.now().isoformat()
     
-    for todo in state["todos"]:
-        if todo["id"] == todo_id:
-            todo["status"] = status
-            todo["updated_at"] = now
-            if metadata:
-                todo["metadata"].update(metadata)
-            break
+    todo = state["todos"].get(todo_id)
+    if not todo:
+        return {**state, "last_activity": now}
     
-    state["last_activity"] = now
-    return state
+    updated_todo = {
+        **todo,
+        "status": status,
+        "updated_at": now,
+        "metadata": {**todo["metadata"], **metadata} if metadata else todo["metadata"]
+    }
+    
+    return {
+        **state,
+        "todos": merge_todos(state["todos"], {todo_id: updated_todo}),
+        "todo_ids_by_status": move_todo_ids(state["todo_ids_by_status"], {status: {todo_id: None}}),
+        "last_activity": now
+    }
 
 def write_file(
     state: DeepAgentState,
@@ -212,8 +266,9 @@ def write_file(
     content: str,
     file_type: Literal["file", "directory"] = "file"
 ) -> DeepAgentState:
-    """Write content to virtual file system"""
+    """Write content to virtual file system (updates the state in place and returns it)"""
     now = datetime.now().isoformat()
+    size = len(content)
     
     file_item = FileSystemItem(
         name=filename,
@@ -221,29 +276,27 @@ def write_file(
         type=file_type,
         created_at=now,
         updated_at=now,
-        size=len(content),
+        size=size,
         metadata={}
     )
     
-    state["files"][filename] = file_item
-    
-    # Log the operation
-    operation = {
+    # Log the operation (bounded ring buffer, shared in place)
+    state["file_operations_log"].append({
         "operation": "write",
         "filename": filename,
         "timestamp": now,
-        "size": len(content)
-    }
-    state["file_operations_log"].append(operation)
-    state["last_activity"] = now
+        "size": size
+    })
     
+    state["files"][filename] = file_item
+    state["last_activity"] = now
     return state
 
 def read_file(state: DeepAgentState, filename: str) -> Optional[str]:
     """Read content from virtual file system"""
     file_item = state["files"].get(filename)
     if file_item:
-        # Log the operation
+        # Log the operation (bounded ring buffer, shared in place)
         now = datetime.now().isoformat()
         operation = {
             "operation": "read",
@@ -268,23 +321,41 @@ def cache_financial_data(
     symbol: str,
     data_type: str,
     data: Dict[str, Any],
-    expiry_minutes: int = 15
+    expiry_minutes: Optional[int] = None
 ) -> DeepAgentState:
-    """Cache financial data to avoid redundant API calls"""
-    now = datetime.now()
-    expiry = now + timedelta(minutes=expiry_minutes)
+    """Cache financial data to avoid redundant API calls (updates the state in place and returns it)"""
+    if expiry_minutes is None:
+        expiry_minutes = config.DATA_TYPE_TTL.get(data_type, config.DEFAULT_CACHE_TTL)
+    
+    now_dt = datetime.now()
+    now = now_dt.isoformat()
+    now_ts = time.time()
+    expiry = now_ts + expiry_minutes * 60
+    
+    cache = state["financial_cache"]
+    
+    # Opportunistically drop expired entries that are never read again
+    if now_ts - state["_last_cache_sweep"] > config.CACHE_SWEEP_INTERVAL:
+        _sweep_expired(cache, now_ts)
+        state["_last_cache_sweep"] = now_ts
     
     cache_key = f"{symbol}_{data_type}"
     cache_item = FinancialDataCache(
         symbol=symbol,
         data_type=data_type,
         data=data,
-        timestamp=now.isoformat(),
-        expiry=expiry.isoformat()
+        timestamp=now_ts,
+        expiry=expiry
     )
     
-    state["financial_cache"][cache_key] = cache_item
-    state["last_activity"] = now.isoformat()
+    cache[cache_key] = cache_item
+    cache.move_to_end(cache_key)
+    
+    # Enforce LRU capacity
+    while len(cache) > config.MAX_CACHE_ENTRIES:
+        cache.popitem(last=False)
+    
+    state["last_activity"] = now
     return state
 
 def get_cached_financial_data(
@@ -292,14 +363,13 @@ def get_cached_financial_data(
     symbol: str,
     data_type: str
 ) -> Optional[Dict[str, Any]]:
-    """Retrieve cached financial data if not expired"""
+    """Retrieve cached financial data if not expired (refreshes LRU order in place)"""
     cache_key = f"{symbol}_{data_type}"
     cache_item = state["financial_cache"].get(cache_key)
     
     if cache_item:
-        now = datetime.now()
-        expiry = datetime.fromisoformat(cache_item["expiry"])
-        if now < expiry:
+        if time.time() < cache_item["expiry"]:
+            state["financial_cache"].move_to_end(cache_key)
             return cache_item["data"]
         else:
             # Remove expired cache
@@ -313,7 +383,7 @@ def register_sub_agent(
     description: str,
     tools: List[str]
 ) -> DeepAgentState:
-    """Register a new sub-agent"""
+    """Register a new sub-agent, returning a new state that shares untouched branches"""
     now = datetime.now().isoformat()
     
     sub_agent = SubAgentInfo(
@@ -326,9 +396,7 @@ def register_sub_agent(
         results=None
     )
     
-    state["sub_agents"][name] = sub_agent
-    state["last_activity"] = now
-    return state
+    return {**state, "sub_agents": {**state["sub_agents"], name: sub_agent}, "last_activity": now}
 
 def update_sub_agent_status(
     state: DeepAgentState,
@@ -336,17 +404,18 @@ def update_sub_agent_status(
     status: Literal["idle", "working", "completed", "error"],
     results: Optional[Dict[str, Any]] = None
 ) -> DeepAgentState:
-    """Update sub-agent status and results"""
+    """Update sub-agent status and results, returning a new state that shares untouched branches"""
     now = datetime.now().isoformat()
     
-    if agent_name in state["sub_agents"]:
-        state["sub_agents"][agent_name]["status"] = status
-        state["sub_agents"][agent_name]["last_active"] = now
-        if results:
-            state["sub_agents"][agent_name]["results"] = results
+    sub_agent = state["sub_agents"].get(agent_name)
+    if sub_agent is None:
+        return {**state, "last_activity": now}
     
-    state["last_activity"] = now
-    return state
+    updated_agent = {**sub_agent, "status": status, "last_active": now}
+    if results:
+        updated_agent["results"] = results
+    
+    return {**state, "sub_agents": {**state["sub_agents"], agent_name: updated_agent}, "last_activity": now}
 
 def get_state_summary(state: DeepAgentState) -> Dict[str, Any]:
     """Get a summary of the current state for debugging/monitoring"""
@@ -357,8 +426,8 @@ def get_state_summary(state: DeepAgentState) -> Dict[str, Any]:
         "max_iterations": state["max_iterations"],
         "message_count": len(state["messages"]),
         "todo_count": len(state["todos"]),
-        "pending_todos": len([t for t in state["todos"] if t["status"] == "pending"]),
-        "active_todos": len([t for t in state["todos"] if t["status"] == "in_progress"]),
+        "pending_todos": len(state["todo_ids_by_status"].get("pending", ())),
+        "active_todos": len(state["todo_ids_by_status"].get("in_progress", ())),
         "file_count": len(state["files"]),
         "sub_agent_count": len(state["sub_agents"]),
         "active_sub_agents": len(state["active_sub_agents"]),
@@ -368,6 +437,36 @@ def get_state_summary(state: DeepAgentState) -> Dict[str, Any]:
         "last_activity": state["last_activity"]
     }
 
+def compact_message_history(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collapse message history older than the configured window into one summary message.
+    Designed as a create_react_agent pre_model_hook so the checkpointed history and the
+    prompt sent to the model stay bounded on long ReAct loops.
+    """
+    messages = state["messages"]
+    if len(messages) <= config.MAX_MESSAGE_WINDOW:
+        return {}
+    
+    # Never start the kept window on a tool result whose tool call was dropped
+    cut = len(messages) - config.MESSAGE_WINDOW_KEEP
+    while cut < len(messages) and messages[cut].type == "tool":
+        cut += 1
+    
+    dropped = messages[:cut]
+    requests = [m.content[:200] for m in dropped if m.type == "human" and isinstance(m.content, str)]
+    summary_lines = [f"Summary of {len(dropped)} earlier messages (compacted to save context)."]
+    if requests:
+        summary_lines.append("Earlier user requests:")
+        summary_lines.extend(f"- {request}" for request in requests)
+    
+    return {
+        "messages": [
+            RemoveMessage(id=REMOVE_ALL_MESSAGES),
+            SystemMessage(content="\n".join(summary_lines)),
+            *messages[cut:]
+        ]
+    }
+
 # State validation functions
 def validate_state(state: DeepAgentState) -> List[str]:
     """Validate state consistency and return any issues"""
@@ -377,17 +476,20 @@ def validate_state(state: DeepAgentState) -> List[str]:
     if state["iteration_count"] >= state["max_iterations"]:
         issues.append(f"Iteration limit reached: {state['iteration_count']}/{state['max_iterations']}")
     
-    # Check for orphaned dependencies in TODOs
-    todo_ids = {todo["id"] for todo in state["todos"]}
-    for todo in state["todos"]:
-        for dep_id in todo["dependencies"]:
-            if dep_id not in todo_ids:
+    # Check for orphaned dependencies in TODOs (set ops first, per-TODO detail only on a hit)
+    all_deps = set().union(*(todo["dependencies"] for todo in state["todos"].values()))
+    orphan_deps = all_deps - state["todos"].keys()
+    if orphan_deps:
+        for todo in state["todos"].values():
+            for dep_id in orphan_deps.intersection(todo["dependencies"]):
                 issues.append(f"TODO {todo['id']} has orphaned dependency: {dep_id}")
     
     # Check for inactive sub-agents that are marked as active
-    for agent_name in state["active_sub_agents"]:
-        if agent_name not in state["sub_agents"]:
-            issues.append(f"Active sub-agent {agent_name} not found in sub_agents registry")
+    orphan_agents = set(state["active_sub_agents"]).difference(state["sub_agents"])
+    issues.extend(
+        f"Active sub-agent {agent_name} not found in sub_agents registry"
+        for agent_name in orphan_agents
+    )
     
     return issues
 
@@ -7,16 +7,15 @@ Implements a ReAct (Reason - Act) loop with real YFinance financial data capabil
 """
 
 import os
+import functools
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
 
 # Import our custom modules
 from config import config
+from http_clients import openai_rate_limiter
 from financial_tools import FINANCIAL_TOOLS
-from agent_state import create_initial_state, DeepAgentState
+from agent_state import create_initial_state, compact_message_history, DeepAgentState
 
 # Set up LangSmith tracing if configured
 if config.LANGSMITH_TRACING and config.LANGSMITH_API_KEY:
@@ -24,48 +23,9 @@ if config.LANGSMITH_TRACING and config.LANGSMITH_API_KEY:
     os.environ["LANGSMITH_API_KEY"] = config.LANGSMITH_API_KEY
     os.environ["LANGSMITH_PROJECT"] = config.LANGSMITH_PROJECT
 
-def create_financial_agent():
-    """
-    Create a basic ReAct agent with real financial tools
-    Similar to create_agent from deep-agents-from-scratch but with YFinance integration
-    """
-    
-    # Validate configuration
-    if not config.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
-    
-    # Initialize the language model
-    model = ChatOpenAI(
-        model=config.DEFAULT_MODEL,
-        temperature=0.1,
-        api_key=config.OPENAI_API_KEY
-    )
-    
-    # Add web search capability if Tavily is configured
-    tools = FINANCIAL_TOOLS.copy()
-    
-    if config.TAVILY_API_KEY:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        web_search = TavilySearchResults(
-            api_key=config.TAVILY_API_KEY,
-            max_results=5,
-            search_depth="advanced"
-        )
-        tools.append(web_search)
-        print("✓ Web search enabled with Tavily")
-    else:
-        print("⚠ Web search disabled - set TAVILY_API_KEY to enable")
-    
-    # Create memory for conversation persistence
-    memory = MemorySaver()
-    
-    # Create the ReAct agent with financial focus
-    agent = create_react_agent(
-        model=model,
-        tools=tools,
-        checkpointer=memory,
-        # Add custom system message for financial focus
-        prompt="""You are a sophisticated financial analysis AI agent specializing in real-time market data analysis. You have access to live financial data through YFinance and provide institutional-quality financial insights.
+# System prompt for the financial agent - defined once at import so every
+# agent build reuses the same string (and OpenAI sees an identical prefix)
+_FINANCIAL_SYSTEM_PROMPT = """You are a sophisticated financial analysis AI agent specializing in real-time market data analysis. You have access to live financial data through YFinance and provide institutional-quality financial insights.
 
 **Your Specializations:**
 1. **Real-Time Stock Analysis**: Current prices, fundamentals, and technical indicators using live YFinance data
@@ -125,6 +85,66 @@ def create_financial_agent():
 Remember: You provide informational analysis only - not personalized financial advice. Always recommend consulting qualified financial advisors for investment decisions.
 
 Your analysis should meet institutional research standards while being accessible and actionable for investors seeking data-driven market insights."""
+
+# Prebuilt system message reused by every agent build, so each model call
+# gets the same immutable object and a byte-identical (cacheable) prefix
+_SYSTEM_MSG = SystemMessage(content=_FINANCIAL_SYSTEM_PROMPT)
+
+def create_financial_agent():
+    """
+    Create a basic ReAct agent with real financial tools
+    Similar to create_agent from deep-agents-from-scratch but with YFinance integration
+    
+    The agent (model client + MemorySaver) is built once per process and reused;
+    conversations stay isolated through the thread_id in each run's config.
+    """
+    return _build_financial_agent()
+
+@functools.lru_cache(maxsize=1)
+def _build_financial_agent():
+    """Build the financial ReAct agent (memoized by create_financial_agent)"""
+    # Heavy imports deferred so importing this module stays cheap
+    from langchain_openai import ChatOpenAI
+    from langgraph.prebuilt import create_react_agent
+    from langgraph.checkpoint.memory import MemorySaver
+    
+    # Validate configuration
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY is required. Please set it in your .env file.")
+    
+    # Initialize the language model
+    model = ChatOpenAI(
+        model=config.DEFAULT_MODEL,
+        temperature=0.1,
+        api_key=config.OPENAI_API_KEY,
+        rate_limiter=openai_rate_limiter
+    )
+    
+    # Add web search capability if Tavily is configured
+    tools = FINANCIAL_TOOLS.copy()
+    
+    if config.TAVILY_API_KEY:
+        from langchain_community.tools.tavily_search import TavilySearchResults
+        web_search = TavilySearchResults(
+            api_key=config.TAVILY_API_KEY,
+            max_results=5,
+            search_depth="advanced"
+        )
+        tools.append(web_search)
+        print("✓ Web search enabled with Tavily")
+    else:
+        print("⚠ Web search disabled - set TAVILY_API_KEY to enable")
+    
+    # Create memory for conversation persistence
+    memory = MemorySaver()
+    
+    # Create the ReAct agent with financial focus
+    agent = create_react_agent(
+        model=model,
+        tools=tools,
+        checkpointer=memory,
+        prompt=_SYSTEM_MSG,
+        pre_model_hook=compact_message_history
     )
     
     return agent
@@ -140,6 +160,7 @@ def run_financial_query(agent, query: str, session_id: str = "basic_demo_session
     
     # Track the conversation
     messages = []
+    seen_ids = set()
     
     try:
         # Stream the agent's response
@@ -151,8 +172,10 @@ def run_financial_query(agent, query: str, session_id: str = "basic_demo_session
             if "messages" in event and event["messages"]:
                 latest_message = event["messages"][-1]
                 
-                # Only print new messages
-                if latest_message not in messages:
+                # Only print new messages (identity check - the stream re-yields the same objects)
+                message_key = id(latest_message)
+                if message_key not in seen_ids:
+                    seen_ids.add(message_key)
                     messages.append(latest_message)
                     
                     if hasattr(latest_message, 'content') and latest_message.content:
@@ -0,0 +1,46 @@
+"""
+Durable Checkpoint Maintenance for DeepAgent Financial Systems
+Housekeeping shared by every demo that keeps its session threads in the SQLite
+checkpointer, so fixed session threads and per-run sweep threads don't grow forever
+"""
+
+import logging
+import time
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint ids are uuid6: a 60-bit count of 100ns intervals since the Gregorian epoch
+_GREGORIAN_OFFSET = 0x01B21DD213814000
+
+def _checkpoint_time(checkpoint_id: str) -> float:
+    """Unix timestamp encoded in a uuid6 checkpoint id"""
+    digits = checkpoint_id.replace("-", "")
+    ticks = int(digits[:12] + digits[13:16], 16)
+    return (ticks - _GREGORIAN_OFFSET) / 1e7
+
+async def prune_checkpoints(checkpointer) -> int:
+    """Delete threads whose latest checkpoint is older than CHECKPOINT_TTL_DAYS; returns how many"""
+    cutoff = time.time() - config.CHECKPOINT_TTL_DAYS * 86400
+    
+    # One index scan for the newest checkpoint id per thread, without deserializing any checkpoint
+    await checkpointer.setup()
+    async with checkpointer.lock, checkpointer.conn.execute(
+        "SELECT thread_id, MAX(checkpoint_id) FROM checkpoints GROUP BY thread_id"
+    ) as cursor:
+        latest = await cursor.fetchall()
+    
+    stale = []
+    for thread_id, checkpoint_id in latest:
+        try:
+            if _checkpoint_time(checkpoint_id) < cutoff:
+                stale.append(thread_id)
+        except ValueError:
+            continue  # Not a uuid6 id; leave the thread alone
+    
+    for thread_id in stale:
+        await checkpointer.adelete_thread(thread_id)
+    if stale:
+        logger.info("🧹 Pruned %d stale session threads", len(stale))
+    return len(stale)
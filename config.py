@@ -4,23 +4,25 @@ Based on LangChain deep-agents-from-scratch patterns
 """
 
 import os
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 from typing import Dict, Any, Optional
 
 # Load environment variables
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Configuration class for DeepAgent Financial Systems"""
+    """Configuration class for DeepAgent Financial Systems (immutable once loaded)"""
     
     # API Keys
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
-    LANGSMITH_API_KEY: str = os.getenv("LANGSMITH_API_KEY", "")
+    OPENAI_API_KEY: str = ""
+    TAVILY_API_KEY: str = ""
+    LANGSMITH_API_KEY: str = ""
     
     # LangSmith Configuration
-    LANGSMITH_TRACING: bool = os.getenv("LANGSMITH_TRACING", "false").lower() == "true"
-    LANGSMITH_PROJECT: str = os.getenv("LANGSMITH_PROJECT", "deepagent-financial-systems")
+    LANGSMITH_TRACING: bool = False
+    LANGSMITH_PROJECT: str = "deepagent-financial-systems"
     
     # Model Configuration
     DEFAULT_MODEL: str = "gpt-4o-mini"
@@ -28,66 +30,186 @@ class Config:
     FAST_MODEL: str = "gpt-3.5-turbo"
     
     # Financial Data Configuration
-    DEFAULT_MARKET: str = os.getenv("DEFAULT_MARKET", "US")
-    DEFAULT_CURRENCY: str = os.getenv("DEFAULT_CURRENCY", "USD")
-    MAX_HISTORICAL_DAYS: int = int(os.getenv("MAX_HISTORICAL_DAYS", "365"))
+    DEFAULT_MARKET: str = "US"
+    DEFAULT_CURRENCY: str = "USD"
+    MAX_HISTORICAL_DAYS: int = 365
     
     # Agent Configuration
     MAX_ITERATIONS: int = 50
     MAX_EXECUTION_TIME: int = 300  # seconds
+    MAX_MESSAGE_WINDOW: int = 40  # compact history once it grows beyond this
+    MESSAGE_WINDOW_KEEP: int = 20  # most recent messages kept verbatim
+    SUB_AGENT_CACHE_TTL: int = 300  # seconds a sub-agent result is reused for an identical task
+    
+    # On-disk sub-agent result TTLs (seconds) - survive restarts; fundamentals change slowest
+    SUB_AGENT_DISK_CACHE_TTL: Dict[str, int] = field(default_factory=lambda: {
+        "stock_analyst": 86400,
+        "portfolio_manager": 900,
+        "risk_assessor": 900,
+        "market_researcher": 900,
+    })
+    
+    # Semantic sub-agent cache - reuse a result when a new task paraphrases a cached one
+    SEMANTIC_CACHE_ENABLED: bool = True
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # minimum cosine similarity for a hit
+    SEMANTIC_CACHE_THRESHOLDS: Dict[str, float] = field(default_factory=lambda: {
+        "risk_assessor": 0.95,
+        "market_researcher": 0.88,
+    })
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 512  # per sub-agent, least recently used evicted first
+    
+    # Durable LangGraph checkpoints (SQLite file) for the async research and delegation demos
+    CHECKPOINT_DB: str = "checkpoints.db"
+    CHECKPOINT_TTL_DAYS: int = 7  # session threads idle longer than this are pruned
+    CHECKPOINT_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes of the DB SQLite may memory-map for reads
+    STUDIO_REUSE_TTL: int = 900  # seconds a completed studio analysis is reused for the same question
     
     # File System Configuration (for virtual file system)
     MAX_FILES: int = 100
     MAX_FILE_SIZE: int = 1024 * 1024  # 1MB
+    MAX_FILE_OPS_LOG: int = 1000  # ring buffer size for file_operations_log
+    VFS_LOG_PATH: str = ".cache/vfs_writes.log"  # append-only log of virtual file writes
+    MAX_LOG_ENTRIES: int = 500  # ring buffer size for history/result logs in state
+    
+    # Financial Data Cache Configuration
+    MAX_CACHE_ENTRIES: int = 500
+    CACHE_SWEEP_INTERVAL: int = 60  # seconds between expired-entry sweeps
+    DEFAULT_CACHE_TTL: int = 15  # minutes
+    
+    # Cache TTL (minutes) aligned with how often each data type actually changes
+    DATA_TYPE_TTL: Dict[str, int] = field(default_factory=lambda: {
+        "quote": 1,
+        "intraday": 5,
+        "historical_prices": 60 * 24 * 90,
+        "fundamentals": 60 * 24 * 30,
+        "filings": 60 * 24 * 90,
+        "news": 60 * 24 * 7,
+    })
+    
+    # YFinance rate limit shared by all financial tools (token bucket)
+    YFINANCE_CALLS_PER_MINUTE: int = 4
+    YFINANCE_BURST: int = 4  # calls allowed back-to-back before throttling starts
+    
+    # YFinance Ticker/History Cache Configuration
+    TICKER_CACHE_SIZE: int = 128
+    HISTORY_CACHE_SIZE: int = 256
+    HISTORY_CACHE_TTL: int = 60  # seconds a fetched price history is reused
+    
+    # Shared HTTP connection pool for LLM calls
+    HTTP_MAX_CONNECTIONS: int = 32
+    HTTP_MAX_KEEPALIVE: int = 16
+    
+    # Proactive request throttling (shared token buckets) so parallel agents stay under
+    # the provider limits instead of hitting 429s and backing off
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_BURST: int = 20
+    TAVILY_REQUESTS_PER_MINUTE: int = 100
+    
+    # Worker threads for blocking I/O (sync YFinance calls, cache writes) under asyncio
+    MAX_IO_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
+    
+    # Web search concurrency (simultaneous Tavily requests per event loop)
+    TAVILY_MAX_CONCURRENCY: int = 5
+    
+    # Sub-agent delegations running at once per event loop (market_researcher gets its
+    # own smaller pool since it also waits on Tavily)
+    MAX_LLM_CONCURRENCY: int = 8
+    MARKET_RESEARCHER_CONCURRENCY: int = 3
+    
+    # After a sub-agent reports rate_limited/fallback_data, the supervisor stops the current
+    # workflow and refuses new delegations for this many seconds
+    DATA_LIMIT_COOLDOWN: int = 300
+    
+    # Persistent Tool Response Cache Configuration
+    TOOL_CACHE_DIR: str = ".cache"
+    
+    # Tool response TTLs (seconds) - tools without an entry are never cached
+    TOOL_CACHE_TTL: Dict[str, int] = field(default_factory=lambda: {
+        "get_stock_price": 60,
+        "get_stock_prices": 60,
+        "get_stock_history": 3600,
+        "get_financial_statements": 86400,
+        "analyze_portfolio_performance": 3600,
+        "get_market_overview": 300,
+        "calculate_risk_metrics": 3600,
+        "web_search": 600,
+    })
     
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
+    LOG_LEVEL: str = "INFO"
+    DEBUG_MODE: bool = False
+    PROFILE_NODES: bool = False  # per-node timing/memory/token report for the Studio workflow
     
-    @classmethod
-    def validate_config(cls) -> Dict[str, Any]:
+    def validate_config(self) -> Dict[str, Any]:
         """Validate configuration and return status"""
         status = {
-            "openai_configured": bool(cls.OPENAI_API_KEY),
-            "tavily_configured": bool(cls.TAVILY_API_KEY),
-            "langsmith_configured": bool(cls.LANGSMITH_API_KEY),
-            "tracing_enabled": cls.LANGSMITH_TRACING,
+            "openai_configured": bool(self.OPENAI_API_KEY),
+            "tavily_configured": bool(self.TAVILY_API_KEY),
+            "langsmith_configured": bool(self.LANGSMITH_API_KEY),
+            "tracing_enabled": self.LANGSMITH_TRACING,
         }
         return status
     
-    @classmethod
-    def get_model_settings(cls, model_type: str = "default") -> Dict[str, Any]:
+    def get_model_settings(self, model_type: str = "default") -> Dict[str, Any]:
         """Get model settings for different use cases"""
-        models = {
-            "default": {
-                "model": cls.DEFAULT_MODEL,
-                "temperature": 0.1,
-                "max_tokens": 4000,
-            },
-            "reasoning": {
-                "model": cls.REASONING_MODEL,
-                "temperature": 0.0,
-                "max_tokens": 8000,
-            },
-            "fast": {
-                "model": cls.FAST_MODEL,
-                "temperature": 0.2,
-                "max_tokens": 2000,
-            },
-            "creative": {
-                "model": cls.DEFAULT_MODEL,
-                "temperature": 0.7,
-                "max_tokens": 4000,
-            }
-        }
-        return models.get(model_type, models["default"])
+        return _MODEL_SETTINGS.get(model_type, _MODEL_SETTINGS["default"])
+
+def _load_config() -> Config:
+    """Read the environment once and build the immutable configuration"""
+    return Config(
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", ""),
+        TAVILY_API_KEY=os.getenv("TAVILY_API_KEY", ""),
+        LANGSMITH_API_KEY=os.getenv("LANGSMITH_API_KEY", ""),
+        LANGSMITH_TRACING=os.getenv("LANGSMITH_TRACING", "false").lower() == "true",
+        LANGSMITH_PROJECT=os.getenv("LANGSMITH_PROJECT", "deepagent-financial-systems"),
+        DEFAULT_MARKET=os.getenv("DEFAULT_MARKET", "US"),
+        DEFAULT_CURRENCY=os.getenv("DEFAULT_CURRENCY", "USD"),
+        MAX_HISTORICAL_DAYS=int(os.getenv("MAX_HISTORICAL_DAYS", "365")),
+        TOOL_CACHE_DIR=os.getenv("TOOL_CACHE_DIR", ".cache"),
+        SEMANTIC_CACHE_ENABLED=os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true",
+        CHECKPOINT_DB=os.getenv("CHECKPOINT_DB", "checkpoints.db"),
+        CHECKPOINT_TTL_DAYS=int(os.getenv("CHECKPOINT_TTL_DAYS", "7")),
+        STUDIO_REUSE_TTL=int(os.getenv("STUDIO_REUSE_TTL", "900")),
+        OPENAI_REQUESTS_PER_MINUTE=int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500")),
+        TAVILY_REQUESTS_PER_MINUTE=int(os.getenv("TAVILY_REQUESTS_PER_MINUTE", "100")),
+        MAX_LLM_CONCURRENCY=int(os.getenv("MAX_LLM_CONCURRENCY", "8")),
+        VFS_LOG_PATH=os.getenv("VFS_LOG_PATH", ".cache/vfs_writes.log"),
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+        DEBUG_MODE=os.getenv("DEBUG_MODE", "false").lower() == "true",
+        PROFILE_NODES=os.getenv("PROFILE", "0").lower() in ("1", "true"),
+    )
 
 # Global configuration instance
-config = Config()
+config = _load_config()
+
+# Model settings resolved once from the loaded configuration
+_MODEL_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "model": config.DEFAULT_MODEL,
+        "temperature": 0.1,
+        "max_tokens": 4000,
+    },
+    "reasoning": {
+        "model": config.REASONING_MODEL,
+        "temperature": 0.0,
+        "max_tokens": 8000,
+    },
+    "fast": {
+        "model": config.FAST_MODEL,
+        "temperature": 0.2,
+        "max_tokens": 2000,
+    },
+    "creative": {
+        "model": config.DEFAULT_MODEL,
+        "temperature": 0.7,
+        "max_tokens": 4000,
+    }
+}
 
 # Validate configuration on import
 if __name__ == "__main__":
     status = config.validate_config()
     print("Configuration Status:")
     for key, value in status.items():
-        print(f"  {key}: {'✓' if value else '✗'}")
\ No newline at end of file
+        print(f"  {key}: {'✓' if value else '✗'}")
@@ -9,49 +9,30 @@ Uses ONLY real YFinance data for all financial analysis - no mock or test data
 
 import os
 import asyncio
+import functools
+import hashlib
+import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.tools import tool
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
 
 # Import all previous modules
 from config import config
-from financial_tools import FINANCIAL_TOOLS
-from agent_state import create_initial_state, DeepAgentState
+from agent_logging import get_logger
 
-# Advanced Research Tools for Real Financial Analysis
-@tool
-def summarize_content(content: str, focus_area: str = "financial insights") -> str:
-    """
-    Summarize large amounts of real financial content with focus on specific aspects.
-    Used to distill key insights from extensive real market data analysis.
-    
-    Args:
-        content: Large text content to summarize (from real financial analysis)
-        focus_area: Specific aspect to focus on (default: financial insights)
-    
-    Returns:
-        Concise summary highlighting key points from real market data
-    """
-    word_count = len(content.split())
-    
-    if word_count < 100:
-        return f"Content is already concise ({word_count} words). No summarization needed."
-    
-    summary_ratio = min(0.3, 200 / word_count)  # Max 30% or 200 words
-    target_words = int(word_count * summary_ratio)
-    
-    print(f"📄 Summarizing {word_count} words focusing on: {focus_area}")
-    print(f"🎯 Target summary length: ~{target_words} words")
-    
-    summary = f"""
-SUMMARY - {focus_area.upper()} (Real Market Data Analysis):
+logger = get_logger(__name__)
+
+_WORD_RE = re.compile(r"\S+")
+
+# Static research tool output bodies, parsed once at import
+_SUMMARY_TEMPLATE = string.Template("""\
+SUMMARY - $focus_area (Real Market Data Analysis):
 
 Key Financial Insights:
-• Market data analysis completed using real YFinance data at {datetime.now().strftime('%Y-%m-%d %H:%M')}
+• Market data analysis completed using real YFinance data at $timestamp
 • Risk metrics calculated using actual historical performance and volatility
 • Portfolio optimization based on current real market conditions and correlations
 • Investment recommendations supported by quantitative analysis of live market data
@@ -67,37 +48,16 @@ Actionable Recommendations:
 • Portfolio allocation guidance with real correlation analysis
 
 Data Sources: YFinance real-time market data, actual financial statements
-Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-(Summarized from {word_count} words of detailed real market analysis)
-    """
-    
-    return summary.strip()
+Analysis Date: $timestamp
+(Summarized from $word_count words of detailed real market analysis)""")
 
-@tool
-def strategic_thinking(context: str, question: str) -> str:
-    """
-    Apply strategic thinking framework to real financial decisions and market analysis.
-    Helps synthesize complex real market information into actionable investment strategies.
-    
-    Args:
-        context: Current real market context and available data
-        question: Strategic question or decision to analyze
-    
-    Returns:
-        Strategic analysis with framework-based thinking using real market data
-    """
-    print(f"🧠 Strategic Analysis Framework (Real Market Data)")
-    print(f"📊 Context: {context[:100]}...")
-    print(f"❓ Question: {question}")
-    print("-" * 50)
-    
-    framework_analysis = f"""
+_STRATEGIC_TEMPLATE = string.Template("""\
 STRATEGIC THINKING FRAMEWORK - REAL FINANCIAL ANALYSIS
 
 SITUATION ASSESSMENT:
-• Market Environment: {context[:100]}...
-• Strategic Question: {question}
-• Analysis Timeframe: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+• Market Environment: $context...
+• Strategic Question: $question
+• Analysis Timeframe: $timestamp
 • Data Source: Real YFinance market data
 
 STRATEGIC FRAMEWORK USING REAL MARKET DATA:
@@ -129,41 +89,23 @@ Based on current real market data from YFinance and strategic framework analysis
 recommendations will be data-driven using actual financial metrics, real volatility 
 patterns, and current market conditions - no hypothetical or simulated data.
 
-Market Data Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-    """
-    
-    return framework_analysis.strip()
+Market Data Timestamp: $timestamp""")
 
-@tool  
-def compile_research_report(research_data: str, analysis_type: str = "comprehensive") -> str:
-    """
-    Compile comprehensive research report from real market analysis data.
-    Creates professional investment research format with executive summary based on actual data.
-    
-    Args:
-        research_data: Raw research and analysis data from real market sources
-        analysis_type: Type of report (comprehensive, summary, tactical)
-    
-    Returns:
-        Formatted research report ready for presentation with real market data
-    """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    print(f"📊 Compiling {analysis_type} research report using real market data")
-    print(f"📅 Report timestamp: {timestamp}")
-    print(f"📄 Data length: {len(research_data)} characters")
-    
-    # Create professional research report format
-    report = f"""
-═══════════════════════════════════════════════════════════════
+# Precomputed banners shared by the report body and demo output
+_BANNER = "═" * 63
+_SEP = "=" * 70
+_SEP_SHORT = "=" * 60
+
+_REPORT_TEMPLATE = string.Template(f"""\
+{_BANNER}
                     DEEPAGENT FINANCIAL RESEARCH REPORT
-                              {analysis_type.upper()} ANALYSIS
+                              $analysis_upper ANALYSIS
                               REAL MARKET DATA
-═══════════════════════════════════════════════════════════════
+{_BANNER}
 
 REPORT METADATA:
-• Analysis Date: {timestamp}
-• Report Type: {analysis_type.title()} Financial Analysis
+• Analysis Date: $timestamp
+• Report Type: $analysis_title Financial Analysis
 • Data Sources: YFinance Real-Time Market Data, Live Financial Statements
 • Methodology: Quantitative + Qualitative Multi-Agent Research with Real Data
 • Data Quality: No mock, simulated, or test data used
@@ -177,7 +119,9 @@ EXECUTIVE SUMMARY:
 • Action Items: Clear next steps with defined timelines and real price targets
 
 KEY FINDINGS FROM REAL MARKET DATA:
-{research_data[:500]}...
+$snippet...
+
+• Full Research Data: $raw_filename ($size characters, sha1 $digest)
 
 DETAILED ANALYSIS:
 [Complete analysis from specialized sub-agents using live financial data]
@@ -197,7 +141,7 @@ RECOMMENDATIONS BASED ON REAL DATA:
 
 DATA VALIDATION:
 • Market Data Source: YFinance API - Real-time market data
-• Price Data: Current market prices as of {timestamp}
+• Price Data: Current market prices as of $timestamp
 • Historical Analysis: Actual performance data, not simulated
 • Risk Calculations: Real volatility and correlation measurements
 • Financial Statements: Current actual filings and reported metrics
@@ -208,105 +152,118 @@ APPENDIX:
 • Assumptions: Key assumptions based on current market conditions
 • Disclaimers: Analysis for informational purposes only using real market data
 
-═══════════════════════════════════════════════════════════════
+{_BANNER}
                          END OF REPORT
               All data sourced from real market conditions
-═══════════════════════════════════════════════════════════════
+{_BANNER}""")
+
+# Advanced Research Tools for Real Financial Analysis
+@tool
+async def summarize_content(content: str, focus_area: str = "financial insights") -> str:
     """
+    Summarize large amounts of real financial content with focus on specific aspects.
+    Used to distill key insights from extensive real market data analysis.
     
-    # Save report reference
-    filename = f"research_report_{analysis_type}_{datetime.now().strftime('%Y%m%d_%H%M')}.md"
-    print(f"💾 Research report compiled: {filename}")
+    Args:
+        content: Large text content to summarize (from real financial analysis)
+        focus_area: Specific aspect to focus on (default: financial insights)
     
-    return report.strip()
-
-def create_deep_research_agent():
+    Returns:
+        Concise summary highlighting key points from real market data
     """
-    Create the ultimate deep research agent integrating all capabilities with REAL market data:
-    - Sub-agent delegation for specialized analysis using real data
-    - File system for context management and persistence
-    - TODO planning for complex multi-step workflows
-    - Web search for latest market news and trends
-    - ONLY real YFinance data for all financial analysis - no mock or test data
+    # Count words in one pass without materializing a list of every token
+    word_count = sum(1 for _ in _WORD_RE.finditer(content))
+    
+    if word_count < 100:
+        return f"Content is already concise ({word_count} words). No summarization needed."
+    
+    summary_ratio = min(0.3, 200 / word_count)  # Max 30% or 200 words
+    target_words = int(word_count * summary_ratio)
+    
+    logger.debug("Summarizing %d words (target ~%d) focusing on: %s", word_count, target_words, focus_area)
+    
+    summary = _SUMMARY_TEMPLATE.substitute(
+        focus_area=focus_area.upper(),
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M'),
+        word_count=word_count,
+    )
+    
+    return summary
+
+@tool
+async def strategic_thinking(context: str, question: str) -> str:
     """
+    Apply strategic thinking framework to real financial decisions and market analysis.
+    Helps synthesize complex real market information into actionable investment strategies.
     
-    if not config.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY is required")
+    Args:
+        context: Current real market context and available data
+        question: Strategic question or decision to analyze
     
-    # Use the most capable model for deep research
-    model = ChatOpenAI(
-        model=config.get_model_settings("reasoning")["model"],
-        temperature=0.05,  # Very low temperature for consistency
-        api_key=config.OPENAI_API_KEY,
-        max_tokens=8000
+    Returns:
+        Strategic analysis with framework-based thinking using real market data
+    """
+    logger.debug("Strategic analysis - context: %.100s... question: %s", context, question)
+    
+    framework_analysis = _STRATEGIC_TEMPLATE.substitute(
+        context=context[:100],
+        question=question,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M'),
     )
     
-    # Import required components
-    try:
-        from sub_agent_delegation import initialize_sub_agents, SUB_AGENTS, task
-        from file_system_agent import ls, read_file, write_file, edit_file
-        from todo_planning_agent import write_todos, update_todo, get_todo_status
-        
-        # Initialize sub-agents
-        if not SUB_AGENTS:
-            initialize_sub_agents()
-            
-    except ImportError as e:
-        print(f"⚠️ Warning: Some components not available: {e}")
-        print("🔧 Using basic configuration...")
-        # Fallback - create basic tools
-        def task(agent_name: str, task_description: str) -> str:
-            return f"Sub-agent {agent_name} would handle: {task_description}"
-        def ls(directory: str = "/") -> str:
-            return "File system not available in basic mode"
-        def read_file(filename: str) -> str:
-            return f"Would read {filename}"
-        def write_file(filename: str, content: str) -> str:
-            return f"Would write to {filename}"
-        def edit_file(filename: str, search: str, replace: str) -> str:
-            return f"Would edit {filename}"
-        def write_todos(todos: str) -> str:
-            return f"TODO list created: {todos[:100]}..."
-        def update_todo(todo_id: str, status: str, notes: str = "") -> str:
-            return f"Updated {todo_id} to {status}"
-        def get_todo_status() -> str:
-            return "TODO status not available in basic mode"
+    return framework_analysis
+
+@tool  
+async def compile_research_report(research_data: str, analysis_type: str = "comprehensive") -> str:
+    """
+    Compile comprehensive research report from real market analysis data.
+    Creates professional investment research format with executive summary based on actual data.
     
-    # Comprehensive tool set combining all capabilities
-    research_tools = [
-        # Sub-agent delegation
-        task,
-        
-        # File system management
-        ls, read_file, write_file, edit_file,
-        
-        # Task planning
-        write_todos, update_todo, get_todo_status,
-        
-        # Research and synthesis tools
-        summarize_content, strategic_thinking, compile_research_report,
-        
-        # Real financial tools for oversight - MOST IMPORTANT
-        *FINANCIAL_TOOLS
-    ]
+    Args:
+        research_data: Raw research and analysis data from real market sources
+        analysis_type: Type of report (comprehensive, summary, tactical)
     
-    # Add web search for market research
-    if config.TAVILY_API_KEY:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        web_search = TavilySearchResults(
-            api_key=config.TAVILY_API_KEY,
-            max_results=5,
-            search_depth="advanced",
-            include_domains=["bloomberg.com", "reuters.com", "wsj.com", "marketwatch.com", "cnbc.com", "sec.gov"]
-        )
-        research_tools.append(web_search)
-        print("✅ Enhanced web search enabled for financial news")
+    Returns:
+        Formatted research report ready for presentation with real market data
+    """
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M")
     
-    # Create memory for long-term context
-    memory = MemorySaver()
+    # Reference the full payload by content hash and embed only a bounded snippet,
+    # so the report stays small no matter how much sub-agent output was passed in
+    size = len(research_data)
+    digest = hashlib.sha1(research_data.encode()).hexdigest()[:12]
+    snippet = research_data[:500]
+    raw_filename = f"raw_research_{digest}.md"
+    
+    logger.debug("Compiling %s research report at %s (%d characters, sha1 %s)", analysis_type, timestamp, size, digest)
+    
+    try:
+        from file_system_agent import write_file
+        await write_file.ainvoke({"filename": raw_filename, "content": research_data})
+    except ImportError:
+        raw_filename = "(file system not available)"
+    
+    report = _REPORT_TEMPLATE.substitute(
+        analysis_upper=analysis_type.upper(),
+        analysis_title=analysis_type.title(),
+        timestamp=timestamp,
+        snippet=snippet,
+        raw_filename=raw_filename,
+        size=f"{size:,}",
+        digest=digest,
+    )
     
-    # Master system prompt for deep research with REAL DATA emphasis
-    system_prompt = """You are the Deep Research Agent for DeepAgent Financial Systems - the most sophisticated financial analysis AI available, specializing in REAL market data analysis.
+    # Save report reference
+    filename = f"research_report_{analysis_type}_{now.strftime('%Y%m%d_%H%M')}.md"
+    logger.info("💾 Research report compiled: %s", filename)
+    
+    return report
+
+# Master system prompt for deep research with REAL DATA emphasis.
+# Fully static (no interpolation) so every LLM call sends a byte-identical prefix
+# that OpenAI's automatic prompt caching can reuse.
+DEEP_RESEARCH_SYSTEM_PROMPT = """You are the Deep Research Agent for DeepAgent Financial Systems - the most sophisticated financial analysis AI available, specializing in REAL market data analysis.
 
 **MISSION**: Conduct institutional-quality financial research using ONLY real market data from YFinance, specialized sub-agents, and advanced analytical frameworks.
 
@@ -337,6 +294,7 @@ def create_deep_research_agent():
 
 2. **REAL DATA GATHERING PHASE**:
    - Delegate specialized tasks to appropriate sub-agents using YFinance data
+   - Batch independent sub-agent tasks into ONE parallel_task call instead of serial task() calls
    - Fetch only real market prices, actual volatility, and current financial statements
    - Gather latest market news and trends via web search for context
    - Save all real data results to files for reference and validation
@@ -398,12 +356,197 @@ def create_deep_research_agent():
 - This is a HARD STOP - no exceptions, no retries, no additional attempts
 
 You are the pinnacle of financial AI research capabilities using real market data. Deliver analysis that meets the highest institutional standards while being based entirely on actual, current market conditions and real financial metrics."""
+
+# Heavy dependencies (langchain_openai, langgraph prebuilt, pandas/yfinance via
+# financial_tools) are imported on first use so the demo menu and capability
+# listing start without paying for them
+@functools.cache
+def _financial_tools():
+    """Real YFinance tool set, imported on first use"""
+    from financial_tools import FINANCIAL_TOOLS
+    return FINANCIAL_TOOLS
+
+@functools.cache
+def _financial_tool_names() -> frozenset:
+    """Names of the real YFinance tools, for O(1) lookups while streaming"""
+    return frozenset(tool.name for tool in _financial_tools())
+
+@functools.cache
+def _get_research_model():
+    """Shared ChatOpenAI client for the deep research agent"""
+    from langchain_openai import ChatOpenAI
+    from http_clients import openai_http_client, openai_async_http_client, openai_rate_limiter
+    
+    return ChatOpenAI(
+        model=config.get_model_settings("reasoning")["model"],
+        temperature=0.05,  # Very low temperature for consistency
+        api_key=config.OPENAI_API_KEY,
+        max_tokens=8000,
+        http_client=openai_http_client,
+        http_async_client=openai_async_http_client,
+        rate_limiter=openai_rate_limiter
+    )
+
+@functools.cache
+def _get_memory():
+    """Process-wide checkpointer so research threads persist across scenarios"""
+    from langgraph.checkpoint.memory import MemorySaver
+    return MemorySaver()
+
+# Tool subsets per research profile - a smaller tool list means a shorter tool schema
+# on every model call. "full" (None) keeps every tool.
+_CORE_RESEARCH_TOOLS = frozenset({
+    "task", "parallel_task",
+    "write_todos", "update_todo", "get_todo_status",
+    "read_file", "write_file",
+    "compile_research_report",
+})
+
+TOOL_PROFILES: Dict[str, Optional[frozenset]] = {
+    "full": None,
+    "equity": _CORE_RESEARCH_TOOLS | {
+        "get_stock_price", "get_stock_prices", "get_stock_history", "get_financial_statements",
+        "calculate_risk_metrics", "summarize_content", "web_search",
+    },
+    "portfolio": _CORE_RESEARCH_TOOLS | {
+        "get_stock_price", "get_stock_prices", "analyze_portfolio_performance", "calculate_risk_metrics",
+        "get_market_overview", "strategic_thinking",
+    },
+    "thematic": _CORE_RESEARCH_TOOLS | {
+        "get_stock_price", "get_stock_prices", "get_financial_statements", "summarize_content",
+        "strategic_thinking", "web_search",
+    },
+    "crisis": _CORE_RESEARCH_TOOLS | {
+        "get_market_overview", "calculate_risk_metrics", "analyze_portfolio_performance",
+        "strategic_thinking", "web_search",
+    },
+}
+
+# (keyword in scenario title, profile) - first match wins
+_PROFILE_KEYWORDS = (
+    ("crisis", "crisis"),
+    ("stress", "crisis"),
+    ("volatility", "crisis"),
+    ("theme", "thematic"),
+    ("thematic", "thematic"),
+    ("portfolio", "portfolio"),
+    ("acquisition", "equity"),
+    ("stock", "equity"),
+)
+
+def classify_research_profile(query: str) -> str:
+    """Pick a tool profile from the first line of a research request"""
+    title = query.split("\n", 1)[0].lower()
+    for keyword, profile in _PROFILE_KEYWORDS:
+        if keyword in title:
+            return profile
+    return "full"
+
+@functools.cache
+def create_deep_research_agent(tool_profile: str = "full", checkpointer=None):
+    """
+    Create the ultimate deep research agent integrating all capabilities with REAL market data:
+    - Sub-agent delegation for specialized analysis using real data
+    - File system for context management and persistence
+    - TODO planning for complex multi-step workflows
+    - Web search for latest market news and trends
+    - ONLY real YFinance data for all financial analysis - no mock or test data
+    
+    tool_profile selects a subset of tools from TOOL_PROFILES ("full" keeps all of them).
+    checkpointer overrides the in-process MemorySaver (e.g. a durable SQLite saver).
+    The compiled agent is memoized per (profile, checkpointer) - repeated calls return the same graph;
+    whoever closes a checkpointer passed here should cache_clear() so its graphs can be collected.
+    """
+    
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY is required")
+    if tool_profile not in TOOL_PROFILES:
+        raise ValueError(f"Unknown tool profile '{tool_profile}'. Available: {list(TOOL_PROFILES)}")
+    
+    from langgraph.prebuilt import create_react_agent
+    from agent_state import TodoAgentState, compact_message_history
+    
+    # Use the most capable model for deep research
+    model = _get_research_model()
+    
+    # Import required components
+    try:
+        from sub_agent_delegation import initialize_sub_agents, SUB_AGENTS, task, parallel_task
+        from file_system_agent import ls, read_file, write_file, edit_file
+        from todo_planning_agent import write_todos, update_todo, get_todo_status
+        
+        # Initialize sub-agents
+        if not SUB_AGENTS:
+            initialize_sub_agents()
+            
+    except ImportError as e:
+        print(f"⚠️ Warning: Some components not available: {e}")
+        print("🔧 Using basic configuration...")
+        # Fallback - create basic tools
+        def task(agent_name: str, task_description: str) -> str:
+            return f"Sub-agent {agent_name} would handle: {task_description}"
+        def parallel_task(delegations: List[Dict[str, str]]) -> str:
+            return f"Sub-agents would handle {len(delegations)} tasks in parallel"
+        def ls(directory: str = "/") -> str:
+            return "File system not available in basic mode"
+        def read_file(filename: str) -> str:
+            return f"Would read {filename}"
+        def write_file(filename: str, content: str) -> str:
+            return f"Would write to {filename}"
+        def edit_file(filename: str, search: str, replace: str) -> str:
+            return f"Would edit {filename}"
+        def write_todos(todos: str) -> str:
+            return f"TODO list created: {todos[:100]}..."
+        def update_todo(todo_id: str, status: str, notes: str = "") -> str:
+            return f"Updated {todo_id} to {status}"
+        def get_todo_status() -> str:
+            return "TODO status not available in basic mode"
+    
+    # Comprehensive tool set combining all capabilities
+    research_tools = [
+        # Sub-agent delegation
+        task, parallel_task,
+        
+        # File system management
+        ls, read_file, write_file, edit_file,
+        
+        # Task planning
+        write_todos, update_todo, get_todo_status,
+        
+        # Research and synthesis tools
+        summarize_content, strategic_thinking, compile_research_report,
+        
+        # Real financial tools for oversight - MOST IMPORTANT
+        *_financial_tools()
+    ]
+    
+    # Add web search for market research
+    if config.TAVILY_API_KEY:
+        from web_search import AsyncTavilySearch, FINANCIAL_NEWS_DOMAINS
+        web_search = AsyncTavilySearch(
+            api_key=config.TAVILY_API_KEY,
+            max_results=5,
+            search_depth="advanced",
+            include_domains=FINANCIAL_NEWS_DOMAINS
+        )
+        research_tools.append(web_search)
+        print("✅ Enhanced web search enabled for financial news")
+    
+    allowed_tools = TOOL_PROFILES[tool_profile]
+    if allowed_tools is not None:
+        research_tools = [
+            t for t in research_tools
+            if getattr(t, "name", getattr(t, "__name__", None)) in allowed_tools
+        ]
     
     agent = create_react_agent(
         model=model,
         tools=research_tools,
-        checkpointer=memory,
-        prompt=system_prompt
+        checkpointer=checkpointer or _get_memory(),
+        prompt=DEEP_RESEARCH_SYSTEM_PROMPT,
+        # Bound the checkpointed history of the long-lived session thread
+        pre_model_hook=compact_message_history,
+        state_schema=TodoAgentState  # carries the TODO list the planning tools read and write
     )
     
     return agent
@@ -412,17 +555,50 @@ def run_deep_research_demo():
     """
     Demonstrate the complete deep research agent with complex real financial scenarios
     """
+    asyncio.run(_run_deep_research_demo())
+
+async def _run_deep_research_demo():
+    """Async body of the demo so every query streams on one event loop"""
+    # Durable checkpoints let a session thread resume across demo runs
+    try:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite not installed - research memory will not persist")
+        await _deep_research_demo_loop(None)
+        return
+    
+    from checkpoint_store import prune_checkpoints
+    
+    try:
+        async with AsyncSqliteSaver.from_conn_string(config.CHECKPOINT_DB) as checkpointer:
+            await prune_checkpoints(checkpointer)
+            await _deep_research_demo_loop(checkpointer)
+    finally:
+        # The memoized agents hold the now-closed connection - don't keep them alive
+        create_deep_research_agent.cache_clear()
+
+async def _deep_research_demo_loop(checkpointer):
+    """Interactive scenario loop, running every agent on the given checkpointer"""
+    # Sync tools (YFinance, file cache writes) and input() run on the default executor -
+    # size it for bursty blocking I/O rather than the CPU-bound default
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.MAX_IO_WORKERS, thread_name_prefix="deep-research-io")
+    )
+    
     print("🎓 DeepAgent Financial Systems - Deep Research Agent Demo")
-    print("=" * 70)
+    print(_SEP)
     
     try:
-        deep_agent = create_deep_research_agent()
-        print("✅ Deep research agent with full capabilities created successfully")
-        print("✅ All sub-agents initialized and ready for real data analysis")
-        print("✅ File system and context management enabled")
-        print("✅ REAL YFinance data integration confirmed - no mock data")
+        deep_agent = create_deep_research_agent(checkpointer=checkpointer)
+        status_lines = [
+            "✅ Deep research agent with full capabilities created successfully",
+            "✅ All sub-agents initialized and ready for real data analysis",
+            "✅ File system and context management enabled",
+            "✅ REAL YFinance data integration confirmed - no mock data",
+        ]
         if config.TAVILY_API_KEY:
-            print("✅ Web search for market intelligence enabled")
+            status_lines.append("✅ Web search for market intelligence enabled")
+        print("\n".join(status_lines))
     except Exception as e:
         print(f"❌ Failed to create deep research agent: {str(e)}")
         return
@@ -497,35 +673,72 @@ def run_deep_research_demo():
     
     # Interactive demo
     while True:
-        print(f"\n" + "=" * 70)
+        print("\n" + _SEP)
         print("Deep Research Options:")
         print("  1-5: Run comprehensive research scenario (REAL market data)")
         print("  capabilities: Show full agent capabilities")
         print("  custom: Enter your own complex research request")
         print("  quit: Exit demo")
         
-        choice = input("\nYour choice: ").strip().lower()
+        choice = (await asyncio.to_thread(input, "\nYour choice: ")).strip().lower()
         
         if choice == "quit":
             break
         elif choice == "capabilities":
             show_agent_capabilities()
         elif choice == "custom":
-            custom_query = input("Enter complex research request (will use REAL YFinance data): ").strip()
+            custom_query = (await asyncio.to_thread(input, "Enter complex research request (will use REAL YFinance data): ")).strip()
             if custom_query:
-                run_deep_research_query(deep_agent, custom_query)
+                await run_deep_research_query(deep_agent, custom_query)
         elif choice.isdigit() and 1 <= int(choice) <= len(research_scenarios):
             scenario_index = int(choice) - 1
-            run_deep_research_query(deep_agent, research_scenarios[scenario_index])
+            scenario = research_scenarios[scenario_index]
+            # Scenarios use a specialized agent with only the tools their profile needs
+            scenario_agent = create_deep_research_agent(classify_research_profile(scenario), checkpointer)
+            await run_deep_research_query(scenario_agent, scenario)
         else:
             print("Invalid choice. Please try again.")
     
+    if config.TAVILY_API_KEY:
+        from web_search import close_sessions
+        await close_sessions()
+    from http_clients import close_async_http_client
+    await close_async_http_client()
+    
     print("\n🎓 Deep research demo completed! All analysis used REAL YFinance market data.")
 
+def run_deep_research_batch(queries: List[str], max_concurrency: int = 4):
+    """
+    Run several independent research queries concurrently on one event loop
+    """
+    asyncio.run(_run_deep_research_batch(queries, max_concurrency))
+
+async def _run_deep_research_batch(queries: List[str], max_concurrency: int):
+    """Gather the queries under a semaphore, each on its own profile agent and thread"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.MAX_IO_WORKERS, thread_name_prefix="deep-research-io")
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(index: int, query: str):
+        async with semaphore:
+            agent = create_deep_research_agent(classify_research_profile(query))
+            # Separate threads so concurrent runs don't share checkpoint state
+            await run_deep_research_query(agent, query, session_id=f"deep_research_batch_{index}")
+    
+    try:
+        await asyncio.gather(*(run_one(i, query) for i, query in enumerate(queries, 1)))
+    finally:
+        if config.TAVILY_API_KEY:
+            from web_search import close_sessions
+            await close_sessions()
+        from http_clients import close_async_http_client
+        await close_async_http_client()
+
 def show_agent_capabilities():
     """Show the full capabilities of the deep research agent with real data emphasis"""
     print("\n🎓 DEEP RESEARCH AGENT CAPABILITIES (REAL DATA ONLY):")
-    print("=" * 60)
+    print(_SEP_SHORT)
     print("🤖 SUB-AGENT SPECIALISTS (Using Real Market Data):")
     print("  • Stock Analyst: Individual equity research with real fundamentals")
     print("  • Portfolio Manager: Asset allocation with actual correlation data") 
@@ -556,26 +769,23 @@ def show_agent_capabilities():
     print("  • Institutional-quality research with actual metrics")
     print("  • Quantitative analysis using live financial data")
 
-def run_deep_research_query(agent, query: str, session_id: str = "deep_research_session"):
+async def run_deep_research_query(agent, query: str, session_id: str = "deep_research_session"):
     """
     Run a comprehensive research query through the deep research agent using REAL data
     """
     config_dict = {"configurable": {"thread_id": session_id}}
     
-    print(f"\n🎓 Deep Research Query (REAL MARKET DATA ONLY):")
-    print("=" * 70)
-    print(query)
-    print("=" * 70)
-    print("⏳ Starting comprehensive research workflow with live YFinance data...")
-    print("📊 NO mock, simulated, or test data will be used - only real market conditions")
+    logger.info("\n🎓 Deep Research Query (REAL MARKET DATA ONLY):\n%s\n%s\n%s", _SEP, query, _SEP)
+    logger.info("⏳ Starting comprehensive research workflow with live YFinance data...")
     
     start_time = datetime.now()
     
     try:
-        messages = []
+        seen_ids = set()
         step_count = 0
+        financial_tool_names = _financial_tool_names()
         
-        for event in agent.stream(
+        async for event in agent.astream(
             {"messages": [HumanMessage(content=query)]},
             config=config_dict,
             stream_mode="values"
@@ -583,16 +793,17 @@ def run_deep_research_query(agent, query: str, session_id: str = "deep_research_
             if "messages" in event and event["messages"]:
                 latest_message = event["messages"][-1]
                 
-                if latest_message not in messages:
-                    messages.append(latest_message)
+                # Message ids (or object identity) avoid an O(N) deep-equality scan per event
+                message_key = getattr(latest_message, "id", None) or id(latest_message)
+                if message_key not in seen_ids:
+                    seen_ids.add(message_key)
                     step_count += 1
                     
                     if hasattr(latest_message, 'content') and latest_message.content:
                         # Show major progress updates
                         if not (hasattr(latest_message, 'tool_calls') and latest_message.tool_calls):
                             content_preview = latest_message.content[:200] + "..." if len(latest_message.content) > 200 else latest_message.content
-                            print(f"\n[Step {step_count}] 🎓 Research Progress (Real Data):")
-                            print(f"  {content_preview}")
+                            logger.info("\n[Step %d] Research Progress:\n  %s", step_count, content_preview)
                     
                     # Show tool usage for transparency
                     if hasattr(latest_message, 'tool_calls') and latest_message.tool_calls:
@@ -600,25 +811,22 @@ def run_deep_research_query(agent, query: str, session_id: str = "deep_research_
                             tool_name = tool_call['name']
                             if tool_name == 'task':
                                 agent_name = tool_call['args'].get('agent_name', 'specialist')
-                                print(f"\n🤖 Delegating to {agent_name} (using real YFinance data)...")
+                                logger.debug("Delegating to %s", agent_name)
                             elif tool_name in ['write_file', 'compile_research_report']:
-                                print(f"\n💾 {tool_name.replace('_', ' ').title()} (real data analysis)...")
+                                logger.debug("File/report tool: %s", tool_name)
                             elif tool_name in ['write_todos', 'update_todo']:
-                                print(f"\n📋 {tool_name.replace('_', ' ').title()}...")
-                            elif tool_name in [tool.name for tool in FINANCIAL_TOOLS]:
-                                print(f"\n📊 Using: {tool_name} (REAL YFinance market data)")
+                                logger.debug("Planning tool: %s", tool_name)
+                            elif tool_name in financial_tool_names:
+                                logger.debug("Financial tool: %s", tool_name)
         
         end_time = datetime.now()
         duration = end_time - start_time
         
-        print(f"\n✅ Deep research workflow completed using ONLY real market data!")
-        print(f"⏱️  Total research time: {duration}")
-        print(f"📊 Analysis steps: {step_count}")
-        print(f"🎯 Research quality: Institutional-grade with REAL YFinance data")
-        print(f"✅ Data validation: All metrics based on actual market conditions")
+        logger.info("\n✅ Deep research workflow completed using ONLY real market data!")
+        logger.info("⏱️  Total research time: %s | Analysis steps: %d", duration, step_count)
         
     except Exception as e:
-        print(f"❌ Error in deep research workflow: {str(e)}")
+        logger.error("❌ Error in deep research workflow: %s", e)
 
 if __name__ == "__main__":
     run_deep_research_demo()
\ No newline at end of file
@@ -8,9 +8,11 @@ Enables agent "memory" across conversation turns and reduces token usage
 """
 
 import os
-import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import sys
+import functools
+import orjson
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.tools import tool
@@ -19,8 +21,135 @@ from langgraph.checkpoint.memory import MemorySaver
 
 # Import our custom modules
 from config import config
-from financial_tools import FINANCIAL_TOOLS
-from agent_state import create_initial_state, write_file, read_file, list_files, DeepAgentState
+from http_clients import openai_rate_limiter
+from financial_tools import FINANCIAL_TOOLS, now_iso
+from agent_state import create_initial_state, write_file, read_file, list_files, DeepAgentState, TodoAgentState
+from todo_planning_agent import write_todos, update_todo, get_todo_status
+from vfs_log import vfs_log
+
+try:
+    from langchain_community.tools.tavily_search import TavilySearchResults
+except ImportError:  # web search is optional
+    TavilySearchResults = None
+
+def _dumps(obj) -> str:
+    """Pretty-print a JSON payload to the str LangChain tools return"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+# Sample virtual file system contents, built and serialized once at import.
+# Only the date changes per call, so it is substituted into the pre-rendered text.
+_DATE_PLACEHOLDER = "__DATE__"
+
+_SAMPLE_FILES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "/": (
+        "portfolio_analysis.json",
+        "market_research/",
+        "stock_data/", 
+        "risk_reports/",
+        "todo_list.md",
+        "investment_strategy.md"
+    ),
+    "/stock_data": (
+        "AAPL_analysis.json",
+        "TSLA_metrics.json",
+        "MSFT_financials.json",
+        "tech_sector_comparison.csv"
+    ),
+    "/market_research": (
+        "sp500_trends.json",
+        "sector_rotation_analysis.md",
+        "economic_indicators.json",
+        "volatility_report.md"
+    ),
+    "/risk_reports": (
+        "portfolio_risk_metrics.json",
+        "correlation_analysis.json",
+        "stress_test_results.md"
+    )
+})
+
+def _render_listing(directory: str, files: Tuple[str, ...]) -> str:
+    """Render one directory listing as ls prints it"""
+    lines = [f"📁 Contents of '{directory}':\n"]
+    lines.extend(f"  📁 {file}\n" if file.endswith("/") else f"  📄 {file}\n" for file in files)
+    return "".join(lines)
+
+_LS_LISTINGS: Mapping[str, str] = MappingProxyType({
+    directory: _render_listing(directory, files)
+    for directory, files in _SAMPLE_FILES.items() if files
+})
+
+_AAPL_ANALYSIS = _dumps({
+    "symbol": "AAPL",
+    "analysis_date": _DATE_PLACEHOLDER,
+    "current_price": 185.25,
+    "analysis": {
+        "recommendation": "BUY",
+        "target_price": 205.00,
+        "risk_level": "Medium",
+        "key_metrics": {
+            "pe_ratio": 28.5,
+            "revenue_growth": "8.2%",
+            "profit_margin": "23.1%"
+        }
+    },
+    "notes": "Strong fundamentals with consistent iPhone revenue and growing services segment"
+})
+
+_PORTFOLIO_ANALYSIS = _dumps({
+    "portfolio_name": "Tech Growth Portfolio",
+    "last_updated": _DATE_PLACEHOLDER,
+    "positions": [
+        {"symbol": "AAPL", "weight": 0.35, "value": 35000},
+        {"symbol": "MSFT", "weight": 0.25, "value": 25000},
+        {"symbol": "GOOGL", "weight": 0.20, "value": 20000},
+        {"symbol": "NVDA", "weight": 0.20, "value": 20000}
+    ],
+    "total_value": 100000,
+    "ytd_return": 12.5,
+    "risk_metrics": {
+        "volatility": 18.2,
+        "sharpe_ratio": 1.35,
+        "max_drawdown": -8.5
+    }
+})
+
+_MARKET_TRENDS = """# Market Trends Analysis
+Date: __DATE__
+
+## Key Findings:
+- S&P 500 showing resilience despite economic uncertainty
+- Technology sector leading with 15% YTD gains
+- Energy sector underperforming due to oil price volatility
+- Interest rate environment creating headwinds for growth stocks
+
+## Sector Performance (YTD):
+- Technology: +15.2%
+- Healthcare: +8.7%
+- Financials: +6.1%
+- Energy: -3.8%
+- Utilities: +2.1%
+
+## Market Outlook:
+Cautiously optimistic for Q4 with focus on earnings quality and Fed policy signals.
+"""
+
+def _aapl_response() -> str:
+    return _AAPL_ANALYSIS.replace(_DATE_PLACEHOLDER, now_iso())
+
+def _portfolio_response() -> str:
+    return _PORTFOLIO_ANALYSIS.replace(_DATE_PLACEHOLDER, now_iso())
+
+def _market_response() -> str:
+    return _MARKET_TRENDS.replace(_DATE_PLACEHOLDER, now_iso()[:10])
+
+# Casefolded filename substring -> sample file response (checked in insertion order)
+_READ_ROUTES = {
+    "aapl": _aapl_response,
+    "portfolio": _portfolio_response,
+    "market_research": _market_response,
+    "trends": _market_response,
+}
 
 # Virtual File System Tools
 @tool
@@ -37,48 +166,12 @@ def ls(directory: str = "/") -> str:
     """
     # This would access the actual state in a real implementation
     # For demo, we'll simulate a file system with financial data
-    
-    sample_files = {
-        "/": [
-            "portfolio_analysis.json",
-            "market_research/",
-            "stock_data/", 
-            "risk_reports/",
-            "todo_list.md",
-            "investment_strategy.md"
-        ],
-        "/stock_data": [
-            "AAPL_analysis.json",
-            "TSLA_metrics.json",
-            "MSFT_financials.json",
-            "tech_sector_comparison.csv"
-        ],
-        "/market_research": [
-            "sp500_trends.json",
-            "sector_rotation_analysis.md",
-            "economic_indicators.json",
-            "volatility_report.md"
-        ],
-        "/risk_reports": [
-            "portfolio_risk_metrics.json",
-            "correlation_analysis.json",
-            "stress_test_results.md"
-        ]
-    }
-    
-    files = sample_files.get(directory, [])
+    files = _SAMPLE_FILES.get(directory, ())
     
     if not files:
         return f"Directory '{directory}' is empty or does not exist."
     
-    result = f"📁 Contents of '{directory}':\n"
-    for file in files:
-        if file.endswith("/"):
-            result += f"  📁 {file}\n"
-        else:
-            result += f"  📄 {file}\n"
-    
-    return result
+    return _LS_LISTINGS[directory]
 
 @tool
 def read_file(filename: str) -> str:
@@ -95,66 +188,13 @@ def read_file(filename: str) -> str:
     # In a real implementation, this would read from the agent state
     # For demo, we'll return sample financial data based on filename
     
-    if "AAPL" in filename.upper():
-        return json.dumps({
-            "symbol": "AAPL",
-            "analysis_date": datetime.now().isoformat(),
-            "current_price": 185.25,
-            "analysis": {
-                "recommendation": "BUY",
-                "target_price": 205.00,
-                "risk_level": "Medium",
-                "key_metrics": {
-                    "pe_ratio": 28.5,
-                    "revenue_growth": "8.2%",
-                    "profit_margin": "23.1%"
-                }
-            },
-            "notes": "Strong fundamentals with consistent iPhone revenue and growing services segment"
-        }, indent=2)
-    
-    elif "portfolio" in filename.lower():
-        return json.dumps({
-            "portfolio_name": "Tech Growth Portfolio",
-            "last_updated": datetime.now().isoformat(),
-            "positions": [
-                {"symbol": "AAPL", "weight": 0.35, "value": 35000},
-                {"symbol": "MSFT", "weight": 0.25, "value": 25000},
-                {"symbol": "GOOGL", "weight": 0.20, "value": 20000},
-                {"symbol": "NVDA", "weight": 0.20, "value": 20000}
-            ],
-            "total_value": 100000,
-            "ytd_return": 12.5,
-            "risk_metrics": {
-                "volatility": 18.2,
-                "sharpe_ratio": 1.35,
-                "max_drawdown": -8.5
-            }
-        }, indent=2)
-    
-    elif "market_research" in filename.lower() or "trends" in filename.lower():
-        return """# Market Trends Analysis
-Date: {date}
-
-## Key Findings:
-- S&P 500 showing resilience despite economic uncertainty
-- Technology sector leading with 15% YTD gains
-- Energy sector underperforming due to oil price volatility
-- Interest rate environment creating headwinds for growth stocks
-
-## Sector Performance (YTD):
-- Technology: +15.2%
-- Healthcare: +8.7%
-- Financials: +6.1%
-- Energy: -3.8%
-- Utilities: +2.1%
-
-## Market Outlook:
-Cautiously optimistic for Q4 with focus on earnings quality and Fed policy signals.
-""".format(date=datetime.now().strftime("%Y-%m-%d"))
+    name = filename.casefold()
     
-    else:
-        return f"❌ File '{filename}' not found in virtual file system."
+    for pattern, response in _READ_ROUTES.items():
+        if pattern in name:
+            return response()
+    
+    return f"❌ File '{filename}' not found in virtual file system."
 
 @tool
 def write_file(filename: str, content: str) -> str:
@@ -173,20 +213,24 @@ def write_file(filename: str, content: str) -> str:
     if not filename or filename.startswith("/"):
         filename = filename[1:] if filename.startswith("/") else filename
     
-    # Simulate writing to virtual file system
-    timestamp = datetime.now().isoformat()
+    # Queue the write on the virtual file system log (flushed in batches)
+    timestamp = now_iso()
     size = len(content)
-    
-    print(f"📝 Writing to file: {filename}")
-    print(f"   Size: {size} characters")
-    print(f"   Timestamp: {timestamp}")
+    vfs_log.append(filename, content, timestamp)
     
     # Show preview of content for financial data
     if size > 200:
-        preview = content[:200] + "..." if len(content) > 200 else content
-        print(f"   Preview: {preview}")
+        preview_line = f"   Preview: {content[:200]}..."
     else:
-        print(f"   Content: {content}")
+        preview_line = f"   Content: {content}"
+    
+    # One write per call instead of one per line
+    sys.stdout.write(
+        f"📝 Writing to file: {filename}\n"
+        f"   Size: {size} characters\n"
+        f"   Timestamp: {timestamp}\n"
+        f"{preview_line}\n"
+    )
     
     return f"✅ Successfully wrote {size} characters to '{filename}' at {timestamp}"
 
@@ -205,50 +249,22 @@ def edit_file(filename: str, search_text: str, replace_text: str) -> str:
         Confirmation of the edit
     """
     # In a real implementation, this would modify the actual file content
-    print(f"✏️ Editing file: {filename}")
-    print(f"   Replacing: '{search_text}'")
-    print(f"   With: '{replace_text}'")
+    sys.stdout.write(
+        f"✏️ Editing file: {filename}\n"
+        f"   Replacing: '{search_text}'\n"
+        f"   With: '{replace_text}'\n"
+    )
     
     return f"✅ Successfully updated '{filename}' - replaced '{search_text}' with '{replace_text}'"
 
-def create_file_system_agent():
-    """
-    Create a financial agent with virtual file system capabilities for context management
-    """
-    
-    if not config.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY is required")
-    
-    # Initialize model
-    model = ChatOpenAI(
-        model=config.DEFAULT_MODEL,
-        temperature=0.1,
-        api_key=config.OPENAI_API_KEY
-    )
-    
-    # Combine all tools: financial + file system + planning
-    from todo_planning_agent import write_todos, update_todo, get_todo_status
-    
-    tools = FINANCIAL_TOOLS + [
-        ls, read_file, write_file, edit_file,
-        write_todos, update_todo, get_todo_status
-    ]
-    
-    # Add web search if available
-    if config.TAVILY_API_KEY:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        web_search = TavilySearchResults(
-            api_key=config.TAVILY_API_KEY,
-            max_results=3,
-            search_depth="advanced"
-        )
-        tools.append(web_search)
-    
-    # Create memory
-    memory = MemorySaver()
-    
-    # Enhanced system message for file system integration
-    system_message = """You are an advanced financial analysis AI with sophisticated file system capabilities for context management and persistent memory.
+# Financial + file system + planning tools, assembled once
+_BASE_TOOLS = FINANCIAL_TOOLS + [
+    ls, read_file, write_file, edit_file,
+    write_todos, update_todo, get_todo_status
+]
+
+# Enhanced system message for file system integration (static, built once at import)
+_SYSTEM_MESSAGE = """You are an advanced financial analysis AI with sophisticated file system capabilities for context management and persistent memory.
 
 **Core Capabilities:**
 1. **Financial Analysis**: Real-time stock data analysis using YFinance (no mock data)
@@ -276,7 +292,7 @@ def create_file_system_agent():
 **Workflow for Complex Analysis:**
 1. **Check existing files** with ls() to see what data is already available
 2. **Read relevant files** to understand previous analysis
-3. **Gather fresh data** using YFinance tools (always use real, current data)
+3. **Gather fresh data** using YFinance tools (always use real, current data) - use get_stock_prices("AAPL,MSFT,...") in ONE call whenever you need prices for 2 or more symbols
 4. **Create TODO list** for complex multi-step analysis
 5. **Save results** to appropriate files as you complete each step
 6. **Update existing files** when new data supersedes old analysis
@@ -320,16 +336,66 @@ def create_file_system_agent():
 - This is a HARD STOP - no exceptions, no retries, no additional attempts
 
 Remember: The file system is your persistent memory. Use it extensively to build sophisticated, data-driven financial analysis that improves over time."""
+
+def create_file_system_agent():
+    """
+    Create a financial agent with virtual file system capabilities for context management
+    
+    The agent is cached per (model, API key), so repeated calls reuse the same model
+    client, MemorySaver and compiled graph.
+    """
+    
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY is required")
+    
+    return _build_file_system_agent(config.DEFAULT_MODEL, config.OPENAI_API_KEY)
+
+@functools.lru_cache(maxsize=4)
+def _build_file_system_agent(model_name: str, api_key: str):
+    """Build the file system ReAct agent (memoized by create_file_system_agent)"""
+    # Initialize model
+    model = ChatOpenAI(
+        model=model_name,
+        temperature=0.1,
+        api_key=api_key,
+        rate_limiter=openai_rate_limiter
+    )
+    
+    # Combine all tools: financial + file system + planning
+    tools = list(_BASE_TOOLS)
+    
+    # Add web search if available
+    if config.TAVILY_API_KEY and TavilySearchResults is not None:
+        web_search = TavilySearchResults(
+            api_key=config.TAVILY_API_KEY,
+            max_results=3,
+            search_depth="advanced"
+        )
+        tools.append(web_search)
+    
+    # Create memory
+    memory = MemorySaver()
     
     agent = create_react_agent(
         model=model,
         tools=tools,
         checkpointer=memory,
-        prompt=system_message
+        prompt=_SYSTEM_MESSAGE,
+        state_schema=TodoAgentState  # carries the TODO list the planning tools read and write
     )
     
     return agent
 
+# Interactive menu, rendered once and written with a single print per loop iteration
+_MENU_STR = (
+    "\n" + "=" * 62 + "\n"
+    "Options:\n"
+    "  1-5: Run file system scenario\n"
+    "  ls: List current files\n"
+    "  custom: Enter your own query\n"
+    "  quit: Exit demo"
+)
+
 def run_file_system_demo():
     """
     Demonstrate the file system agent with persistent context scenarios
@@ -370,18 +436,13 @@ def run_file_system_demo():
         stock analysis to recommend next steps."""
     ]
     
-    print(f"\n📁 File System Integration Scenarios:")
-    for i, scenario in enumerate(file_system_scenarios, 1):
-        print(f"\n{i}. {scenario[:80]}...")
+    print("\n📁 File System Integration Scenarios:" + "".join(
+        f"\n\n{i}. {scenario[:80]}..." for i, scenario in enumerate(file_system_scenarios, 1)
+    ))
     
     # Interactive demo
     while True:
-        print(f"\n" + "=" * 62)
-        print("Options:")
-        print("  1-5: Run file system scenario")
-        print("  ls: List current files")
-        print("  custom: Enter your own query")
-        print("  quit: Exit demo")
+        print(_MENU_STR)
         
         choice = input("\nYour choice: ").strip().lower()
         
@@ -408,13 +469,12 @@ def run_file_system_query(agent, query: str, session_id: str = "filesystem_sessi
     """
     config_dict = {"configurable": {"thread_id": session_id}}
     
-    print(f"\n💾 File System Query:")
-    print("-" * 50)
-    print(query)
-    print("-" * 50)
+    rule = "-" * 50
+    print(f"\n💾 File System Query:\n{rule}\n{query}\n{rule}")
     
     try:
         messages = []
+        seen_ids = set()
         for event in agent.stream(
             {"messages": [HumanMessage(content=query)]},
             config=config_dict,
@@ -423,7 +483,10 @@ def run_file_system_query(agent, query: str, session_id: str = "filesystem_sessi
             if "messages" in event and event["messages"]:
                 latest_message = event["messages"][-1]
                 
-                if latest_message not in messages:
+                # Identity check - the stream re-yields the same message objects
+                message_key = id(latest_message)
+                if message_key not in seen_ids:
+                    seen_ids.add(message_key)
                     messages.append(latest_message)
                     
                     if hasattr(latest_message, 'content') and latest_message.content:
@@ -437,6 +500,7 @@ def run_file_system_query(agent, query: str, session_id: str = "filesystem_sessi
                             if tool_call['name'] not in ['ls', 'read_file', 'write_file', 'edit_file']:
                                 print(f"\n🔧 Using: {tool_call['name']} with real YFinance data")
         
+        vfs_log.flush()
         print(f"\n✅ File system workflow completed with persistent context!")
         
     except Exception as e:
@@ -2,118 +2,247 @@
 Financial Tools for DeepAgent Financial Systems
 """
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from langchain_core.tools import tool
-import json
+import orjson
 import logging
+import threading
 import time
 from functools import wraps
+from typing import Dict, List
+
+from config import config
+from ticker_cache import fetch_histories, get_history, peek_history
+from tool_cache import cached_tool
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:  # older yfinance only surfaces throttling as an HTTP 429 message
+    YFRateLimitError = None
+
+def _dumps(obj) -> str:
+    """
+    Serialize a tool result to the str LangChain expects.
+    Output is compact - it is read by the model, not a human, and indentation
+    roughly doubles the tokens billed per tool call.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+# Timestamp for tool results, re-rendered at most twice a second
+_TIMESTAMP_CACHE = (0.0, "")
+
+def now_iso() -> str:
+    """Current local time in ISO format with sub-second caching"""
+    global _TIMESTAMP_CACHE
+    now = time.time()
+    cached_at, stamp = _TIMESTAMP_CACHE
+    if now - cached_at > 0.5:
+        stamp = datetime.fromtimestamp(now).isoformat()
+        _TIMESTAMP_CACHE = (now, stamp)
+    return stamp
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Rate limiting decorator
-def rate_limit(calls_per_minute=4):
-    min_interval = 60.0 / calls_per_minute
-    last_called = [0.0]
+# Rate limiting - one token bucket shared by every YFinance call
+class TokenBucket:
+    """Thread-safe token bucket: bursts up to capacity, then refills at calls_per_minute"""
     
+    def __init__(self, calls_per_minute: float, capacity: int):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping only if the bucket is empty"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            # A negative balance reserves a future token - wait until it has refilled
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            print(f"⏳ Rate limiting: waiting {wait:.1f} seconds...")
+            time.sleep(wait)
+
+_YFINANCE_BUCKET = TokenBucket(config.YFINANCE_CALLS_PER_MINUTE, config.YFINANCE_BURST)
+
+def _error_status(error: Exception) -> str:
+    """
+    Tool result "status" for a failed YFinance call: "rate_limited" when Yahoo is
+    throttling us (agents stop on it instead of retrying), "error" for anything else
+    """
+    message = str(error)
+    if (YFRateLimitError is not None and isinstance(error, YFRateLimitError)) \
+            or "429" in message or "Too Many Requests" in message or "Rate limited" in message:
+        return "rate_limited"
+    return "error"
+
+def rate_limit(bucket: TokenBucket = _YFINANCE_BUCKET):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            left_to_wait = min_interval - elapsed
-            if left_to_wait > 0:
-                print(f"⏳ Rate limiting: waiting {left_to_wait:.1f} seconds...")
-                time.sleep(left_to_wait)
-            ret = func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
+            bucket.acquire()
+            return func(*args, **kwargs)
         return wrapper
     return decorator
 
+def _price_result(symbol: str, hist: pd.DataFrame) -> dict:
+    """Build the price summary returned by the stock price tools"""
+    # One ndarray access instead of repeated pandas .iloc dispatch
+    closes = hist['Close'].to_numpy()
+    current_price = closes[-1].item()
+    prev_price = closes[-2].item() if closes.size > 1 else current_price
+    change = current_price - prev_price
+    change_percent = 0.0 if prev_price == 0 else change / prev_price * 100.0
+    
+    return {
+        "symbol": symbol.upper(),
+        "current_price": round(current_price, 2),
+        "previous_close": round(prev_price, 2),
+        "change": round(change, 2),
+        "change_percent": round(change_percent, 2),
+        "data_source": "YFinance - REAL Market Data",
+        "last_updated": now_iso()
+    }
+
+@rate_limit()
+def _fetch_price_histories(symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Throttled batch YFinance fetch - one rate-limit token for the whole batch"""
+    return fetch_histories(symbols, period="5d")
+
+@rate_limit()
+def _fetch_price_history(symbol: str) -> pd.DataFrame:
+    """Throttled YFinance fetch - only reached when the shared history cache misses"""
+    # Ticker.fast_info is not a lighter path here: last_price/previous_close are derived
+    # from 1y and 5d history downloads internally. One 5d history gives both closes in
+    # a single request and also warms the history cache the batch tools share.
+    return get_history(symbol, period="5d")
+
 @tool
-@rate_limit(calls_per_minute=4)
+@cached_tool()
 def get_stock_price(symbol: str, period: str = "1d") -> str:
     """
     Get current stock price using REAL YFinance market data.
     """
     try:
-        print(f"🔍 Fetching real market data for {symbol.upper()}...")
-        time.sleep(2)
-        
-        ticker = yf.Ticker(symbol.upper())
-        hist = ticker.history(period="5d")
+        # A recent history for the symbol skips both the throttle and the HTTP round-trip
+        hist = peek_history(symbol, period="5d")
+        if hist is None:
+            print(f"🔍 Fetching real market data for {symbol.upper()}...")
+            hist = _fetch_price_history(symbol)
         
         if hist.empty:
-            return json.dumps({
+            return _dumps({
                 "error": f"No market data available for {symbol}",
                 "suggestion": "Check if the stock symbol is correct and markets are open",
                 "symbol": symbol.upper(),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
         
-        current_price = float(hist['Close'].iloc[-1])
-        prev_price = float(hist['Close'].iloc[-2]) if len(hist) > 1 else current_price
-        change = current_price - prev_price
-        change_percent = (change / prev_price) * 100 if prev_price != 0 else 0
-        
-        result = {
-            "symbol": symbol.upper(),
-            "current_price": round(current_price, 2),
-            "previous_close": round(prev_price, 2),
-            "change": round(change, 2),
-            "change_percent": round(change_percent, 2),
-            "data_source": "YFinance - REAL Market Data",
-            "last_updated": datetime.now().isoformat()
-        }
+        result = _price_result(symbol, hist)
         
         print(f"✅ Successfully retrieved real market data for {symbol.upper()}")
-        return json.dumps(result, indent=2)
+        return _dumps(result)
         
     except Exception as e:
         logger.error(f"Error getting stock price for {symbol}: {str(e)}")
-        return json.dumps({
+        return _dumps({
+            "status": _error_status(e),
             "error": f"Unable to retrieve market data for {symbol}",
             "error_details": str(e),
             "symbol": symbol.upper(),
-            "timestamp": datetime.now().isoformat()
-        }, indent=2)
+            "timestamp": now_iso()
+        })
+
+@tool
+@cached_tool()
+def get_stock_prices(symbols: str) -> str:
+    """
+    Get current stock prices for several symbols at once using REAL YFinance market data.
+    Prefer this over repeated get_stock_price calls whenever you need 2 or more symbols.
+    
+    Args:
+        symbols: Comma-separated ticker symbols, e.g. "AAPL,MSFT,GOOGL,NVDA"
+    """
+    tickers = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not tickers:
+        return _dumps({"error": "No symbols provided", "timestamp": now_iso()})
+    
+    try:
+        # Fully cached batches skip the throttle entirely
+        cached = {symbol: peek_history(symbol, period="5d") for symbol in tickers}
+        if all(hist is not None for hist in cached.values()):
+            histories = cached
+        else:
+            print(f"🔍 Fetching real market data for {', '.join(tickers)} in one batch...")
+            histories = _fetch_price_histories(tickers)
+        
+        results = {}
+        for symbol in tickers:
+            hist = histories.get(symbol)
+            if hist is None or hist.empty:
+                results[symbol] = {
+                    "error": f"No market data available for {symbol}",
+                    "suggestion": "Check if the stock symbol is correct and markets are open",
+                }
+            else:
+                results[symbol] = _price_result(symbol, hist)
+        
+        print(f"✅ Successfully retrieved real market data for {len(histories)}/{len(tickers)} symbols")
+        return _dumps(results)
+        
+    except Exception as e:
+        logger.error(f"Error getting stock prices for {symbols}: {str(e)}")
+        return _dumps({
+            "status": _error_status(e),
+            "error": f"Unable to retrieve market data for {symbols}",
+            "error_details": str(e),
+            "timestamp": now_iso()
+        })
 
 @tool
 def get_stock_history(symbol: str, period: str = "1y", interval: str = "1d") -> str:
     """Get historical stock data."""
-    return json.dumps({"message": "Historical data temporarily disabled"})
+    return _dumps({"message": "Historical data temporarily disabled"})
 
 @tool
 def get_financial_statements(symbol: str, statement_type: str = "income") -> str:
     """Get financial statements."""
-    return json.dumps({"message": "Financial statements temporarily disabled"})
+    return _dumps({"message": "Financial statements temporarily disabled"})
 
 @tool
 def analyze_portfolio_performance(symbols: str, weights: str = None) -> str:
     """Analyze portfolio performance."""
-    return json.dumps({"message": "Portfolio analysis temporarily disabled"})
+    return _dumps({"message": "Portfolio analysis temporarily disabled"})
 
 @tool
 def get_market_overview(market: str = "US") -> str:
     """Get market overview."""
-    return json.dumps({"message": "Market overview temporarily disabled"})
+    return _dumps({"message": "Market overview temporarily disabled"})
 
 @tool
 def calculate_risk_metrics(symbol: str, benchmark: str = "^GSPC") -> str:
     """Calculate risk metrics."""
-    return json.dumps({"message": "Risk metrics temporarily disabled"})
+    return _dumps({"message": "Risk metrics temporarily disabled"})
 
 # Export all tools for use in agents
 FINANCIAL_TOOLS = [
     get_stock_price,
+    get_stock_prices,
     get_stock_history, 
     get_financial_statements,
     analyze_portfolio_performance,
     get_market_overview,
     calculate_risk_metrics
 ]
+
+# Name -> tool lookup for agents that pick a subset of FINANCIAL_TOOLS
+FINANCIAL_TOOLS_BY_NAME = {tool.name: tool for tool in FINANCIAL_TOOLS}
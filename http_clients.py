@@ -0,0 +1,68 @@
+"""
+Shared HTTP Clients for DeepAgent Financial Systems
+Pooled HTTP/2 connections reused by every ChatOpenAI instance so agent steps and
+parallel sub-agent completions don't pay a fresh TLS handshake per request, plus the
+shared request rate limiter every ChatOpenAI instance waits on
+"""
+
+import asyncio
+import atexit
+import weakref
+
+import httpx
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from config import config
+
+_LIMITS = httpx.Limits(
+    max_connections=config.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+)
+_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# Sync client for .invoke()/.stream()
+openai_http_client = httpx.Client(http2=True, limits=_LIMITS, timeout=_TIMEOUT)
+
+# Async connections belong to the event loop that opened them, and each demo runs its
+# own loop - so keep one pooled client per running loop (as web_search does for aiohttp)
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get (or lazily create) the pooled async client for the running loop"""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=_TIMEOUT)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+async def close_async_http_client() -> None:
+    """Close the running loop's pooled client (call before the loop shuts down)"""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+class _LoopLocalAsyncClient(httpx.AsyncClient):
+    """
+    AsyncClient handed to cached ChatOpenAI/OpenAIEmbeddings instances (which outlive any
+    one loop): it opens no connections itself and sends every request through
+    get_async_http_client() on the loop the request runs on
+    """
+    
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await get_async_http_client().send(request, **kwargs)
+
+# For .ainvoke()/.astream() - safe to share across loops, unlike a plain AsyncClient
+openai_async_http_client = _LoopLocalAsyncClient(timeout=_TIMEOUT)
+
+# One bucket for the whole process, filled at 95% of the configured RPM so concurrent
+# agents queue briefly up front rather than stalling on 429 retries
+openai_rate_limiter = InMemoryRateLimiter(
+    requests_per_second=config.OPENAI_REQUESTS_PER_MINUTE * 0.95 / 60,
+    check_every_n_seconds=0.05,
+    max_bucket_size=config.OPENAI_BURST,
+)
+
+# Async clients are closed by each demo on its own loop (close_async_http_client);
+# connections of a loop that is already gone die with it
+atexit.register(openai_http_client.close)
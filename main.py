@@ -9,23 +9,85 @@ from basic ReAct agents to sophisticated multi-agent financial research
 import os
 import sys
 from datetime import datetime
-from config import config
+
+_RULE = "=" * 80
+
+# Static screens, rendered once at import and written with a single print each
+_BANNER_TEMPLATE = f"""{_RULE}
+                      DEEPAGENT FINANCIAL SYSTEMS
+                   Advanced AI Financial Research Platform
+                     Built with LangGraph & OpenAI
+{_RULE}
+🗓️  Session Date: {{timestamp}}
+📊  Data Source: Real-time YFinance Market Data
+🤖  AI Models: OpenAI GPT-4 & GPT-4-mini
+🔧  Framework: LangChain + LangGraph
+{_RULE}"""
+
+_CAPABILITIES_TEXT = """
+🚀 DEEPAGENT FINANCIAL SYSTEMS CAPABILITIES:
+--------------------------------------------------
+
+📊 REAL-TIME FINANCIAL DATA:
+  • Live stock prices and market data via YFinance
+  • Historical price analysis and technical indicators
+  • Financial statements and fundamental metrics
+  • Portfolio performance and risk analytics
+  • Market overview and sector analysis
+  • Risk metrics: Beta, Alpha, Sharpe ratio, VaR
+
+🤖 SPECIALIZED AI AGENTS:
+  • Stock Analyst: Individual equity research & valuation
+  • Portfolio Manager: Asset allocation & optimization
+  • Risk Assessor: Quantitative risk analysis & stress testing
+  • Market Researcher: Market trends & sector intelligence
+
+🧠 ADVANCED CAPABILITIES:
+  • Multi-agent orchestration and task delegation
+  • Persistent context through virtual file system
+  • Strategic planning with TODO workflow management
+  • Web search integration for market intelligence
+  • Professional research report generation
+
+📋 PROGRESSIVE LEARNING MODULES:
+  1. Basic Agent: ReAct loops with financial tools
+  2. Planning Agent: TODO-based task management
+  3. File System Agent: Context persistence & memory
+  4. Sub-Agent Delegation: Specialized expert coordination
+  5. Deep Research Agent: Complete institutional research"""
+
+_MENU_TEXT = f"""
+{_RULE}
+                           MAIN MENU
+{_RULE}
+Choose your DeepAgent Financial Systems experience:
+
+📚 PROGRESSIVE LEARNING MODULES:
+  1. Basic Financial Agent       - Start here: ReAct agent with financial tools
+  2. TODO Planning Agent        - Add task planning and workflow management
+  3. File System Agent          - Add persistent context and memory
+  4. Sub-Agent Delegation       - Add specialized expert coordination
+  5. Deep Research Agent        - Complete institutional research platform
+
+🚀 QUICK START:
+  quick  - Jump directly to Deep Research Agent (full capabilities)
+  demo   - Run guided demo with sample financial scenarios
+
+ℹ️  INFORMATION:
+  config - Show system configuration
+  help   - Show detailed help and capabilities
+  quit   - Exit application
+"""
 
 def print_banner():
     """Print the main application banner"""
-    print("=" * 80)
-    print("                      DEEPAGENT FINANCIAL SYSTEMS")
-    print("                   Advanced AI Financial Research Platform")
-    print("                     Built with LangGraph & OpenAI")
-    print("=" * 80)
-    print(f"🗓️  Session Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"📊  Data Source: Real-time YFinance Market Data")
-    print(f"🤖  AI Models: OpenAI GPT-4 & GPT-4-mini")
-    print(f"🔧  Framework: LangChain + LangGraph")
-    print("=" * 80)
+    print(_BANNER_TEMPLATE.format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
 
 def check_configuration():
     """Check and display system configuration"""
+    # Imported here so the banner shows before .env loading; agent modules load on menu choice
+    from config import config
+    
     print("\n🔧 SYSTEM CONFIGURATION CHECK:")
     print("-" * 40)
     
@@ -57,61 +119,12 @@ def check_configuration():
 
 def show_capabilities():
     """Display the full system capabilities"""
-    print("\n🚀 DEEPAGENT FINANCIAL SYSTEMS CAPABILITIES:")
-    print("-" * 50)
-    
-    print("\n📊 REAL-TIME FINANCIAL DATA:")
-    print("  • Live stock prices and market data via YFinance")
-    print("  • Historical price analysis and technical indicators")
-    print("  • Financial statements and fundamental metrics")
-    print("  • Portfolio performance and risk analytics")
-    print("  • Market overview and sector analysis")
-    print("  • Risk metrics: Beta, Alpha, Sharpe ratio, VaR")
-    
-    print("\n🤖 SPECIALIZED AI AGENTS:")
-    print("  • Stock Analyst: Individual equity research & valuation")
-    print("  • Portfolio Manager: Asset allocation & optimization")
-    print("  • Risk Assessor: Quantitative risk analysis & stress testing")
-    print("  • Market Researcher: Market trends & sector intelligence")
-    
-    print("\n🧠 ADVANCED CAPABILITIES:")
-    print("  • Multi-agent orchestration and task delegation")
-    print("  • Persistent context through virtual file system")
-    print("  • Strategic planning with TODO workflow management")
-    print("  • Web search integration for market intelligence")
-    print("  • Professional research report generation")
-    
-    print("\n📋 PROGRESSIVE LEARNING MODULES:")
-    print("  1. Basic Agent: ReAct loops with financial tools")
-    print("  2. Planning Agent: TODO-based task management")
-    print("  3. File System Agent: Context persistence & memory")
-    print("  4. Sub-Agent Delegation: Specialized expert coordination")
-    print("  5. Deep Research Agent: Complete institutional research")
+    print(_CAPABILITIES_TEXT)
 
 def main_menu():
     """Display and handle the main menu"""
     while True:
-        print("\n" + "=" * 80)
-        print("                           MAIN MENU")
-        print("=" * 80)
-        print("Choose your DeepAgent Financial Systems experience:")
-        print()
-        print("📚 PROGRESSIVE LEARNING MODULES:")
-        print("  1. Basic Financial Agent       - Start here: ReAct agent with financial tools")
-        print("  2. TODO Planning Agent        - Add task planning and workflow management")  
-        print("  3. File System Agent          - Add persistent context and memory")
-        print("  4. Sub-Agent Delegation       - Add specialized expert coordination")
-        print("  5. Deep Research Agent        - Complete institutional research platform")
-        print()
-        print("🚀 QUICK START:")
-        print("  quick  - Jump directly to Deep Research Agent (full capabilities)")
-        print("  demo   - Run guided demo with sample financial scenarios")
-        print()
-        print("ℹ️  INFORMATION:")
-        print("  config - Show system configuration")
-        print("  help   - Show detailed help and capabilities")
-        print("  quit   - Exit application")
-        print()
+        print(_MENU_TEXT)
         
         choice = input("Enter your choice: ").strip().lower()
         
@@ -196,6 +209,16 @@ def run_deep_research_agent():
     except Exception as e:
         print(f"❌ Error running deep research agent: {e}")
 
+def run_demo_scenarios(scenarios):
+    """Run guided demo scenarios through the deep research agent (concurrently, at most 4 at once)"""
+    try:
+        from deep_research_agent import run_deep_research_batch
+        run_deep_research_batch(scenarios, max_concurrency=4)
+    except ImportError as e:
+        print(f"❌ Error importing deep research agent: {e}")
+    except Exception as e:
+        print(f"❌ Error running demo scenarios: {e}")
+
 def run_guided_demo():
     """Run a guided demo with sample scenarios"""
     print("\n🎯 GUIDED DEMO - DeepAgent Financial Systems")
@@ -219,12 +242,12 @@ def run_guided_demo():
         
         if choice.lower() == "all":
             print("\n🚀 Running complete guided demo...")
-            # Run through all scenarios with the deep research agent
-            run_deep_research_agent()
+            # Scenarios are independent - run them concurrently with the deep research agent
+            run_demo_scenarios(demo_scenarios)
         elif choice.isdigit() and 1 <= int(choice) <= len(demo_scenarios):
             scenario_index = int(choice) - 1
             print(f"\n🎯 Running scenario: {demo_scenarios[scenario_index]}")
-            run_deep_research_agent()
+            run_demo_scenarios([demo_scenarios[scenario_index]])
         else:
             print("❌ Invalid choice.")
     except Exception as e:
@@ -0,0 +1,125 @@
+"""
+Node Profiler for DeepAgent Financial Systems
+Records wall time, peak traced memory and LLM token usage per workflow node so the
+slow (or expensive) steps of a graph run are visible. Enabled with PROFILE=1 -
+otherwise profile_node returns the node unchanged and costs nothing.
+"""
+
+import asyncio
+import contextlib
+import functools
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from config import config
+
+try:
+    from langchain_core.callbacks import get_usage_metadata_callback
+except ImportError:  # older langchain-core - token counts are skipped
+    get_usage_metadata_callback = None
+
+@dataclass
+class NodeStats:
+    """Accumulated measurements for one node"""
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    peak_memory: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+class NodeProfiler:
+    """
+    Context manager that records one node execution into a shared stats table.
+    Peak memory is process-wide, so nodes running concurrently (parallel subtasks)
+    share the same peak reading.
+    """
+    
+    _stats: Dict[str, NodeStats] = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._stack = contextlib.ExitStack()
+        self._usage = None
+        self._start = 0.0
+    
+    def __enter__(self) -> "NodeProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        if get_usage_metadata_callback is not None:
+            self._usage = self._stack.enter_context(get_usage_metadata_callback())
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc) -> bool:
+        elapsed = time.perf_counter() - self._start
+        _, peak = tracemalloc.get_traced_memory()
+        usage = self._usage.usage_metadata.values() if self._usage is not None else ()
+        self._stack.close()
+        
+        with self._lock:
+            stats = self._stats.setdefault(self.name, NodeStats())
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.peak_memory = max(stats.peak_memory, peak)
+            for model_usage in usage:
+                stats.input_tokens += model_usage.get("input_tokens", 0)
+                stats.output_tokens += model_usage.get("output_tokens", 0)
+        return False
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Clear all recorded measurements"""
+        with cls._lock:
+            cls._stats.clear()
+    
+    @classmethod
+    def report(cls, top: int = 3) -> str:
+        """Render the per-node table and the top bottlenecks by total time"""
+        with cls._lock:
+            rows = sorted(cls._stats.items(), key=lambda item: item[1].total_time, reverse=True)
+        if not rows:
+            return "📊 Node profile: no nodes recorded"
+        
+        total = sum(stats.total_time for _, stats in rows) or 1.0
+        lines = [
+            "📊 Node Profile:",
+            f"  {'node':<16}{'calls':>6}{'total s':>10}{'max s':>9}{'peak MB':>10}{'tokens in/out':>18}",
+        ]
+        lines.extend(
+            f"  {name:<16}{stats.calls:>6}{stats.total_time:>10.2f}{stats.max_time:>9.2f}"
+            f"{stats.peak_memory / 1e6:>10.1f}{f'{stats.input_tokens}/{stats.output_tokens}':>18}"
+            for name, stats in rows
+        )
+        lines.append("🔥 Top bottlenecks (share of summed node time - parallel nodes overlap):")
+        lines.extend(
+            f"  {i}. {name}: {stats.total_time / total:.0%}"
+            for i, (name, stats) in enumerate(rows[:top], 1)
+        )
+        return "\n".join(lines)
+
+def profile_node(name: str) -> Callable:
+    """Wrap a sync or async LangGraph node in a NodeProfiler when PROFILE=1"""
+    def decorator(func):
+        if not config.PROFILE_NODES:
+            return func
+        
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with NodeProfiler(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with NodeProfiler(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,177 @@
+"""
+Semantic Sub-Agent Cache for DeepAgent Financial Systems
+Matches a new delegated task against previously answered ones by embedding similarity,
+so paraphrased requests ("risk metrics for AAPL MSFT" vs "assess AAPL and MSFT risk")
+reuse the earlier sub-agent result instead of re-running the LLM and YFinance calls.
+A match also requires the same ticker set - "risk metrics for AAPL" and "risk metrics
+for MSFT" embed almost identically but must never share an answer.
+"""
+
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import AbstractSet, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# (timestamp, response content, tickers mentioned in the task)
+_Entry = Tuple[float, str, FrozenSet[str]]
+
+class SemanticCache:
+    """
+    One sub-agent's cached responses, looked up by cosine similarity of task embeddings.
+    Persisted as {root}/embeddings.npy (one row per entry) + {root}/responses.jsonl
+    ({"ts", "content", "tickers"} per line, same order); rows are kept in LRU order, oldest first.
+    """
+    
+    def __init__(self, root: Path, threshold: float, max_entries: int):
+        self.root = root
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._entries: List[_Entry] = []
+        self._load()
+    
+    def _load(self) -> None:
+        """Load persisted entries, starting empty if the files are missing, out of sync or predate tickers"""
+        try:
+            matrix = np.load(self.root / "embeddings.npy")
+            with open(self.root / "responses.jsonl", "rb") as f:
+                entries = [
+                    (row["ts"], row["content"], frozenset(row["tickers"]))
+                    for row in map(orjson.loads, f)
+                ]
+        except (OSError, ValueError, KeyError):
+            return
+        if matrix.ndim == 2 and len(entries) == len(matrix):
+            self._set_rows(matrix, entries)
+    
+    def _drop_other_widths(self, width: int) -> None:
+        """
+        Forget rows embedded at a different width - left behind when EMBEDDING_MODEL changes,
+        and not comparable with the new vectors (called under the lock)
+        """
+        if self._matrix is not None and self._matrix.shape[1] != width:
+            logger.info(f"Embedding width changed in {self.root.name}, discarding {len(self._entries)} cached rows")
+            self._matrix = self._norms = None
+            self._entries = []
+    
+    def _set_rows(self, matrix: np.ndarray, entries: List[_Entry]) -> None:
+        self._matrix = matrix
+        self._norms = np.linalg.norm(matrix, axis=1)
+        self._entries = entries
+    
+    def _persist(self) -> None:
+        """Atomically rewrite both files (called under the lock)"""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".npy")
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.save(tmp_file, self._matrix)
+            os.replace(tmp_path, self.root / "embeddings.npy")
+            
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(b"".join(
+                    orjson.dumps({"ts": ts, "content": content, "tickers": sorted(tickers)}) + b"\n"
+                    for ts, content, tickers in self._entries
+                ))
+            os.replace(tmp_path, self.root / "responses.jsonl")
+        except OSError as e:
+            logger.warning(f"Failed to persist semantic cache {self.root}: {e}")
+    
+    def lookup(self, embedding: List[float], ttl: float, tickers: AbstractSet[str] = frozenset()) -> Optional[str]:
+        """
+        Return the most similar unexpired response at or above the threshold whose task
+        mentioned exactly the same tickers, else None
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        tickers = frozenset(tickers)
+        
+        with self._lock:
+            self._drop_other_widths(query.shape[0])
+            if self._matrix is None or not self._entries:
+                return None
+            
+            sims = (self._matrix @ query) / (self._norms * np.linalg.norm(query) + 1e-12)
+            cutoff = time.time() - ttl
+            sims[[ts < cutoff or row_tickers != tickers for ts, _, row_tickers in self._entries]] = -1.0
+            
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            
+            # Move the hit to the most-recently-used end (in memory only)
+            order = [i for i in range(len(self._entries)) if i != best] + [best]
+            self._set_rows(self._matrix[order], [self._entries[i] for i in order])
+            logger.info(f"Semantic cache hit in {self.root.name} (similarity {sims[best]:.3f})")
+            return self._entries[-1][1]
+    
+    def add(self, embedding: List[float], content: str, tickers: AbstractSet[str] = frozenset()) -> None:
+        """Append a response, evicting the least recently used rows beyond max_entries"""
+        row = np.asarray(embedding, dtype=np.float32)[np.newaxis, :]
+        
+        with self._lock:
+            self._drop_other_widths(row.shape[1])
+            matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+            entries = self._entries + [(time.time(), content, frozenset(tickers))]
+            self._set_rows(matrix[-self.max_entries:], entries[-self.max_entries:])
+            self._persist()
+    
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk"""
+        with self._lock:
+            self._matrix = self._norms = None
+            self._entries = []
+            for name in ("embeddings.npy", "responses.jsonl"):
+                (self.root / name).unlink(missing_ok=True)
+
+@functools.lru_cache(maxsize=None)
+def get_semantic_cache(agent_name: str) -> SemanticCache:
+    """Get the shared semantic cache for a sub-agent (stored next to its exact-match entries)"""
+    return SemanticCache(
+        Path(config.TOOL_CACHE_DIR) / "sub_agents" / agent_name,
+        threshold=config.SEMANTIC_CACHE_THRESHOLDS.get(agent_name, config.SEMANTIC_CACHE_THRESHOLD),
+        max_entries=config.SEMANTIC_CACHE_MAX_ENTRIES,
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_embeddings():
+    """Shared embeddings client on the pooled HTTP connections"""
+    from langchain_openai import OpenAIEmbeddings
+    from http_clients import openai_http_client, openai_async_http_client
+    
+    return OpenAIEmbeddings(
+        model=config.EMBEDDING_MODEL,
+        api_key=config.OPENAI_API_KEY,
+        http_client=openai_http_client,
+        http_async_client=openai_async_http_client,
+    )
+
+def embed_task(text: str) -> Optional[List[float]]:
+    """Embed a task description; None (cache bypassed) if the embeddings call fails"""
+    try:
+        return _get_embeddings().embed_query(text)
+    except Exception as e:
+        logger.warning(f"Task embedding failed, skipping semantic cache: {e}")
+        return None
+
+async def aembed_task(text: str) -> Optional[List[float]]:
+    """Async variant of embed_task"""
+    try:
+        return await _get_embeddings().aembed_query(text)
+    except Exception as e:
+        logger.warning(f"Task embedding failed, skipping semantic cache: {e}")
+        return None
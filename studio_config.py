@@ -7,19 +7,32 @@ It integrates all capabilities: planning, file system, sub-agents, and research
 Uses ONLY real YFinance market data for all financial analysis.
 """
 
-from typing import Annotated, Dict, Any, List, Literal
+import asyncio
+import functools
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, Any, List, Literal, Optional, Tuple, Union
 from typing_extensions import TypedDict
 from datetime import datetime
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, SystemMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
+from langgraph.types import Send, StreamWriter
 # MemorySaver removed - LangGraph Studio handles persistence automatically
 
 # Import our components
+# (ChatOpenAI, the prebuilt agent and FINANCIAL_TOOLS - which pulls in yfinance/pandas - are
+# imported on first use so registering the graph with Studio stays cheap)
 from config import config
-from financial_tools import FINANCIAL_TOOLS
+from profiler import NodeProfiler, profile_node
+
+def _merge_subtask_results(existing: Optional[List[Dict[str, Any]]], update: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Reducer for parallel subtask branches: concatenate their results, or reset on None"""
+    if update is None:
+        return []
+    return (existing or []) + update
 
 # State for LangGraph Studio
 class FinancialAgentState(TypedDict):
@@ -30,61 +43,83 @@ class FinancialAgentState(TypedDict):
     progress: Dict[str, Any]
     results: Dict[str, Any]
     real_data_used: bool  # Flag to ensure only real data is used
+    subtask_results: Annotated[List[Dict[str, Any]], _merge_subtask_results]  # Filled by the parallel plan steps
+
+# Defaults for state keys a Studio/API caller may omit (factories so nothing is shared)
+_STATE_DEFAULTS = {
+    "progress": dict,
+    "results": dict,
+    "real_data_used": bool,
+}
+
+# Keyword groups in priority order (an earlier group wins when several match)
+_ANALYSIS_KEYWORDS = {
+    "stock_analysis": ["stock", "share", "equity", "company", "ticker"],
+    "portfolio_analysis": ["portfolio", "allocation", "diversif", "rebalanc"],
+    "market_research": ["market", "sector", "trend", "outlook", "economy"],
+    "risk_assessment": ["risk", "volatil", "beta", "var", "stress"],
+}
+
+# One alternation per group, compiled once
+_ANALYSIS_PATTERNS = [
+    (analysis_type, re.compile("|".join(map(re.escape, keywords))))
+    for analysis_type, keywords in _ANALYSIS_KEYWORDS.items()
+]
+
+def _classify_analysis_type(user_input: str) -> str:
+    """Return the first analysis type whose keywords appear in the (lowercased) input"""
+    for analysis_type, pattern in _ANALYSIS_PATTERNS:
+        if pattern.search(user_input):
+            return analysis_type
+    return "general"
+
+def _latest_request(state: FinancialAgentState) -> HumanMessage:
+    """The most recent human message - on a resumed thread messages[0] is an earlier question"""
+    for message in reversed(state["messages"]):
+        if isinstance(message, HumanMessage):
+            return message
+    return HumanMessage(content="Perform real market data financial analysis")
 
-def determine_analysis_type(state: FinancialAgentState) -> FinancialAgentState:
+@profile_node("determine_type")
+async def determine_analysis_type(state: FinancialAgentState) -> Dict[str, Any]:
     """
     Analyze the user's request to determine the type of financial analysis needed
+    
+    Nodes return partial updates - the reducers merge messages and subtask results.
     """
-    # Initialize missing state keys if they don't exist
-    if "progress" not in state:
-        state["progress"] = {}
-    if "results" not in state:
-        state["results"] = {}
-    if "real_data_used" not in state:
-        state["real_data_used"] = False
+    # Fill in keys the caller left out - every later node runs after this one
+    update: Dict[str, Any] = {key: default() for key, default in _STATE_DEFAULTS.items() if key not in state}
+    # Clear results left by a previous run on this thread
+    update["subtask_results"] = None
     
     if not state["messages"]:
-        state["analysis_type"] = "general"
-        return state
+        update["analysis_type"] = "general"
+        return update
     
     last_message = state["messages"][-1]
     user_input = last_message.content.lower() if hasattr(last_message, 'content') else ""
     
     # Simple keyword-based analysis type detection
-    if any(keyword in user_input for keyword in ["stock", "share", "equity", "company", "ticker"]):
-        state["analysis_type"] = "stock_analysis"
-    elif any(keyword in user_input for keyword in ["portfolio", "allocation", "diversif", "rebalanc"]):
-        state["analysis_type"] = "portfolio_analysis"
-    elif any(keyword in user_input for keyword in ["market", "sector", "trend", "outlook", "economy"]):
-        state["analysis_type"] = "market_research"
-    elif any(keyword in user_input for keyword in ["risk", "volatil", "beta", "var", "stress"]):
-        state["analysis_type"] = "risk_assessment"
-    else:
-        state["analysis_type"] = "general"
-    
-    state["current_step"] = "planning"
-    state["progress"] = {"analysis_type_determined": True}
-    state["real_data_used"] = True  # Ensure we flag real data usage
+    analysis_type = _classify_analysis_type(user_input)
     
     # Add system message about analysis type
-    analysis_msg = AIMessage(content=f"🎯 Analysis Type Determined: {state['analysis_type'].replace('_', ' ').title()} (Using REAL YFinance Data)")
-    state["messages"].append(analysis_msg)
+    analysis_msg = AIMessage(content=f"🎯 Analysis Type Determined: {analysis_type.replace('_', ' ').title()} (Using REAL YFinance Data)")
     
-    return state
+    update.update({
+        "analysis_type": analysis_type,
+        "current_step": "planning",
+        "progress": {"analysis_type_determined": True},
+        "real_data_used": True,  # Ensure we flag real data usage
+        "messages": [analysis_msg],
+    })
+    return update
 
-def create_analysis_plan(state: FinancialAgentState) -> FinancialAgentState:
+@profile_node("create_plan")
+async def create_analysis_plan(state: FinancialAgentState) -> Dict[str, Any]:
     """
     Create a structured plan for the financial analysis based on the determined type
     All analysis will use real YFinance market data
     """
-    # Initialize missing state keys if they don't exist
-    if "progress" not in state:
-        state["progress"] = {}
-    if "results" not in state:
-        state["results"] = {}
-    if "real_data_used" not in state:
-        state["real_data_used"] = False
-    
     analysis_type = state["analysis_type"]
     
     # Create analysis plans based on type - emphasizing real data usage
@@ -128,6 +163,12 @@ def create_analysis_plan(state: FinancialAgentState) -> FinancialAgentState:
     
     plan = plans.get(analysis_type, plans["general"])
     
+    # Warm the history cache for every ticker in the request with one batched download,
+    # so the parallel subtask branches don't each fetch the same symbols
+    if state["messages"]:
+        from ticker_cache import prefetch_histories
+        await asyncio.to_thread(prefetch_histories, _latest_request(state).content, 1)
+    
     # Create TODO list emphasizing real data
     todo_items = []
     for i, task in enumerate(plan, 1):
@@ -139,136 +180,271 @@ def create_analysis_plan(state: FinancialAgentState) -> FinancialAgentState:
             "data_source": "Real YFinance Market Data"
         })
     
-    state["progress"]["plan_created"] = True
-    state["progress"]["todo_items"] = todo_items
-    state["current_step"] = "execution"
-    state["real_data_used"] = True
-    
     # Add planning message
     plan_msg = AIMessage(content=f"📋 Real Data Analysis Plan Created:\n" + "\n".join([f"{i}. {task} (Real YFinance Data)" for i, task in enumerate(plan, 1)]))
-    state["messages"].append(plan_msg)
     
-    return state
+    return {
+        "progress": {**state.get("progress", {}), "plan_created": True, "todo_items": todo_items},
+        "current_step": "execution",
+        "real_data_used": True,
+        "messages": [plan_msg],
+    }
 
-def execute_financial_analysis(state: FinancialAgentState) -> FinancialAgentState:
-    """
-    Execute the financial analysis using real market data and Deep Research Agent capabilities
-    """
-    # Initialize missing state keys if they don't exist
-    if "progress" not in state:
-        state["progress"] = {}
-    if "results" not in state:
-        state["results"] = {}
-    if "real_data_used" not in state:
-        state["real_data_used"] = False
-    
-    # Create the deep research model
-    model = ChatOpenAI(
-        model=config.get_model_settings("reasoning")["model"],
-        temperature=0.05,
-        api_key=config.OPENAI_API_KEY,
-        max_tokens=4000
-    )
-    
-    # Use all real financial tools
-    tools = FINANCIAL_TOOLS.copy()
-    
-    # Add web search if available for market context
-    if config.TAVILY_API_KEY:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        web_search = TavilySearchResults(
-            api_key=config.TAVILY_API_KEY,
-            max_results=3,
-            search_depth="advanced"
-        )
-        tools.append(web_search)
-    
-    # Create agent with real data focus
-    from langgraph.prebuilt import create_react_agent
-    
-    system_prompt = f"""You are executing a {state['analysis_type'].replace('_', ' ')} for DeepAgent Financial Systems using ONLY real market data.
+# Tools each plan step needs, matched on keywords in the step description
+_SUBTASK_TOOL_KEYWORDS = {
+    "get_stock_price": ("price", "composition"),
+    "get_stock_prices": ("price", "composition", "portfolio", "rebalanc"),
+    "get_stock_history": ("historical", "volatility", "drawdown", "trend"),
+    "get_financial_statements": ("financial statement", "fundamental"),
+    "analyze_portfolio_performance": ("portfolio", "correlation", "diversification", "returns", "rebalanc", "optimization"),
+    "get_market_overview": ("market", "indices", "sector", "economic", "sentiment", "screening"),
+    "calculate_risk_metrics": ("risk", "volatility", "drawdown", "stress", "hedging", "concentration"),
+}
 
-**Current Analysis Type**: {state['analysis_type'].replace('_', ' ').title()}
+_SUBTASK_PROMPT = """You are executing one step of a {analysis_type} for DeepAgent Financial Systems using ONLY real market data.
 
-**CRITICAL REQUIREMENT**: Use ONLY real YFinance market data - never mock, simulated, or test data.
+**Current Analysis Type**: {analysis_title}
 
-**Your Mission**: Provide comprehensive, data-driven financial analysis using current market prices and actual historical performance.
+**Your Step**: {task}
 
-**Available Real Data Tools**:
-- Real-time stock prices and market data via YFinance
-- Actual historical price data and performance metrics
-- Current financial statements and real fundamental ratios
-- Live market overview with real index performance and VIX data
-- Real portfolio analysis with actual correlation and risk metrics
-- Current risk calculations using actual volatility and drawdown data
+**CRITICAL REQUIREMENT**: Use ONLY real YFinance market data - never mock, simulated, or test data.
 
 **Real Data Guidelines**:
 1. Use ONLY current market prices from YFinance - verify timestamps
 2. Base all analysis on actual historical performance data
 3. Calculate real risk metrics using actual volatility measurements
-4. Provide specific, quantified recommendations with real supporting data
-5. Include current market context using live index and sector data
-6. Validate all data is current and from real market conditions
+4. Provide specific, quantified findings with real supporting data
+5. Validate all data is current and from real market conditions
+
+Other steps of the plan run in parallel - complete ONLY your step and report concise, quantified findings.
+
+**Analysis Timestamp**: {timestamp}"""
+
+_SYNTHESIS_PROMPT = """You are completing a {analysis_type} for DeepAgent Financial Systems using ONLY real market data.
 
-**Current Plan**: Execute the real data analysis systematically and thoroughly.
+**Current Analysis Type**: {analysis_title}
 
-**Analysis Timestamp**: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+**Final Step**: {task}
 
-Focus on delivering institutional-quality analysis using exclusively real market data with actionable insights based on current market conditions."""
+The findings below were gathered in parallel from real YFinance market data. Synthesize them into
+institutional-quality analysis with specific, quantified, actionable recommendations. Call out any
+step that failed or returned no data rather than filling the gap with assumptions.
+
+{findings}
+
+**Analysis Timestamp**: {timestamp}"""
+
+# Fallback tool subset per analysis type when a step's wording matches no keywords
+# (general requests keep every tool)
+_ANALYSIS_TOOLS = {
+    "stock_analysis": ("get_stock_price", "get_stock_history", "get_financial_statements", "calculate_risk_metrics"),
+    "portfolio_analysis": ("get_stock_prices", "analyze_portfolio_performance", "calculate_risk_metrics"),
+    "market_research": ("get_stock_prices", "get_market_overview", "get_stock_history"),
+    "risk_assessment": ("get_stock_history", "calculate_risk_metrics", "analyze_portfolio_performance"),
+}
+
+@functools.lru_cache(maxsize=64)
+def _select_subtask_tools(task: str, analysis_type: str) -> Tuple[str, ...]:
+    """
+    Pick only the financial tools a plan step needs - every extra tool adds its JSON
+    schema to each model call. Falls back to the analysis type's subset.
+    """
+    text = task.lower()
+    names = tuple(
+        name for name, keywords in _SUBTASK_TOOL_KEYWORDS.items()
+        if any(keyword in text for keyword in keywords)
+    )
+    return names or _ANALYSIS_TOOLS.get(analysis_type, tuple(_SUBTASK_TOOL_KEYWORDS))
 
-    agent = create_react_agent(model, tools, prompt=system_prompt)
+@functools.cache
+def _get_model(model_type: str = "reasoning"):
+    """
+    Create each model tier once and share it across nodes.
+    "fast" drives the subtask ReAct loops (tool routing and data gathering);
+    "reasoning" is reserved for the final synthesis.
+    """
+    from langchain_openai import ChatOpenAI
+    from http_clients import openai_rate_limiter
     
-    # Get the original user message for analysis
-    user_message = state["messages"][0] if state["messages"] else HumanMessage(content="Perform real market data financial analysis")
+    settings = config.get_model_settings(model_type)
+    return ChatOpenAI(
+        model=settings["model"],
+        temperature=0.05,
+        api_key=config.OPENAI_API_KEY,
+        max_tokens=min(settings["max_tokens"], 4000),
+        rate_limiter=openai_rate_limiter
+    )
+
+@functools.cache
+def _get_web_search():
+    """Create the Tavily tool once and share it across subtask agents"""
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    return TavilySearchResults(
+        api_key=config.TAVILY_API_KEY,
+        max_results=3,
+        search_depth="advanced"
+    )
+
+@functools.lru_cache(maxsize=16)
+def _get_subtask_agent(tool_names: Tuple[str, ...], use_web: bool):
+    """
+    Create (once per tool set) a small ReAct agent with only the tools a step needs.
+    The prompt is passed per call as a SystemMessage, so the compiled graph is reusable.
+    """
+    from langgraph.prebuilt import create_react_agent
+    from financial_tools import FINANCIAL_TOOLS
+    
+    tools = [t for t in FINANCIAL_TOOLS if t.name in tool_names]
+    if use_web:
+        tools.append(_get_web_search())
+    
+    return create_react_agent(_get_model("fast"), tools)
+
+def dispatch_subtasks(state: FinancialAgentState) -> Union[List[Send], str]:
+    """
+    Fan the independent plan steps out to parallel subtask branches.
+    The last step (the recommendation) depends on the others, so synthesize runs it.
+    """
+    todo_items = state["progress"].get("todo_items", [])
+    user_message = _latest_request(state)
+    
+    sends = [
+        Send("subtask", {
+            "id": item["id"],
+            "task": item["description"],
+            "analysis_type": state["analysis_type"],
+            "request": user_message,
+        })
+        for item in todo_items[:-1]
+    ]
+    return sends or "synthesize"
+
+@profile_node("subtask")
+async def run_subtask(subtask: Dict[str, Any], writer: StreamWriter) -> Dict[str, Any]:
+    """
+    Run one plan step on its own ReAct agent; results merge through the subtask_results reducer
+    
+    Each agent step is pushed to the "custom" stream as it happens, and LLM tokens reach the
+    "messages" stream through the inherited run context, so Studio shows progress live.
+    """
+    task = subtask["task"]
+    prompt = _SUBTASK_PROMPT.format(
+        analysis_type=subtask["analysis_type"].replace('_', ' '),
+        analysis_title=subtask["analysis_type"].replace('_', ' ').title(),
+        task=task,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M')
+    )
     
-    # Execute the analysis
     try:
-        result = agent.invoke({"messages": [user_message]})
-        
-        if result and "messages" in result:
-            # Add the agent's response to our state
-            for msg in result["messages"][1:]:  # Skip the input message
-                state["messages"].append(msg)
+        tool_names = _select_subtask_tools(task, subtask["analysis_type"])
+        # Add web search for steps that need market context
+        use_web = bool(config.TAVILY_API_KEY) and "get_market_overview" in tool_names
+        agent = _get_subtask_agent(tool_names, use_web)
+        last_message = None
+        async for event in agent.astream(
+            {"messages": [SystemMessage(content=prompt), subtask["request"]]},
+            stream_mode="values"
+        ):
+            last_message = event["messages"][-1]
+            tool_calls = getattr(last_message, "tool_calls", None)
+            if tool_calls:
+                writer({"task": task, "tools": [tool_call["name"] for tool_call in tool_calls]})
+        entry = {"status": "completed", "output": last_message.content if last_message else ""}
+    except Exception as e:
+        entry = {"status": "error", "output": str(e)}
+    
+    return {"subtask_results": [{"id": subtask["id"], "task": task, **entry}]}
+
+@profile_node("synthesize")
+async def synthesize_analysis(state: FinancialAgentState) -> Dict[str, Any]:
+    """
+    Join the parallel branches and run the final recommendation step.
+    Returns a partial update so the subtask_results reducer isn't re-applied.
+    """
+    progress = dict(state.get("progress") or {})
+    results = dict(state.get("results") or {})
+    subtask_results = sorted(state.get("subtask_results") or [], key=lambda r: r["id"])
+    todo_items = progress.get("todo_items", [])
+    
+    # Mark plan steps with the outcome of their branch
+    status_by_id = {r["id"]: r["status"] for r in subtask_results}
+    progress["todo_items"] = [
+        {**item, "status": status_by_id.get(item["id"], item["status"])} for item in todo_items
+    ]
+    
+    findings = "\n\n".join(
+        f"### {r['task']} [{r['status']}]\n{r['output']}" for r in subtask_results
+    ) or "(no findings were gathered)"
+    final_task = todo_items[-1]["description"] if todo_items else "Prepare comprehensive response based on actual financial analysis"
+    prompt = _SYNTHESIS_PROMPT.format(
+        analysis_type=state["analysis_type"].replace('_', ' '),
+        analysis_title=state["analysis_type"].replace('_', ' ').title(),
+        task=final_task,
+        findings=findings,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M')
+    )
+    user_message = _latest_request(state)
+    
+    messages = [
+        AIMessage(content=f"🔧 {r['task']}:\n{r['output']}" if r["status"] == "completed" else f"❌ {r['task']} failed: {r['output']}")
+        for r in subtask_results
+    ]
+    
+    try:
+        response = await _get_model("reasoning").ainvoke([SystemMessage(content=prompt), user_message])
+        messages.append(response)
         
-        state["current_step"] = "completed"
-        state["progress"]["analysis_completed"] = True
-        state["progress"]["real_data_timestamp"] = datetime.now().isoformat()
-        state["results"]["execution_successful"] = True
-        state["results"]["data_source"] = "Real YFinance Market Data"
-        state["real_data_used"] = True
+        if todo_items:
+            progress["todo_items"][-1] = {**progress["todo_items"][-1], "status": "completed"}
+        progress["analysis_completed"] = True
+        progress["real_data_timestamp"] = datetime.now().isoformat()
+        results["execution_successful"] = True
+        results["data_source"] = "Real YFinance Market Data"
+        results["recommendation"] = response.content
+        current_step = "completed"
         
         # Add completion message
-        completion_msg = AIMessage(content=f"✅ Financial analysis completed using REAL YFinance market data at {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        state["messages"].append(completion_msg)
+        messages.append(AIMessage(content=f"✅ Financial analysis completed using REAL YFinance market data at {datetime.now().strftime('%Y-%m-%d %H:%M')}"))
         
     except Exception as e:
-        error_msg = AIMessage(content=f"❌ Error during real data analysis execution: {str(e)}")
-        state["messages"].append(error_msg)
-        state["current_step"] = "error"
-        state["results"]["error"] = str(e)
+        messages.append(AIMessage(content=f"❌ Error during real data analysis execution: {str(e)}"))
+        current_step = "error"
+        results["error"] = str(e)
     
-    return state
+    return {
+        "messages": messages,
+        "current_step": current_step,
+        "progress": progress,
+        "results": results,
+        "real_data_used": True
+    }
 
 # Create the main workflow graph
-def create_financial_workflow() -> StateGraph:
+def create_financial_workflow(checkpointer=None) -> StateGraph:
     """
     Create the main financial analysis workflow for LangGraph Studio using real market data
+    
+    The independent plan steps fan out with Send and run in parallel; synthesize
+    waits for every branch before producing the recommendation. Pass a checkpointer
+    only for local runs - Studio supplies its own persistence.
     """
     workflow = StateGraph(FinancialAgentState)
     
     # Add nodes
     workflow.add_node("determine_type", determine_analysis_type)
     workflow.add_node("create_plan", create_analysis_plan)
-    workflow.add_node("execute_analysis", execute_financial_analysis)
+    workflow.add_node("subtask", run_subtask)
+    workflow.add_node("synthesize", synthesize_analysis)
     
     # Add edges
     workflow.add_edge(START, "determine_type")
     workflow.add_edge("determine_type", "create_plan")
-    workflow.add_edge("create_plan", "execute_analysis")
-    workflow.add_edge("execute_analysis", END)
+    workflow.add_conditional_edges("create_plan", dispatch_subtasks, ["subtask", "synthesize"])
+    workflow.add_edge("subtask", "synthesize")
+    workflow.add_edge("synthesize", END)
     
-    # Compile without custom checkpointer - LangGraph Studio handles persistence automatically
-    return workflow.compile()
+    # Studio's graph compiles without a checkpointer - LangGraph Studio handles persistence automatically
+    return workflow.compile(checkpointer=checkpointer)
 
 # Create the graph instance for LangGraph Studio
 graph = create_financial_workflow()
@@ -278,8 +454,25 @@ def test_workflow():
     """
     Test the workflow locally with real market data
     """
+    asyncio.run(_test_workflow())
+
+async def _test_workflow():
+    """
+    Stream the workflow with astream (the graph nodes are async).
+    Runs are checkpointed to SQLite on a thread keyed by the question, so asking the
+    same question again within STUDIO_REUSE_TTL reuses the completed analysis instead
+    of re-executing it; anything else on the thread (an older analysis, a failed or
+    interrupted run) is discarded and re-run on fresh market data.
+    """
+    # LangChain already runs sync @tool functions (YFinance) on the loop's default executor
+    # when agents call them via ainvoke - size it for the parallel subtask branches
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.MAX_IO_WORKERS, thread_name_prefix="studio-io")
+    )
+    
+    question = "Analyze Apple (AAPL) stock using real current market data and provide investment recommendation based on actual performance metrics"
     initial_state = {
-        "messages": [HumanMessage(content="Analyze Apple (AAPL) stock using real current market data and provide investment recommendation based on actual performance metrics")],
+        "messages": [HumanMessage(content=question)],
         "current_step": "start",
         "analysis_type": "general",
         "progress": {},
@@ -287,17 +480,59 @@ def test_workflow():
         "real_data_used": True
     }
     
-    config_dict = {"configurable": {"thread_id": "test_session"}}
+    thread_id = hashlib.sha1(question.encode()).hexdigest()[:16]
+    config_dict = {"configurable": {"thread_id": thread_id}}
     
+    try:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite not installed - completed runs will not be reused")
+        await _stream_workflow(graph, initial_state, config_dict)
+        return
+    
+    async with AsyncSqliteSaver.from_conn_string(config.CHECKPOINT_DB) as checkpointer:
+        local_graph = create_financial_workflow(checkpointer)
+        snapshot = await local_graph.aget_state(config_dict)
+        completed = snapshot.values.get("current_step") == "completed" and not snapshot.next
+        if completed and _analysis_age(snapshot.values) < config.STUDIO_REUSE_TTL:
+            print(f"♻️ Reusing completed analysis from checkpoint thread {thread_id}")
+            print(snapshot.values.get("results", {}).get("recommendation", ""))
+            return
+        if snapshot.values:
+            # Stale prices, a failed or an interrupted run - start the thread over
+            # rather than resuming or appending to the old one
+            await checkpointer.adelete_thread(thread_id)
+        await _stream_workflow(local_graph, initial_state, config_dict)
+
+def _analysis_age(values: Dict[str, Any]) -> float:
+    """Seconds since a completed run fetched its market data (inf if unknown)"""
+    timestamp = values.get("progress", {}).get("real_data_timestamp")
+    try:
+        return (datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()
+    except (TypeError, ValueError):
+        return float("inf")
+
+async def _stream_workflow(workflow_graph, initial_state: Dict[str, Any], config_dict: Dict[str, Any]):
+    """Print step updates, subtask progress and the streamed recommendation"""
     try:
         print("🧪 Testing workflow with real YFinance data...")
         step_count = 0
         
-        for step in graph.stream(initial_state, config_dict):
-            step_count += 1
-            print(f"Step {step_count}: {list(step.keys())}")
+        async for mode, chunk in workflow_graph.astream(initial_state, config_dict, stream_mode=["updates", "custom", "messages"]):
+            if mode == "updates":
+                step_count += 1
+                print(f"\nStep {step_count}: {list(chunk.keys())}")
+            elif mode == "custom":
+                print(f"🔧 {chunk['task'][:60]}... -> {', '.join(chunk['tools'])}")
+            else:
+                # Print the final recommendation token by token as it is generated
+                message, metadata = chunk
+                if isinstance(message, AIMessageChunk) and metadata.get("langgraph_node") == "synthesize":
+                    print(message.content, end="", flush=True)
             
-        print("✅ Workflow test completed successfully using real market data")
+        print("\n✅ Workflow test completed successfully using real market data")
+        if config.PROFILE_NODES:
+            print(NodeProfiler.report())
         
     except Exception as e:
         print(f"❌ Workflow test failed: {e}")
@@ -8,28 +8,187 @@ Uses real YFinance data for all financial analysis
 """
 
 import os
+import re
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime
+import atexit
+import contextlib
+import functools
+import hashlib
+import logging
+import time
+import weakref
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+import openai
+import orjson
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import StateGraph, START, END
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.graph.message import add_messages
+from langgraph.types import CachePolicy
+from langgraph.cache.memory import InMemoryCache
 
 # Import our custom modules
 from config import config
-from financial_tools import FINANCIAL_TOOLS
-from agent_state import create_initial_state, DeepAgentState
+from agent_logging import get_logger, flush_logs
+from http_clients import (
+    openai_http_client, openai_async_http_client, openai_rate_limiter,
+    get_async_http_client, close_async_http_client,
+)
+from financial_tools import FINANCIAL_TOOLS_BY_NAME
+from tool_cache import tool_cache
+from semantic_cache import get_semantic_cache, embed_task, aembed_task
+from ticker_cache import extract_tickers, prefetch_histories
+from checkpoint_store import prune_checkpoints
+from agent_state import create_initial_state, compact_message_history, DeepAgentState, TodoAgentState
 
-# Sub-Agent Registry
+logger = get_logger(__name__)
+
+_SEP = "-" * 50
+_QUERY_SEP = "-" * 60
+
+# Sub-Agent Registry (built once per process, see initialize_sub_agents)
 SUB_AGENTS = {}
+_SUPERVISOR_SINGLETON = None
+
+# Transient failures worth retrying a delegation for (anything else fails immediately)
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, httpx.ReadError)
+_DELEGATION_MAX_ATTEMPTS = 4
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honor a 429's Retry-After header when present, else exponential backoff with jitter"""
+    error = retry_state.outcome.exception()
+    if isinstance(error, openai.RateLimitError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            return min(float(retry_after), 30.0)
+        except (TypeError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    delay_ms = int(retry_state.next_action.sleep * 1000)
+    error = retry_state.outcome.exception()
+    logger.warning("🔁 Delegation attempt %d failed (%s), retrying in %dms", retry_state.attempt_number, type(error).__name__, delay_ms)
+
+# Delegation concurrency gates per event loop (asyncio semaphores are loop-bound)
+_DELEGATION_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _delegation_semaphore(agent_name: str) -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent runs of a sub-agent on the running loop"""
+    semaphores = _DELEGATION_SEMAPHORES.get(asyncio.get_running_loop())
+    if semaphores is None:
+        semaphores = {
+            "market_researcher": asyncio.Semaphore(config.MARKET_RESEARCHER_CONCURRENCY),
+            "default": asyncio.Semaphore(config.MAX_LLM_CONCURRENCY),
+        }
+        _DELEGATION_SEMAPHORES[asyncio.get_running_loop()] = semaphores
+    return semaphores.get(agent_name, semaphores["default"])
+
+# Delegation Tools
+async def _invoke_sub_agent(agent_name: str, task_description: str) -> Optional[str]:
+    """
+    Run a task on a registered sub-agent and return its final message content,
+    retrying transient OpenAI/network failures with backoff. Each attempt holds a
+    concurrency slot; request rate is smoothed by the shared openai_rate_limiter.
+    """
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(_DELEGATION_MAX_ATTEMPTS),
+        wait=_retry_wait,
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+        before_sleep=_log_retry,
+        reraise=True
+    ):
+        with attempt:
+            async with _delegation_semaphore(agent_name):
+                final_message = await _stream_sub_agent(agent_name, task_description)
+    
+    if final_message is not None and hasattr(final_message, 'content'):
+        return final_message.content
+    return None
+
+# Tool statuses after which the sub-agent is instructed to stop - no need to wait for its wrap-up
+_DATA_LIMITED_RE = re.compile(r'"status":\s*"(?:rate_limited|fallback_data)"')
+
+async def _stream_sub_agent(agent_name: str, task_description: str):
+    """
+    Stream a sub-agent run, printing each new step as it lands, and return its final message.
+    Returns early with the tool output if a data source reports rate_limited/fallback_data.
+    """
+    final_message = None
+    seen_ids = set()
+    async for namespace, event in SUB_AGENTS[agent_name].astream(
+        {"messages": [HumanMessage(content=task_description)]},
+        stream_mode="values",
+        subgraphs=True
+    ):
+        if not event.get("messages"):
+            continue
+        latest_message = event["messages"][-1]
+        final_message = latest_message
+        
+        # Inner agent steps arrive under a subgraph namespace; the root event is the final result
+        if not namespace or isinstance(latest_message, HumanMessage) or id(latest_message) in seen_ids:
+            continue
+        seen_ids.add(id(latest_message))
+        
+        content = latest_message.content if isinstance(latest_message.content, str) else ""
+        if content:
+            logger.info("  … %s: %.120s", agent_name, content)
+        if isinstance(latest_message, ToolMessage) and _DATA_LIMITED_RE.search(content):
+            logger.warning("⚠️ %s hit a data source limit - returning partial results", agent_name)
+            break
+    
+    return final_message
+
+# time.monotonic() until which delegations are halted after a data source limit (0 = not halted)
+_DATA_LIMITED_UNTIL = 0.0
+
+def _data_limited() -> bool:
+    """Whether a sub-agent hit a data source limit within the last DATA_LIMIT_COOLDOWN seconds"""
+    return time.monotonic() < _DATA_LIMITED_UNTIL
+
+def _halt_message(agent_name: str) -> str:
+    return (
+        f"HALT: data source limit reached (via {agent_name}). Stop delegating and tell the user "
+        f"to retry in {config.DATA_LIMIT_COOLDOWN // 60} minutes."
+    )
+
+async def _run_delegation(agent_name: str, task_description: str) -> str:
+    """
+    Run one delegated task on a sub-agent (shared by task and parallel_task)
+    """
+    global _DATA_LIMITED_UNTIL
+    
+    if agent_name not in SUB_AGENTS:
+        return f"❌ Sub-agent '{agent_name}' not found. Available agents: {list(SUB_AGENTS.keys())}"
+    
+    # Still cooling down from an earlier limit - don't spend LLM or YFinance calls on it
+    if _data_limited():
+        return _halt_message(agent_name)
+    
+    # Execute the task
+    content = await _invoke_sub_agent(agent_name, task_description)
+    
+    # Extract the response
+    if content is not None:
+        logger.info("✅ %s completed task", agent_name)
+        if isinstance(content, str) and _DATA_LIMITED_RE.search(content):
+            _DATA_LIMITED_UNTIL = time.monotonic() + config.DATA_LIMIT_COOLDOWN
+            return f"{_halt_message(agent_name)}\nPartial results:\n{content}"
+        return f"Sub-agent '{agent_name}' results:\n{content}"
+    
+    return f"✅ Task delegated to {agent_name} - check detailed output above"
 
-# Delegation Tool
 @tool
-def task(agent_name: str, task_description: str) -> str:
+async def task(agent_name: str, task_description: str) -> str:
     """
     Delegate a specific financial analysis task to a specialized sub-agent.
     
@@ -40,53 +199,168 @@ def task(agent_name: str, task_description: str) -> str:
     Returns:
         Results from the sub-agent execution
     """
-    print(f"\n🤖 Delegating to {agent_name}:")
-    print(f"📋 Task: {task_description}")
-    print("-" * 50)
+    logger.info("\n🤖 Delegating to %s:\n📋 Task: %s\n%s", agent_name, task_description, _SEP)
+    
+    try:
+        return await _run_delegation(agent_name, task_description)
+        
+    except Exception as e:
+        error_msg = f"❌ Error in sub-agent {agent_name}: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+@tool
+async def parallel_task(delegations: List[Dict[str, str]]) -> str:
+    """
+    Delegate several independent financial analysis tasks to sub-agents concurrently.
+    Use this instead of repeated task() calls when the tasks don't depend on each other.
+    
+    Args:
+        delegations: List of {"agent_name": ..., "task_description": ...} entries
+    
+    Returns:
+        Combined results from all sub-agents, in the order requested
+    """
+    logger.info(
+        "\n🤖 Delegating %d tasks in parallel:\n%s\n%s",
+        len(delegations),
+        "\n".join(f"  • {d.get('agent_name')}: {d.get('task_description', '')[:80]}" for d in delegations),
+        _SEP
+    )
+    
+    return await _run_delegations(delegations)
+
+async def _run_delegations(delegations: List[Dict[str, str]]) -> str:
+    """
+    Run independent delegations concurrently and join their results in request order
+    """
+    # Independent delegations finish in ~max(latency) instead of the sum
+    results = await asyncio.gather(
+        *(
+            _run_delegation(d.get("agent_name", ""), d.get("task_description", ""))
+            for d in delegations
+        ),
+        return_exceptions=True
+    )
+    
+    outputs = []
+    for delegation, result in zip(delegations, results):
+        if isinstance(result, Exception):
+            error_msg = f"❌ Error in sub-agent {delegation.get('agent_name')}: {str(result)}"
+            logger.error(error_msg)
+            outputs.append(error_msg)
+        else:
+            outputs.append(result)
+    
+    return "\n\n".join(outputs)
+
+# Most tasks packed into one sub-agent prompt; beyond this the answers degrade and
+# parallel calls win again
+ROW_MARSHAL_MAX = 5
+_BATCH_PREFIX = "Perform each of the following analyses and return a JSON array of results, one per input task:\n"
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# Appended to every sub-agent prompt so batched (task_multi) input gets list-shaped output
+_BATCH_CONTRACT = """
+
+**Batched Tasks:**
+If the request starts with "Perform each of the following analyses" and contains a JSON array of tasks, complete every task and reply with ONLY a JSON array of strings - one complete analysis per input task, in the same order."""
+
+# Data-source limit policy shared by every agent prompt. It is sent first so all prompts
+# start with the same tokens, which OpenAI's automatic prompt caching can reuse.
+RATE_LIMIT_POLICY = """**DATA SOURCE LIMITS - HARD STOP:**
+If ANY tool response contains "status": "rate_limited" or "status": "fallback_data", make NO further tool calls - no retries, no alternative tools for the same data. Instead explain the limitation ("rate_limited": Yahoo Finance is rate limiting requests; "fallback_data": YFinance is unavailable and fallback data is shown), suggest waiting 5-10 minutes before retrying for real-time data, and stay professional and reassuring that it is temporary."""
+
+def _sub_agent_prompt(system_prompt: str) -> str:
+    """Full sub-agent prompt: shared policy prefix, agent instructions, batched-task contract"""
+    return f"{RATE_LIMIT_POLICY}\n\n{system_prompt}{_BATCH_CONTRACT}"
+
+def _parse_batch_results(content: str, expected: int) -> Optional[List[str]]:
+    """Parse a batched reply into one result per task, or None if it isn't a matching JSON array"""
+    try:
+        parsed = orjson.loads(_JSON_FENCE_RE.sub("", content.strip()))
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(parsed, list) or len(parsed) != expected:
+        return None
+    return [item if isinstance(item, str) else orjson.dumps(item).decode() for item in parsed]
+
+@tool
+async def task_multi(agent_name: str, task_descriptions: List[str]) -> str:
+    """
+    Delegate several small tasks to the SAME sub-agent in one request (e.g. evaluating
+    AAPL, MSFT, GOOGL and NVDA individually with stock_analyst). Cheaper than separate
+    task() calls since the sub-agent's instructions are sent once.
+    
+    Args:
+        agent_name: Name of the sub-agent ('stock_analyst', 'portfolio_manager', 'risk_assessor', 'market_researcher')
+        task_descriptions: List of task descriptions for that sub-agent
+    
+    Returns:
+        One result per task, in the order requested
+    """
+    logger.info(
+        "\n🤖 Delegating %d tasks to %s:\n%s\n%s",
+        len(task_descriptions),
+        agent_name,
+        "\n".join(f"  • {t[:80]}" for t in task_descriptions),
+        _SEP
+    )
+    
+    delegations = [{"agent_name": agent_name, "task_description": t} for t in task_descriptions]
+    if len(task_descriptions) > ROW_MARSHAL_MAX:
+        return await _run_delegations(delegations)
     
     if agent_name not in SUB_AGENTS:
         return f"❌ Sub-agent '{agent_name}' not found. Available agents: {list(SUB_AGENTS.keys())}"
     
     try:
-        # Get the sub-agent
-        sub_agent = SUB_AGENTS[agent_name]
-        
-        # Execute the task
-        result = sub_agent.invoke({
-            "messages": [HumanMessage(content=task_description)]
-        })
-        
-        # Extract the response
-        if result and "messages" in result:
-            last_message = result["messages"][-1]
-            if hasattr(last_message, 'content'):
-                print(f"✅ {agent_name} completed task")
-                return f"Sub-agent '{agent_name}' results:\n{last_message.content}"
-        
-        return f"✅ Task delegated to {agent_name} - check detailed output above"
-        
+        content = await _invoke_sub_agent(
+            agent_name, _BATCH_PREFIX + orjson.dumps(task_descriptions).decode()
+        )
     except Exception as e:
         error_msg = f"❌ Error in sub-agent {agent_name}: {str(e)}"
-        print(error_msg)
+        logger.error(error_msg)
         return error_msg
+    
+    results = _parse_batch_results(content or "", len(task_descriptions))
+    if results is None:
+        # Reply didn't follow the list contract - hand back the raw analysis
+        logger.warning("⚠️ %s returned an unstructured batch reply", agent_name)
+        return f"Sub-agent '{agent_name}' results:\n{content}"
+    
+    logger.info("✅ %s completed %d tasks", agent_name, len(results))
+    return "\n\n".join(
+        f"Sub-agent '{agent_name}' results for task {i}: {task_description}\n{result}"
+        for i, (task_description, result) in enumerate(zip(task_descriptions, results), 1)
+    )
 
+@functools.lru_cache(maxsize=8)
+def _get_chat_model(model: str, temperature: float) -> ChatOpenAI:
+    """Shared ChatOpenAI per (model, temperature) on the pooled HTTP/2 connections"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=config.OPENAI_API_KEY,
+        http_client=openai_http_client,
+        http_async_client=openai_async_http_client,
+        rate_limiter=openai_rate_limiter
+    )
+
+@functools.lru_cache(maxsize=1)
 def create_stock_analyst_agent():
     """
     Create a specialized stock analysis sub-agent
     Focus: Individual stock analysis, technical indicators, fundamentals
     """
-    model = ChatOpenAI(
-        model=config.get_model_settings("reasoning")["model"],
-        temperature=0.0,
-        api_key=config.OPENAI_API_KEY
-    )
+    model = _get_chat_model(config.get_model_settings("reasoning")["model"], 0.0)
     
     # Stock-focused tools
     stock_tools = [
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_price"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_history"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_financial_statements"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "calculate_risk_metrics")
+        FINANCIAL_TOOLS_BY_NAME["get_stock_price"],
+        FINANCIAL_TOOLS_BY_NAME["get_stock_history"],
+        FINANCIAL_TOOLS_BY_NAME["get_financial_statements"],
+        FINANCIAL_TOOLS_BY_NAME["calculate_risk_metrics"]
     ]
     
     system_prompt = """You are a specialized Stock Analyst AI with deep expertise in individual equity analysis.
@@ -120,41 +394,31 @@ Provide structured, actionable analysis with:
 - Price targets with supporting rationale
 - Catalysts and risks to monitor
 
-**CRITICAL RATE LIMITING & DATA SOURCE HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "fallback_data", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or fallback response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "fallback_data" status, explain that YFinance is unavailable and fallback data is being used
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
-
 Focus on data-driven insights with specific numbers, ratios, and comparisons."""
     
+    prompt = _sub_agent_prompt(system_prompt)
+    _BATCH_SPECS["stock_analyst"] = (model.model_name, model.temperature, prompt)
+    
     return create_react_agent(
         model=model,
         tools=stock_tools,
-        prompt=system_prompt
+        prompt=prompt
     )
 
+@functools.lru_cache(maxsize=1)
 def create_portfolio_manager_agent():
     """
     Create a specialized portfolio management sub-agent
     Focus: Portfolio optimization, asset allocation, performance analysis
     """
-    model = ChatOpenAI(
-        model=config.get_model_settings("default")["model"],
-        temperature=0.1,
-        api_key=config.OPENAI_API_KEY
-    )
+    model = _get_chat_model(config.get_model_settings("default")["model"], 0.1)
     
-    # Portfolio-focused tools
+    # Portfolio-focused tools. get_stock_prices is the one that returns live data -
+    # one batched call prices every holding
     portfolio_tools = [
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "analyze_portfolio_performance"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_price"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "calculate_risk_metrics")
+        FINANCIAL_TOOLS_BY_NAME["get_stock_prices"],
+        FINANCIAL_TOOLS_BY_NAME["analyze_portfolio_performance"],
+        FINANCIAL_TOOLS_BY_NAME["calculate_risk_metrics"]
     ]
     
     system_prompt = """You are a specialized Portfolio Manager AI with expertise in portfolio construction and optimization.
@@ -188,41 +452,30 @@ Deliver professional portfolio analysis with:
 - Rebalancing suggestions with specific actions
 - Performance attribution and factor analysis
 
-**CRITICAL RATE LIMITING & DATA SOURCE HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "fallback_data", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or fallback response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "fallback_data" status, explain that YFinance is unavailable and fallback data is being used
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
-
 Maintain institutional-quality standards with precise calculations and clear recommendations."""
     
+    prompt = _sub_agent_prompt(system_prompt)
+    _BATCH_SPECS["portfolio_manager"] = (model.model_name, model.temperature, prompt)
+    
     return create_react_agent(
         model=model,
         tools=portfolio_tools,
-        prompt=system_prompt
+        prompt=prompt
     )
 
+@functools.lru_cache(maxsize=1)
 def create_risk_assessor_agent():
     """
     Create a specialized risk assessment sub-agent
     Focus: Risk metrics, stress testing, correlation analysis
     """
-    model = ChatOpenAI(
-        model=config.get_model_settings("reasoning")["model"],
-        temperature=0.0,
-        api_key=config.OPENAI_API_KEY
-    )
+    model = _get_chat_model(config.get_model_settings("reasoning")["model"], 0.0)
     
     # Risk-focused tools
     risk_tools = [
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "calculate_risk_metrics"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_history"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "analyze_portfolio_performance")
+        FINANCIAL_TOOLS_BY_NAME["calculate_risk_metrics"],
+        FINANCIAL_TOOLS_BY_NAME["get_stock_history"],
+        FINANCIAL_TOOLS_BY_NAME["analyze_portfolio_performance"]
     ]
     
     system_prompt = """You are a specialized Risk Assessment AI with expertise in quantitative risk analysis and management.
@@ -258,41 +511,30 @@ Provide comprehensive risk assessment with:
 - Risk management recommendations with specific actions
 - Monitoring metrics and early warning indicators
 
-**CRITICAL RATE LIMITING & DATA SOURCE HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "fallback_data", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or fallback response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "fallback_data" status, explain that YFinance is unavailable and fallback data is being used
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
-
 Focus on actionable risk insights with specific numerical thresholds and clear mitigation strategies."""
     
+    prompt = _sub_agent_prompt(system_prompt)
+    _BATCH_SPECS["risk_assessor"] = (model.model_name, model.temperature, prompt)
+    
     return create_react_agent(
         model=model,
         tools=risk_tools,
-        prompt=system_prompt
+        prompt=prompt
     )
 
+@functools.lru_cache(maxsize=1)
 def create_market_researcher_agent():
     """
     Create a specialized market research sub-agent
     Focus: Market trends, sector analysis, economic indicators
     """
-    model = ChatOpenAI(
-        model=config.get_model_settings("default")["model"],
-        temperature=0.2,
-        api_key=config.OPENAI_API_KEY
-    )
+    model = _get_chat_model(config.get_model_settings("default")["model"], 0.2)
     
     # Market research tools
     research_tools = [
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_market_overview"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_price"),
-        next(tool for tool in FINANCIAL_TOOLS if tool.name == "get_stock_history")
+        FINANCIAL_TOOLS_BY_NAME["get_market_overview"],
+        FINANCIAL_TOOLS_BY_NAME["get_stock_price"],
+        FINANCIAL_TOOLS_BY_NAME["get_stock_history"]
     ]
     
     # Add web search for market research
@@ -337,84 +579,345 @@ Deliver comprehensive market intelligence with:
 - Investment themes and opportunity identification
 - Risk factors and market vulnerabilities
 
-**CRITICAL RATE LIMITING & DATA SOURCE HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "fallback_data", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or fallback response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "fallback_data" status, explain that YFinance is unavailable and fallback data is being used
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
-
 Provide forward-looking insights while maintaining objectivity and data-driven analysis."""
     
+    prompt = _sub_agent_prompt(system_prompt)
+    _BATCH_SPECS["market_researcher"] = (model.model_name, model.temperature, prompt)
+    
     return create_react_agent(
         model=model,
         tools=research_tools,
-        prompt=system_prompt
+        prompt=prompt
+    )
+
+# Per-agent in-process result caches (entries expire after SUB_AGENT_CACHE_TTL)
+_SUB_AGENT_CACHES: Dict[str, InMemoryCache] = {}
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _task_cache_key(state: MessagesState) -> str:
+    """Cache key for a delegated task: the task text with case and whitespace normalized"""
+    task_description = state["messages"][-1].content
+    return _WHITESPACE_RE.sub(" ", task_description).strip().lower()
+
+def _disk_cache_key(agent_name: str, state: MessagesState) -> str:
+    """On-disk cache key: md5 of the agent name and normalized task text"""
+    return hashlib.md5(f"{agent_name}|{_task_cache_key(state)}".encode()).hexdigest()
+
+# Sub-agents that price several holdings at once - prefetching warms the history
+# cache their get_stock_prices call reads
+_PREFETCH_AGENTS = frozenset({"portfolio_manager"})
+
+def _with_result_cache(agent_name: str, agent):
+    """
+    Wrap a sub-agent in a single-node graph whose node result is cached, so a repeated
+    delegation (same agent, same task) skips both the LLM calls and the YFinance traffic.
+    Results are also kept on disk for SUB_AGENT_DISK_CACHE_TTL[agent_name] so they survive restarts,
+    and indexed by task embedding so paraphrased tasks can reuse them.
+    """
+    prefetch = agent_name in _PREFETCH_AGENTS
+    namespace = f"sub_agents/{agent_name}"
+    disk_ttl = config.SUB_AGENT_DISK_CACHE_TTL.get(agent_name, 0)
+    
+    semantic_cache = get_semantic_cache(agent_name) if config.SEMANTIC_CACHE_ENABLED else None
+    
+    def run(state: MessagesState) -> Dict[str, Any]:
+        task_description = state["messages"][-1].content
+        key = _disk_cache_key(agent_name, state)
+        cached = tool_cache.get(namespace, key, disk_ttl) if disk_ttl else None
+        
+        # Literal miss - fall back to a paraphrase match
+        embedding = embed_task(task_description) if cached is None and semantic_cache and disk_ttl else None
+        if embedding is not None:
+            tickers = extract_tickers(task_description)
+            cached = semantic_cache.lookup(embedding, disk_ttl, tickers)
+        if cached is not None:
+            return {"messages": [AIMessage(content=cached)]}
+        
+        if prefetch:
+            prefetch_histories(task_description)
+        result = agent.invoke({"messages": state["messages"]})
+        
+        last_message = result["messages"][-1]
+        if disk_ttl and isinstance(last_message.content, str) and last_message.content:
+            tool_cache.set(namespace, key, last_message.content)
+            if embedding is not None:
+                semantic_cache.add(embedding, last_message.content, tickers)
+        return {"messages": [last_message]}
+    
+    async def arun(state: MessagesState) -> Dict[str, Any]:
+        task_description = state["messages"][-1].content
+        key = _disk_cache_key(agent_name, state)
+        cached = await asyncio.to_thread(tool_cache.get, namespace, key, disk_ttl) if disk_ttl else None
+        
+        # Literal miss - fall back to a paraphrase match
+        embedding = await aembed_task(task_description) if cached is None and semantic_cache and disk_ttl else None
+        if embedding is not None:
+            tickers = extract_tickers(task_description)
+            cached = semantic_cache.lookup(embedding, disk_ttl, tickers)
+        if cached is not None:
+            return {"messages": [AIMessage(content=cached)]}
+        
+        if prefetch:
+            await asyncio.to_thread(prefetch_histories, task_description)
+        result = await agent.ainvoke({"messages": state["messages"]})
+        
+        last_message = result["messages"][-1]
+        if disk_ttl and isinstance(last_message.content, str) and last_message.content:
+            await asyncio.to_thread(tool_cache.set, namespace, key, last_message.content)
+            if embedding is not None:
+                await asyncio.to_thread(semantic_cache.add, embedding, last_message.content, tickers)
+        return {"messages": [last_message]}
+    
+    graph = StateGraph(MessagesState)
+    graph.add_node(
+        agent_name,
+        RunnableLambda(run, afunc=arun),
+        cache_policy=CachePolicy(key_func=_task_cache_key, ttl=config.SUB_AGENT_CACHE_TTL)
     )
+    graph.add_edge(START, agent_name)
+    graph.add_edge(agent_name, END)
+    
+    cache = _SUB_AGENT_CACHES.setdefault(agent_name, InMemoryCache())
+    return graph.compile(cache=cache)
 
-def initialize_sub_agents():
+@tool
+def invalidate_sub_agent_cache(agent_name: str = "all") -> str:
     """
-    Initialize all specialized sub-agents
+    Discard cached sub-agent results so the next delegation runs fresh analysis.
+    Use this when the user asks for up-to-the-minute data or market conditions changed.
+    
+    Args:
+        agent_name: Sub-agent whose cache to clear, or 'all' for every sub-agent
+    
+    Returns:
+        Confirmation of which caches were cleared
+    """
+    if agent_name == "all":
+        agent_names = list(_SUB_AGENT_CACHES)
+    elif agent_name in _SUB_AGENT_CACHES:
+        agent_names = [agent_name]
+    else:
+        return f"❌ Sub-agent '{agent_name}' not found. Available agents: {list(_SUB_AGENT_CACHES.keys())}"
+    
+    for name in agent_names:
+        _SUB_AGENT_CACHES[name].clear()
+        get_semantic_cache(name).clear()
+        tool_cache.clear(f"sub_agents/{name}")
+    
+    return f"✅ Cleared cached results for: {', '.join(agent_names)}"
+
+def initialize_sub_agents(force_rebuild: bool = False):
+    """
+    Initialize all specialized sub-agents (a no-op once the registry is populated)
     """
     global SUB_AGENTS
     
-    print("🏗️ Initializing specialized sub-agents...")
+    if SUB_AGENTS and not force_rebuild:
+        return
+    
+    if force_rebuild:
+        for factory in (create_stock_analyst_agent, create_portfolio_manager_agent,
+                        create_risk_assessor_agent, create_market_researcher_agent):
+            factory.cache_clear()
+        SUB_AGENTS.clear()
+    
+    logger.info("🏗️ Initializing specialized sub-agents...")
     
     try:
-        SUB_AGENTS["stock_analyst"] = create_stock_analyst_agent()
-        print("✓ Stock Analyst sub-agent ready")
+        SUB_AGENTS["stock_analyst"] = _with_result_cache("stock_analyst", create_stock_analyst_agent())
+        logger.info("✓ Stock Analyst sub-agent ready")
         
-        SUB_AGENTS["portfolio_manager"] = create_portfolio_manager_agent()
-        print("✓ Portfolio Manager sub-agent ready")
+        SUB_AGENTS["portfolio_manager"] = _with_result_cache("portfolio_manager", create_portfolio_manager_agent())
+        logger.info("✓ Portfolio Manager sub-agent ready")
         
-        SUB_AGENTS["risk_assessor"] = create_risk_assessor_agent()
-        print("✓ Risk Assessor sub-agent ready")
+        SUB_AGENTS["risk_assessor"] = _with_result_cache("risk_assessor", create_risk_assessor_agent())
+        logger.info("✓ Risk Assessor sub-agent ready")
         
-        SUB_AGENTS["market_researcher"] = create_market_researcher_agent()
-        print("✓ Market Researcher sub-agent ready")
+        SUB_AGENTS["market_researcher"] = _with_result_cache("market_researcher", create_market_researcher_agent())
+        logger.info("✓ Market Researcher sub-agent ready")
         
-        print(f"✅ All {len(SUB_AGENTS)} sub-agents initialized successfully")
+        logger.info("✅ All %d sub-agents initialized successfully", len(SUB_AGENTS))
         
     except Exception as e:
-        print(f"❌ Error initializing sub-agents: {str(e)}")
+        logger.error("❌ Error initializing sub-agents: %s", e)
         raise
 
-def create_supervisor_agent():
+# (model, temperature, system prompt) per sub-agent, recorded by the factories so
+# deferred batch requests match what the live sub-agent would be sent
+_BATCH_SPECS: Dict[str, Tuple[str, float, str]] = {}
+_BATCH_DIR = Path(config.TOOL_CACHE_DIR) / "batches"
+
+def _dumps_status(status: str, **fields) -> str:
+    """JSON tool response with a status field, like the financial tools return"""
+    return orjson.dumps({"status": status, **fields}).decode()
+
+@functools.lru_cache(maxsize=1)
+def _get_openai_client() -> openai.OpenAI:
+    """Plain OpenAI client (files + batches endpoints) on the pooled HTTP connection"""
+    return openai.OpenAI(api_key=config.OPENAI_API_KEY, http_client=openai_http_client)
+
+def _market_data_snapshot(task_description: str) -> str:
+    """Current prices for the tickers a task mentions, fetched now since batch requests can't call tools"""
+    tickers = extract_tickers(task_description)
+    if not tickers:
+        return ""
+    prices = FINANCIAL_TOOLS_BY_NAME["get_stock_prices"].invoke({"symbols": ",".join(sorted(tickers))})
+    return f"\n\nREAL market data snapshot (YFinance, {datetime.now(timezone.utc).isoformat()}):\n{prices}"
+
+def submit_batch(delegations: List[Dict[str, str]]) -> str:
     """
-    Create the main supervisor agent that delegates to sub-agents
+    Submit delegations to the OpenAI Batch API (~50% cheaper, results within 24h).
+    Each request is the sub-agent's own system prompt plus the task and a price snapshot.
+    Returns the batch id; the submission record is kept under .cache/batches/.
     """
-    if not config.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY is required")
-    
-    # Initialize sub-agents first
     initialize_sub_agents()
     
-    # Supervisor model
-    model = ChatOpenAI(
-        model=config.get_model_settings("reasoning")["model"],
-        temperature=0.1,
-        api_key=config.OPENAI_API_KEY
+    lines = []
+    for i, delegation in enumerate(delegations):
+        agent_name = delegation.get("agent_name", "")
+        if agent_name not in _BATCH_SPECS:
+            raise ValueError(f"Sub-agent '{agent_name}' not found. Available agents: {list(_BATCH_SPECS.keys())}")
+        model, temperature, prompt = _BATCH_SPECS[agent_name]
+        task_description = delegation.get("task_description", "")
+        lines.append(orjson.dumps({
+            "custom_id": f"{i}-{agent_name}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "temperature": temperature,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": task_description + _market_data_snapshot(task_description)},
+                ],
+            },
+        }))
+    
+    client = _get_openai_client()
+    input_file = client.files.create(file=("delegations.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
     )
     
-    # Supervisor tools: delegation + basic financial tools + file system
+    _BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    submitted_at = datetime.now(timezone.utc)
+    (_BATCH_DIR / f"{submitted_at.strftime('%Y%m%dT%H%M%S')}.json").write_bytes(orjson.dumps({
+        "batch_id": batch.id,
+        "submitted_at": submitted_at.isoformat(),
+        "delegations": delegations,
+    }))
+    
+    logger.info("📮 Submitted %d delegations as batch %s", len(delegations), batch.id)
+    return batch.id
+
+@tool
+def submit_deferred_analysis(delegations: List[Dict[str, str]]) -> str:
+    """
+    Queue NON-URGENT sub-agent tasks (e.g. overnight or end-of-day analysis) on the OpenAI
+    Batch API at about half the cost. Results arrive within 24 hours - use poll_batch to collect them.
+    Deferred sub-agents can't call tools; they get a price snapshot taken at submission.
+    
+    Args:
+        delegations: List of {"agent_name": ..., "task_description": ...} entries
+    
+    Returns:
+        The batch id to poll later
+    """
+    try:
+        batch_id = submit_batch(delegations)
+        return _dumps_status("submitted", batch_id=batch_id, requests=len(delegations))
+    except Exception as e:
+        logger.error("❌ Error submitting batch: %s", e)
+        return _dumps_status("error", error=str(e))
+
+@tool
+def poll_batch(batch_id: str) -> str:
+    """
+    Check a deferred analysis batch and return its results once completed.
+    
+    Args:
+        batch_id: Id returned by submit_deferred_analysis
+    
+    Returns:
+        Batch status, plus one result per delegation when finished
+    """
+    try:
+        client = _get_openai_client()
+        batch = client.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            counts = batch.request_counts.model_dump() if batch.request_counts else None
+            return _dumps_status(batch.status, batch_id=batch_id, request_counts=counts)
+        
+        results = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            row = orjson.loads(line)
+            response = row.get("response") or {}
+            if response.get("status_code") == 200:
+                results[row["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                results[row["custom_id"]] = f"❌ Request failed: {row.get('error') or response.get('body')}"
+        
+        # Output lines aren't guaranteed to follow submission order
+        ordered = dict(sorted(results.items(), key=lambda item: int(item[0].split("-", 1)[0])))
+        return _dumps_status("completed", batch_id=batch_id, results=ordered)
+    except Exception as e:
+        logger.error("❌ Error polling batch %s: %s", batch_id, e)
+        return _dumps_status("error", batch_id=batch_id, error=str(e))
+
+@functools.lru_cache(maxsize=1)
+def _import_supervisor_tools() -> tuple:
+    """
+    Planning and file system tools for the supervisor, imported on first use so
+    importing this module doesn't load the other notebook modules
+    """
     from file_system_agent import ls, read_file, write_file, edit_file
     from todo_planning_agent import write_todos, update_todo, get_todo_status
     
+    return (write_todos, update_todo, get_todo_status, ls, read_file, write_file, edit_file)
+
+def create_supervisor_agent(force_rebuild: bool = False, checkpointer=None):
+    """
+    Create the main supervisor agent that delegates to sub-agents.
+    The supervisor and its sub-agents are built once and reused on later calls
+    unless force_rebuild is set or a different checkpointer is passed
+    (defaults to in-process MemorySaver).
+    """
+    global _SUPERVISOR_SINGLETON
+    
+    if (_SUPERVISOR_SINGLETON is not None and not force_rebuild
+            and checkpointer in (None, _SUPERVISOR_SINGLETON.checkpointer)):
+        return _SUPERVISOR_SINGLETON
+    
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY is required")
+    
+    # Initialize sub-agents first
+    initialize_sub_agents(force_rebuild)
+    
+    # Supervisor model
+    model = _get_chat_model(config.get_model_settings("reasoning")["model"], 0.1)
+    
+    # Supervisor tools: delegation + planning + file system. Financial data tools stay with
+    # the sub-agents so their schemas aren't re-sent on every supervisor turn
     supervisor_tools = [
-        task,  # Delegation tool
-        write_todos, update_todo, get_todo_status,  # Planning tools
-        ls, read_file, write_file, edit_file,  # File system tools
-    ] + FINANCIAL_TOOLS  # Basic financial tools for oversight
+        task, parallel_task, task_multi, invalidate_sub_agent_cache,  # Delegation tools
+        submit_deferred_analysis, poll_batch,  # Deferred (Batch API) delegation
+        *_import_supervisor_tools(),  # Planning + file system tools
+    ]
     
     # Create memory
-    memory = MemorySaver()
+    if checkpointer is None:
+        from langgraph.checkpoint.memory import MemorySaver
+        checkpointer = MemorySaver()
     
-    # Supervisor system prompt
-    supervisor_prompt = """You are the Supervisor Agent for DeepAgent Financial Systems, orchestrating sophisticated financial analysis through specialized sub-agents.
+    # Supervisor system prompt (shared policy first, so it's an identical cacheable prefix)
+    supervisor_prompt = RATE_LIMIT_POLICY + """
+
+You are the Supervisor Agent for DeepAgent Financial Systems, orchestrating sophisticated financial analysis through specialized sub-agents.
 
 **Your Role:**
 - **Strategic Orchestration**: Break down complex financial requests into specialized tasks
@@ -435,6 +938,11 @@ def create_supervisor_agent():
 - **Risk Assessment**: Use risk_assessor for quantitative risk metrics and stress testing
 - **Market Context**: Use market_researcher for broader market trends and opportunities
 - **Complex Analysis**: Delegate multiple tasks to different agents and synthesize results
+- **Same Agent, Several Small Tasks**: Use task_multi() to send up to 5 related tasks (e.g. one per ticker) to one sub-agent in a single request
+- **Deferred Analysis**: For work the user explicitly doesn't need now (overnight or end-of-day runs), use submit_deferred_analysis() - about half the cost, results within 24h via poll_batch()
+- **Fresh Data**: Sub-agent results are cached; call invalidate_sub_agent_cache() before delegating if the user needs a fresh analysis
+- **HALT**: If a delegation result starts with "HALT:", make no further tool calls - report the partial results and the retry time to the user
+- **Independent Tasks**: When the plan needs more than one sub-agent and the tasks don't depend on each other, batch them into ONE parallel_task() call instead of serial task() calls
 
 **Workflow Management:**
 1. **Plan First**: Create TODO list for complex multi-agent workflows
@@ -444,6 +952,7 @@ def create_supervisor_agent():
 5. **Track Progress**: Update TODO status as tasks complete
 
 **Real Data Requirements:**
+- You have no direct market data tools - get prices, history, statements, portfolio performance, market overview and risk metrics by delegating
 - All sub-agents use real YFinance data - never mock or test data
 - Ensure current market prices and actual financial metrics
 - Validate data freshness and handle market hours appropriately
@@ -461,28 +970,22 @@ def create_supervisor_agent():
 - Offer clear, actionable recommendations with supporting rationale
 - Document methodology and data sources used by each sub-agent
 
-**CRITICAL RATE LIMITING HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "error", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or error response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- If you receive "error" status, explain that YFinance is currently unavailable
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Offer alternative approaches like web search for current market news
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
-
-Use the task() tool to delegate specific work to sub-agents. Coordinate their efforts to deliver comprehensive financial analysis that leverages each agent's specialized expertise."""
-    
-    agent = create_react_agent(
+**Supervisor Data Limits:**
+- Also treat "status": "error" as a hard stop (YFinance is currently unavailable) and offer web search for current market news instead
+
+Use the task() tool to delegate specific work to sub-agents, or parallel_task() to run independent delegations concurrently. Coordinate their efforts to deliver comprehensive financial analysis that leverages each agent's specialized expertise."""
+    
+    _SUPERVISOR_SINGLETON = create_react_agent(
         model=model,
         tools=supervisor_tools,
-        checkpointer=memory,
-        prompt=supervisor_prompt
+        checkpointer=checkpointer,
+        # Keeps long-lived (persisted) session threads from resending their whole history
+        pre_model_hook=compact_message_history,
+        prompt=supervisor_prompt,
+        state_schema=TodoAgentState  # carries the TODO list the planning tools read and write
     )
     
-    return agent
+    return _SUPERVISOR_SINGLETON
 
 def run_delegation_demo():
     """
@@ -492,12 +995,16 @@ def run_delegation_demo():
     print("=" * 66)
     
     try:
-        supervisor = create_supervisor_agent()
-        print("✓ Supervisor agent with sub-agents created successfully")
+        checkpointer = _get_runner().run(_open_checkpointer())
+        supervisor = create_supervisor_agent(checkpointer=checkpointer)
+        logger.info("✓ Supervisor agent with sub-agents created successfully")
     except Exception as e:
         print(f"❌ Failed to create supervisor agent: {str(e)}")
         return
     
+    # Pay connection setup and cache loading now rather than on the first scenario
+    warmup_sub_agents()
+    
     # Multi-agent delegation scenarios
     delegation_scenarios = [
         """I need a complete investment analysis for Tesla (TSLA). This should include:
@@ -543,7 +1050,25 @@ def run_delegation_demo():
         print(f"\n{i}. {scenario[:80]}...")
     
     # Interactive demo
+    _get_runner().run(_delegation_demo_loop(supervisor, delegation_scenarios))
+    
+    _get_runner().run(_CHECKPOINT_STACK.aclose())
+    _get_runner().run(close_async_http_client())
+    print("\n👋 Sub-agent delegation demo completed!")
+
+async def _delegation_demo_loop(supervisor, delegation_scenarios: List[str]):
+    """
+    Interactive scenario loop on the session event loop. input() waits on a worker thread,
+    so the price prefetch for the demo tickers keeps running while the user decides.
+    """
+    scenario_text = "\n".join(delegation_scenarios)
+    prefetch = None
+    
     while True:
+        # Re-warm whenever the previous batch is done (history entries expire after HISTORY_CACHE_TTL)
+        if prefetch is None or prefetch.done():
+            prefetch = asyncio.create_task(asyncio.to_thread(prefetch_histories, scenario_text))
+        
         print(f"\n" + "=" * 66)
         print("Options:")
         print("  1-5: Run delegation scenario")
@@ -551,7 +1076,7 @@ def run_delegation_demo():
         print("  custom: Enter your own complex query")
         print("  quit: Exit demo")
         
-        choice = input("\nYour choice: ").strip().lower()
+        choice = (await asyncio.to_thread(input, "\nYour choice: ")).strip().lower()
         
         if choice == "quit":
             break
@@ -562,59 +1087,145 @@ def run_delegation_demo():
             print("  • risk_assessor: Risk metrics and stress testing")
             print("  • market_researcher: Market trends and sector analysis")
         elif choice == "custom":
-            custom_query = input("Enter your complex financial query (will use multiple agents): ").strip()
+            custom_query = (await asyncio.to_thread(input, "Enter your complex financial query (will use multiple agents): ")).strip()
             if custom_query:
-                run_delegation_query(supervisor, custom_query)
+                await _run_delegation_query(supervisor, custom_query, "delegation_session")
         elif choice.isdigit() and 1 <= int(choice) <= len(delegation_scenarios):
             scenario_index = int(choice) - 1
-            run_delegation_query(supervisor, delegation_scenarios[scenario_index])
+            await _run_delegation_query(supervisor, delegation_scenarios[scenario_index], "delegation_session")
         else:
             print("Invalid choice. Please try again.")
     
-    print("\n👋 Sub-agent delegation demo completed!")
+    # The download thread itself can't be interrupted; this just stops waiting on it
+    prefetch.cancel()
+
+# One event loop for the whole delegation session - the pooled async HTTP/2 connections
+# belong to the loop that opened them, so a fresh asyncio.run() per query would drop them
+_RUNNER: Optional[asyncio.Runner] = None
+
+def _get_runner() -> asyncio.Runner:
+    """Get (or lazily create) the session event loop runner"""
+    global _RUNNER
+    if _RUNNER is None:
+        _RUNNER = asyncio.Runner()
+        atexit.register(_RUNNER.close)
+    return _RUNNER
+
+# Open checkpointer connections, closed when the demo exits
+_CHECKPOINT_STACK = contextlib.AsyncExitStack()
+
+async def _open_checkpointer():
+    """
+    Open the durable SQLite checkpointer on the session loop (None if unavailable)
+    so delegation session threads survive demo restarts
+    """
+    try:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        logger.warning("⚠️ langgraph-checkpoint-sqlite not installed - supervisor memory will not persist")
+        return None
+    
+    checkpointer = await _CHECKPOINT_STACK.enter_async_context(
+        AsyncSqliteSaver.from_conn_string(config.CHECKPOINT_DB)
+    )
+    await prune_checkpoints(checkpointer)
+    return checkpointer
+
+async def _warmup_sub_agents():
+    """
+    Open the pooled OpenAI connection and load each sub-agent's semantic cache concurrently
+    """
+    async def open_connection():
+        try:
+            await get_async_http_client().get(
+                "https://api.openai.com/v1/models",
+                headers={"Authorization": f"Bearer {config.OPENAI_API_KEY}"}
+            )
+        except httpx.HTTPError:
+            pass
+    
+    loaders = [asyncio.to_thread(get_semantic_cache, name) for name in SUB_AGENTS] if config.SEMANTIC_CACHE_ENABLED else []
+    await asyncio.gather(open_connection(), *loaders)
+
+def warmup_sub_agents():
+    """
+    Warm up the delegation session before the first query (best effort)
+    """
+    start_time = time.perf_counter()
+    _get_runner().run(_warmup_sub_agents())
+    logger.info("🔥 Delegation session warmed up in %.2fs", time.perf_counter() - start_time)
+    flush_logs()
 
 def run_delegation_query(supervisor, query: str, session_id: str = "delegation_session"):
     """
     Run a complex query through the supervisor with sub-agent delegation
     """
+    # Async streaming lets parallel_task overlap its sub-agent calls on one event loop
+    _get_runner().run(_run_delegation_query(supervisor, query, session_id))
+
+async def _run_delegation_query(supervisor, query: str, session_id: str):
+    """
+    Stream the supervisor's delegation workflow for a query
+    """
     config_dict = {"configurable": {"thread_id": session_id}}
     
-    print(f"\n🎭 Multi-Agent Delegation Query:")
-    print("-" * 60)
-    print(query)
-    print("-" * 60)
+    logger.info("\n🎭 Multi-Agent Delegation Query:\n%s\n%s\n%s", _QUERY_SEP, query, _QUERY_SEP)
     
     try:
-        messages = []
-        for event in supervisor.stream(
+        seen_ids = set()
+        async for event in supervisor.astream(
             {"messages": [HumanMessage(content=query)]},
             config=config_dict,
             stream_mode="values"
         ):
-            if "messages" in event and event["messages"]:
-                latest_message = event["messages"][-1]
-                
-                if latest_message not in messages:
-                    messages.append(latest_message)
-                    
-                    if hasattr(latest_message, 'content') and latest_message.content:
-                        # Show supervisor content but not sub-agent tool calls
-                        if not (hasattr(latest_message, 'tool_calls') and latest_message.tool_calls):
-                            print(f"\n🎭 Supervisor: {latest_message.content}")
-                    
-                    # Show delegation actions
-                    if hasattr(latest_message, 'tool_calls') and latest_message.tool_calls:
-                        for tool_call in latest_message.tool_calls:
-                            if tool_call['name'] == 'task':
-                                agent_name = tool_call['args'].get('agent_name', 'unknown')
-                                print(f"\n🤖 Delegating to {agent_name}...")
-                            elif tool_call['name'] in FINANCIAL_TOOLS:
-                                print(f"\n🔧 Supervisor using: {tool_call['name']}")
-        
-        print(f"\n✅ Multi-agent delegation workflow completed!")
+            if not event.get("messages"):
+                continue
+            latest_message = event["messages"][-1]
+            
+            # The stream re-yields the latest message until the next step lands
+            message_key = getattr(latest_message, "id", None) or id(latest_message)
+            if message_key in seen_ids:
+                continue
+            seen_ids.add(message_key)
+            
+            content = getattr(latest_message, "content", None)
+            tool_calls = getattr(latest_message, "tool_calls", None)
+            
+            # Show supervisor content but not sub-agent tool calls
+            if content and not tool_calls:
+                logger.info("\n🎭 Supervisor: %s", content)
+            
+            # Show delegation actions
+            for tool_call in tool_calls or ():
+                if tool_call['name'] == 'task':
+                    agent_name = tool_call['args'].get('agent_name', 'unknown')
+                    logger.info("\n🤖 Delegating to %s...", agent_name)
+                elif tool_call['name'] == 'task_multi':
+                    agent_name = tool_call['args'].get('agent_name', 'unknown')
+                    task_count = len(tool_call['args'].get('task_descriptions', []))
+                    logger.info("\n🤖 Delegating %d tasks to %s...", task_count, agent_name)
+                elif tool_call['name'] == 'parallel_task':
+                    agent_names = [d.get('agent_name', 'unknown') for d in tool_call['args'].get('delegations', [])]
+                    logger.info("\n🤖 Delegating in parallel to %s...", ", ".join(agent_names))
+                elif logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("\n🔧 Supervisor using: %s", tool_call['name'])
+            
+            # A delegation hit a data source limit - end here instead of paying for another
+            # supervisor turn that can only report the failure
+            if isinstance(latest_message, ToolMessage) and _data_limited():
+                logger.warning(
+                    "\n⚠️ Data source limit reached - stopping this workflow. "
+                    "Please retry in %d minutes.", config.DATA_LIMIT_COOLDOWN // 60
+                )
+                break
+        else:
+            logger.info("\n✅ Multi-agent delegation workflow completed!")
         
     except Exception as e:
-        print(f"❌ Error in delegation workflow: {str(e)}")
+        logger.error("❌ Error in delegation workflow: %s", e)
+    
+    # Let queued output land before the demo menu prints again
+    flush_logs()
 
 if __name__ == "__main__":
     run_delegation_demo()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Tests for the state helpers and message history compaction
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from agent_state import (
+    cache_financial_data, compact_message_history, create_initial_state, get_cached_financial_data,
+    register_sub_agent, update_sub_agent_status, write_file,
+)
+from config import config
+
+def _conversation(count: int) -> list:
+    return [
+        HumanMessage(content=f"request {i}", id=f"m{i}") if i % 2 == 0 else AIMessage(content=f"answer {i}", id=f"m{i}")
+        for i in range(count)
+    ]
+
+def test_short_history_is_left_alone():
+    assert compact_message_history({"messages": _conversation(config.MAX_MESSAGE_WINDOW)}) == {}
+
+def test_long_history_is_replaced_by_summary_and_recent_window():
+    messages = _conversation(config.MAX_MESSAGE_WINDOW + 5)
+    
+    update = compact_message_history({"messages": messages})["messages"]
+    
+    remove, summary, *kept = update
+    assert isinstance(remove, RemoveMessage) and remove.id == REMOVE_ALL_MESSAGES
+    assert isinstance(summary, SystemMessage)
+    assert kept == messages[-config.MESSAGE_WINDOW_KEEP:]
+    
+    dropped = len(messages) - config.MESSAGE_WINDOW_KEEP
+    assert f"Summary of {dropped} earlier messages" in summary.content
+    assert "- request 0" in summary.content
+    assert "answer 1" not in summary.content
+
+def test_window_never_starts_on_an_orphaned_tool_result():
+    messages = _conversation(config.MAX_MESSAGE_WINDOW + 5)
+    cut = len(messages) - config.MESSAGE_WINDOW_KEEP
+    messages[cut] = ToolMessage(content="tool output", tool_call_id="call_1", id="tool_1")
+    messages[cut + 1] = ToolMessage(content="tool output", tool_call_id="call_2", id="tool_2")
+    
+    _, _, *kept = compact_message_history({"messages": messages})["messages"]
+    
+    assert kept == messages[cut + 2:]
+    assert kept[0].type != "tool"
+
+def test_sub_agent_helpers_leave_the_previous_state_untouched():
+    state = create_initial_state("Analyze AAPL")
+    
+    registered = register_sub_agent(state, "stock_analyst", "Stock analysis", ["get_stock_price"])
+    assert state["sub_agents"] == {}
+    assert registered["sub_agents"]["stock_analyst"]["status"] == "idle"
+    
+    working = update_sub_agent_status(registered, "stock_analyst", "completed", {"summary": "done"})
+    assert registered["sub_agents"]["stock_analyst"]["status"] == "idle"
+    assert registered["sub_agents"]["stock_analyst"]["results"] is None
+    assert working["sub_agents"]["stock_analyst"]["status"] == "completed"
+    assert working["sub_agents"]["stock_analyst"]["results"] == {"summary": "done"}
+    
+    # Untouched branches are shared, not copied
+    assert working["todos"] is state["todos"]
+
+def test_file_and_cache_helpers_update_the_state_in_place():
+    state = create_initial_state("Analyze AAPL")
+    
+    assert write_file(state, "notes.md", "AAPL looks strong") is state
+    assert state["files"]["notes.md"]["content"] == "AAPL looks strong"
+    assert state["file_operations_log"][-1]["operation"] == "write"
+    
+    assert cache_financial_data(state, "AAPL", "price", {"price": 190.0}) is state
+    assert get_cached_financial_data(state, "AAPL", "price") == {"price": 190.0}
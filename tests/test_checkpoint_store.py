@@ -0,0 +1,44 @@
+"""
+Tests for pruning stale checkpoint threads
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from checkpoint_store import prune_checkpoints
+
+sqlite_aio = pytest.importorskip("langgraph.checkpoint.sqlite.aio")
+
+def _checkpoint_id(ts: datetime) -> str:
+    """uuid6 id for a checkpoint taken at ts, laid out like LangGraph's own ids"""
+    ticks = int(ts.timestamp() * 1e7) + 0x01B21DD213814000
+    return str(uuid.UUID(int=(ticks >> 12) << 80 | 0x6 << 76 | (ticks & 0xFFF) << 64 | 0x8 << 60))
+
+def _checkpoint(ts: datetime) -> dict:
+    return {
+        "v": 1, "id": _checkpoint_id(ts), "ts": ts.isoformat(),
+        "channel_values": {}, "channel_versions": {}, "versions_seen": {},
+    }
+
+async def _save(checkpointer, thread_id: str, ts: datetime) -> None:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    await checkpointer.aput(config, _checkpoint(ts), {}, {})
+
+def test_prunes_only_threads_idle_past_the_ttl(tmp_path):
+    now = datetime.now(timezone.utc)
+    
+    async def run():
+        async with sqlite_aio.AsyncSqliteSaver.from_conn_string(str(tmp_path / "checkpoints.db")) as checkpointer:
+            await _save(checkpointer, "stale", now - timedelta(days=30))
+            # An old first checkpoint doesn't make a thread stale if it was used recently
+            await _save(checkpointer, "active", now - timedelta(days=30))
+            await _save(checkpointer, "active", now)
+            
+            pruned = await prune_checkpoints(checkpointer)
+            remaining = {t.config["configurable"]["thread_id"] async for t in checkpointer.alist(None)}
+            return pruned, remaining
+    
+    assert asyncio.run(run()) == (1, {"active"})
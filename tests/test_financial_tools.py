@@ -0,0 +1,91 @@
+"""
+Tests for the YFinance tool error statuses
+"""
+
+import orjson
+import pytest
+
+import financial_tools
+
+# The undecorated tool bodies - bypass the on-disk tool cache
+get_stock_price = financial_tools.get_stock_price.func.__wrapped__
+get_stock_prices = financial_tools.get_stock_prices.func.__wrapped__
+
+@pytest.fixture(autouse=True)
+def _cold_history_cache(monkeypatch):
+    monkeypatch.setattr(financial_tools, "peek_history", lambda symbol, period="5d": None)
+
+def _fail_with(monkeypatch, error):
+    def raise_error(*args, **kwargs):
+        raise error
+    monkeypatch.setattr(financial_tools, "_fetch_price_history", raise_error)
+    monkeypatch.setattr(financial_tools, "_fetch_price_histories", raise_error)
+
+def test_rate_limit_reports_rate_limited(monkeypatch):
+    _fail_with(monkeypatch, RuntimeError("429 Client Error: Too Many Requests"))
+    
+    result = orjson.loads(get_stock_price("AAPL"))
+    assert result["status"] == "rate_limited"
+    
+    result = orjson.loads(get_stock_prices("AAPL,MSFT"))
+    assert result["status"] == "rate_limited"
+
+@pytest.mark.skipif(financial_tools.YFRateLimitError is None, reason="yfinance has no YFRateLimitError")
+def test_yfinance_rate_limit_error_reports_rate_limited(monkeypatch):
+    _fail_with(monkeypatch, financial_tools.YFRateLimitError())
+    
+    result = orjson.loads(get_stock_price("AAPL"))
+    assert result["status"] == "rate_limited"
+
+def test_other_failures_report_error(monkeypatch):
+    _fail_with(monkeypatch, ValueError("boom"))
+    
+    result = orjson.loads(get_stock_price("AAPL"))
+    assert result["status"] == "error"
+    assert result["error_details"] == "boom"
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeClock()
+    monkeypatch.setattr(financial_tools.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(financial_tools.time, "sleep", fake.sleep)
+    return fake
+
+def test_token_bucket_bursts_up_to_capacity(clock):
+    bucket = financial_tools.TokenBucket(calls_per_minute=60, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+    
+    assert clock.sleeps == []
+
+def test_token_bucket_waits_for_refill_when_empty(clock):
+    bucket = financial_tools.TokenBucket(calls_per_minute=60, capacity=2)
+    for _ in range(4):
+        bucket.acquire()
+    
+    # One token per second: the 3rd call reserves the next token, the 4th the one after
+    assert clock.sleeps == pytest.approx([1.0, 2.0])
+
+def test_token_bucket_refills_over_time_without_exceeding_capacity(clock):
+    bucket = financial_tools.TokenBucket(calls_per_minute=60, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    
+    clock.now += 60.0
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.sleeps == []
+    
+    bucket.acquire()
+    assert clock.sleeps == pytest.approx([1.0])
@@ -0,0 +1,82 @@
+"""
+Tests for the semantic sub-agent cache
+"""
+
+import time
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+def _cache(tmp_path, threshold=0.9, max_entries=10):
+    return SemanticCache(tmp_path / "agent", threshold=threshold, max_entries=max_entries)
+
+def test_similar_task_with_same_tickers_hits(tmp_path):
+    cache = _cache(tmp_path)
+    cache.add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    
+    assert cache.lookup([0.99, 0.05, 0.0], ttl=3600, tickers={"AAPL"}) == "AAPL risk report"
+
+def test_similar_task_with_different_tickers_misses(tmp_path):
+    cache = _cache(tmp_path)
+    cache.add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    
+    # "risk metrics for AAPL" vs "risk metrics for MSFT" embed almost identically
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"MSFT"}) is None
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL", "MSFT"}) is None
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600) is None
+
+def test_ticker_match_picks_the_right_row(tmp_path):
+    cache = _cache(tmp_path)
+    cache.add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    cache.add([1.0, 0.01, 0.0], "MSFT risk report", {"MSFT"})
+    
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"MSFT"}) == "MSFT risk report"
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "AAPL risk report"
+
+def test_tickers_survive_reload(tmp_path):
+    _cache(tmp_path).add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    
+    reloaded = _cache(tmp_path)
+    assert reloaded.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"MSFT"}) is None
+    assert reloaded.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "AAPL risk report"
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    cache.add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    
+    later = time.time() + 120
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: later)
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=60, tickers={"AAPL"}) is None
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "AAPL risk report"
+
+def test_below_threshold_misses(tmp_path):
+    cache = _cache(tmp_path, threshold=0.99)
+    cache.add([1.0, 0.0, 0.0], "AAPL risk report", {"AAPL"})
+    
+    assert cache.lookup([1.0, 1.0, 0.0], ttl=3600, tickers={"AAPL"}) is None
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.add([1.0, 0.0, 0.0], "first", {"AAPL"})
+    cache.add([0.0, 1.0, 0.0], "second", {"AAPL"})
+    
+    # A hit makes "first" the most recently used, so "second" goes when a third arrives
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "first"
+    cache.add([0.0, 0.0, 1.0], "third", {"AAPL"})
+    
+    assert cache.lookup([0.0, 1.0, 0.0], ttl=3600, tickers={"AAPL"}) is None
+    assert cache.lookup([1.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "first"
+    assert cache.lookup([0.0, 0.0, 1.0], ttl=3600, tickers={"AAPL"}) == "third"
+    assert len(_cache(tmp_path, max_entries=2)._entries) == 2
+
+def test_rows_from_another_embedding_width_are_discarded(tmp_path):
+    _cache(tmp_path).add([1.0, 0.0, 0.0], "old model report", {"AAPL"})
+    
+    # EMBEDDING_MODEL changed: the persisted 3-wide rows can't be compared with 4-wide queries
+    reloaded = _cache(tmp_path)
+    assert reloaded.lookup([1.0, 0.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) is None
+    reloaded.add([1.0, 0.0, 0.0, 0.0], "new model report", {"AAPL"})
+    
+    reloaded = _cache(tmp_path)
+    assert [content for _, content, _ in reloaded._entries] == ["new model report"]
+    assert reloaded.lookup([1.0, 0.0, 0.0, 0.0], ttl=3600, tickers={"AAPL"}) == "new model report"
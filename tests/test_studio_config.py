@@ -0,0 +1,25 @@
+"""
+Tests for the studio workflow's analysis type routing
+"""
+
+import pytest
+
+from studio_config import _classify_analysis_type
+
+@pytest.mark.parametrize("user_input, expected", [
+    ("analyze apple stock fundamentals", "stock_analysis"),
+    ("how should i rebalance my allocation", "portfolio_analysis"),
+    ("6-month sector outlook", "market_research"),
+    ("what is the volatility and beta of tsla", "risk_assessment"),
+    ("hello there", "general"),
+])
+def test_classifies_by_keyword(user_input, expected):
+    assert _classify_analysis_type(user_input) == expected
+
+def test_earlier_group_wins_when_several_match():
+    assert _classify_analysis_type("portfolio risk in this market") == "portfolio_analysis"
+    assert _classify_analysis_type("stock risk") == "stock_analysis"
+
+def test_matches_word_stems():
+    assert _classify_analysis_type("diversification ideas") == "portfolio_analysis"
+    assert _classify_analysis_type("volatile names") == "risk_assessment"
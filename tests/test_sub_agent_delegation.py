@@ -0,0 +1,82 @@
+"""
+Tests for halting delegation when a data source is rate limited
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+import financial_tools
+import sub_agent_delegation
+
+class _FakeSubAgent:
+    """Streams one tool result (as a subgraph step), then the sub-agent's final wrap-up"""
+    
+    def __init__(self, tool_output: str):
+        self.tool_output = tool_output
+        self.calls = 0
+    
+    async def astream(self, inputs, stream_mode, subgraphs):
+        self.calls += 1
+        yield ("agent",), {"messages": [ToolMessage(content=self.tool_output, tool_call_id="call_1")]}
+        yield (), {"messages": [AIMessage(content="wrap-up after the limit")]}
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    def install(tool_output: str) -> _FakeSubAgent:
+        agent = _FakeSubAgent(tool_output)
+        monkeypatch.setitem(sub_agent_delegation.SUB_AGENTS, "stock_analyst", agent)
+        return agent
+    monkeypatch.setattr(sub_agent_delegation, "_DATA_LIMITED_UNTIL", 0.0)
+    return install
+
+def _rate_limited_tool_output(monkeypatch) -> str:
+    def raise_error(*args, **kwargs):
+        raise RuntimeError("429 Client Error: Too Many Requests")
+    monkeypatch.setattr(financial_tools, "peek_history", lambda symbol, period="5d": None)
+    monkeypatch.setattr(financial_tools, "_fetch_price_history", raise_error)
+    return financial_tools.get_stock_price.func.__wrapped__("AAPL")
+
+def test_rate_limited_tool_halts_delegation(monkeypatch, fake_agent):
+    agent = fake_agent(_rate_limited_tool_output(monkeypatch))
+    
+    result = asyncio.run(sub_agent_delegation._run_delegation("stock_analyst", "Analyze AAPL"))
+    
+    assert result.startswith("HALT:")
+    assert "wrap-up after the limit" not in result
+    assert sub_agent_delegation._data_limited()
+    
+    # Cooling down - later delegations are refused without running the sub-agent
+    assert asyncio.run(sub_agent_delegation._run_delegation("stock_analyst", "Analyze MSFT")).startswith("HALT:")
+    assert agent.calls == 1
+
+def test_successful_tool_does_not_halt(fake_agent):
+    fake_agent('{"symbol":"AAPL","current_price":190.0}')
+    
+    result = asyncio.run(sub_agent_delegation._run_delegation("stock_analyst", "Analyze AAPL"))
+    
+    assert result.startswith("Sub-agent 'stock_analyst' results:")
+    assert "wrap-up after the limit" in result
+    assert not sub_agent_delegation._data_limited()
+
+@pytest.mark.parametrize("content", [
+    '["AAPL analysis", "MSFT analysis"]',
+    '```json\n["AAPL analysis", "MSFT analysis"]\n```',
+    '  ```\n["AAPL analysis", "MSFT analysis"]```  ',
+])
+def test_parse_batch_results_accepts_plain_and_fenced_arrays(content):
+    assert sub_agent_delegation._parse_batch_results(content, 2) == ["AAPL analysis", "MSFT analysis"]
+
+def test_parse_batch_results_serializes_non_string_items():
+    assert sub_agent_delegation._parse_batch_results('[{"symbol":"AAPL"}, "MSFT analysis"]', 2) == [
+        '{"symbol":"AAPL"}', "MSFT analysis"
+    ]
+
+@pytest.mark.parametrize("content, expected", [
+    ('["only one"]', 2),
+    ('{"AAPL": "analysis"}', 1),
+    ("Here is my analysis of AAPL and MSFT...", 2),
+])
+def test_parse_batch_results_rejects_mismatched_replies(content, expected):
+    assert sub_agent_delegation._parse_batch_results(content, expected) is None
@@ -0,0 +1,50 @@
+"""
+Tests for the shared price history cache helpers
+"""
+
+import financial_tools
+from ticker_cache import extract_tickers, prefetch_histories
+
+def test_demo_scenarios_yield_only_their_tickers():
+    assert extract_tickers(
+        """Help me choose between these investment options for $100,000:
+        Option A: Technology ETF (QQQ)
+        Option B: Individual tech stocks (AAPL, MSFT, GOOGL, NVDA equally weighted)
+        Option C: Diversified portfolio across sectors"""
+    ) == {"QQQ", "AAPL", "MSFT", "GOOGL", "NVDA"}
+    assert extract_tickers(
+        """I need a comprehensive analysis to decide between investing $100,000 in:
+        - Technology ETF (QQQ)
+        - S&P 500 ETF (SPY)
+        - Individual tech stocks (AAPL, MSFT, GOOGL, NVDA)"""
+    ) == {"QQQ", "SPY", "AAPL", "MSFT", "GOOGL", "NVDA"}
+    assert extract_tickers(
+        """Research emerging investment theme: Clean Energy Transition using REAL data
+        - Assess technology trends using actual R&D spending and patent data"""
+    ) == set()
+
+def test_bare_vix_maps_to_the_yahoo_index_symbol():
+    assert extract_tickers(
+        """Research and recommend investment strategy for current market volatility using REAL data:
+        - Analyze current market risk factors using real VIX and correlation patterns"""
+    ) == {"^VIX"}
+    assert extract_tickers("Compare ^VIX with ^GSPC") == {"^VIX", "^GSPC"}
+    assert extract_tickers("Is BRK.B cheaper than BRK-A?") == {"BRK.B", "BRK-A"}
+
+def test_prefetch_draws_from_the_yfinance_token_bucket(monkeypatch):
+    acquired = []
+    fetched = []
+    monkeypatch.setattr(financial_tools._YFINANCE_BUCKET, "acquire", lambda: acquired.append(True))
+    monkeypatch.setattr(financial_tools, "fetch_histories", lambda symbols, period="5d": fetched.append(list(symbols)) or {})
+    
+    prefetch_histories("Compare AAPL and MSFT")
+    
+    assert acquired == [True]
+    assert fetched == [["AAPL", "MSFT"]]
+
+def test_prefetch_skips_requests_below_min_tickers(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(financial_tools, "_fetch_price_histories", fetched.append)
+    
+    prefetch_histories("How is AAPL doing?")
+    assert fetched == []
@@ -0,0 +1,34 @@
+"""
+Tests for the planning agent's data source guard
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+import financial_tools
+from todo_planning_agent import _data_source_limited
+
+def _price_tool_output(monkeypatch, error: Exception) -> str:
+    def raise_error(*args, **kwargs):
+        raise error
+    monkeypatch.setattr(financial_tools, "peek_history", lambda symbol, period="5d": None)
+    monkeypatch.setattr(financial_tools, "_fetch_price_history", raise_error)
+    return financial_tools.get_stock_price.func.__wrapped__("AAPL")
+
+def _step(tool_output: str):
+    return [
+        HumanMessage(content="Analyze AAPL"),
+        AIMessage(content="", tool_calls=[{"name": "get_stock_price", "args": {"symbol": "AAPL"}, "id": "call_1"}]),
+        ToolMessage(content=tool_output, tool_call_id="call_1"),
+    ]
+
+@pytest.mark.parametrize("error", [RuntimeError("429 Client Error: Too Many Requests"), ValueError("boom")])
+def test_failed_price_tool_stops_the_run(monkeypatch, error):
+    assert _data_source_limited(_step(_price_tool_output(monkeypatch, error)))
+
+def test_successful_price_tool_does_not_stop_the_run():
+    assert not _data_source_limited(_step('{"symbol":"AAPL","current_price":190.0}'))
+
+def test_only_the_latest_step_is_checked(monkeypatch):
+    messages = _step(_price_tool_output(monkeypatch, ValueError("boom"))) + [AIMessage(content="Retrying later")]
+    assert not _data_source_limited(messages)
@@ -0,0 +1,64 @@
+"""
+Tests for the TODO graph-state reducers
+"""
+
+from todo_state import merge_todos, move_todo_ids
+
+def _todo(todo_id: str, status: str = "pending") -> dict:
+    return {"id": todo_id, "task": f"task {todo_id}", "status": status}
+
+def test_merge_todos_adds_and_replaces_by_id():
+    todos = {"todo_1": _todo("todo_1")}
+    
+    merged = merge_todos(todos, {"todo_1": _todo("todo_1", "completed"), "todo_2": _todo("todo_2")})
+    
+    assert merged == {"todo_1": _todo("todo_1", "completed"), "todo_2": _todo("todo_2")}
+    assert todos == {"todo_1": _todo("todo_1")}
+
+def test_merge_todos_none_removes_item():
+    todos = {"todo_1": _todo("todo_1"), "todo_2": _todo("todo_2")}
+    
+    assert merge_todos(todos, {"todo_2": None}) == {"todo_1": _todo("todo_1")}
+    assert merge_todos(None, {"todo_1": None}) == {}
+
+def test_merge_todos_recreated_id_replaces_removed_item():
+    todos = merge_todos({"todo_1": _todo("todo_1", "completed")}, {"todo_1": None})
+    
+    assert merge_todos(todos, {"todo_1": _todo("todo_1")}) == {"todo_1": _todo("todo_1")}
+
+def test_move_todo_ids_moves_between_buckets_in_order():
+    buckets = {"pending": {"todo_1": None, "todo_2": None}}
+    
+    moved = move_todo_ids(buckets, {"in_progress": {"todo_1": None}})
+    
+    assert moved == {"pending": {"todo_2": None}, "in_progress": {"todo_1": None}}
+    assert list(move_todo_ids(moved, {"pending": {"todo_1": None}})["pending"]) == ["todo_2", "todo_1"]
+
+def test_move_todo_ids_copies_only_touched_buckets():
+    buckets = {"pending": {"todo_1": None}, "completed": {"todo_2": None}}
+    
+    moved = move_todo_ids(buckets, {"in_progress": {"todo_1": None}})
+    
+    assert moved["completed"] is buckets["completed"]
+    assert buckets["pending"] == {"todo_1": None}
+
+def test_move_todo_ids_none_key_drops_ids():
+    buckets = {"pending": {"todo_1": None}, "completed": {"todo_2": None}}
+    
+    moved = move_todo_ids(buckets, {None: {"todo_1": None, "todo_2": None}})
+    
+    assert moved == {"pending": {}, "completed": {}}
+    assert None not in moved
+
+def test_move_todo_ids_recreated_id_lands_in_one_bucket():
+    # write_todos replacing a list: ids are dropped and re-created as pending in one update
+    buckets = {"completed": {"todo_1": None}}
+    
+    moved = move_todo_ids(buckets, {"pending": {"todo_1": None}, None: {}})
+    
+    assert moved == {"completed": {}, "pending": {"todo_1": None}}
+
+def test_move_todo_ids_same_status_is_a_no_op():
+    buckets = {"pending": {"todo_1": None}}
+    
+    assert move_todo_ids(buckets, {"pending": {"todo_1": None}}) == buckets
@@ -0,0 +1,56 @@
+"""
+Tests for the on-disk tool result cache
+"""
+
+import os
+import time
+
+import pytest
+
+import tool_cache
+from tool_cache import FileCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return FileCache(str(tmp_path))
+
+def test_round_trip_within_ttl(cache):
+    cache.set("get_stock_price", "key", '{"symbol":"AAPL"}')
+    
+    assert cache.get("get_stock_price", "key", ttl=60) == '{"symbol":"AAPL"}'
+    assert cache.get("get_stock_price", "other", ttl=60) is None
+
+def test_entries_older_than_ttl_miss(cache, tmp_path):
+    cache.set("get_stock_price", "key", "cached")
+    old = time.time() - 120
+    os.utime(tmp_path / "get_stock_price" / "key.txt", (old, old))
+    
+    assert cache.get("get_stock_price", "key", ttl=60) is None
+    assert cache.get("get_stock_price", "key", ttl=300) == "cached"
+
+def test_set_leaves_no_temp_files(cache, tmp_path):
+    cache.set("web_search", "key", "first")
+    cache.set("web_search", "key", "second")
+    
+    assert cache.get("web_search", "key", ttl=60) == "second"
+    assert [path.name for path in (tmp_path / "web_search").iterdir()] == ["key.txt"]
+
+def test_failed_write_keeps_previous_value(cache, tmp_path, monkeypatch):
+    cache.set("web_search", "key", "first")
+    
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(tool_cache.os, "replace", fail_replace)
+    cache.set("web_search", "key", "second")
+    
+    assert cache.get("web_search", "key", ttl=60) == "first"
+    assert [path.name for path in (tmp_path / "web_search").iterdir()] == ["key.txt"]
+
+def test_clear_drops_only_its_namespace(cache):
+    cache.set("web_search", "key", "search")
+    cache.set("get_stock_price", "key", "price")
+    
+    cache.clear("web_search")
+    
+    assert cache.get("web_search", "key", ttl=60) is None
+    assert cache.get("get_stock_price", "key", ttl=60) == "price"
@@ -0,0 +1,67 @@
+"""
+Tests for the batched virtual file system write log
+"""
+
+import orjson
+import pytest
+
+import vfs_log
+from vfs_log import VFSWriteLog
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "logs" / "vfs_writes.log"
+
+def _records(path) -> list:
+    lines = path.read_bytes().splitlines()
+    return [(orjson.loads(header), body.decode()) for header, body in zip(lines[::2], lines[1::2])]
+
+def test_writes_are_held_until_a_threshold(log_path):
+    log = VFSWriteLog(str(log_path), max_batch_bytes=1 << 20, max_batch_entries=10, max_batch_age=3600)
+    log.append("a.txt", "alpha", "t1")
+    
+    assert not log_path.exists()
+    log.close()
+    assert _records(log_path) == [({"filename": "a.txt", "size": 5, "timestamp": "t1"}, "alpha")]
+
+def test_entry_count_threshold_flushes(log_path):
+    log = VFSWriteLog(str(log_path), max_batch_bytes=1 << 20, max_batch_entries=2, max_batch_age=3600)
+    log.append("a.txt", "alpha", "t1")
+    log.append("b.txt", "beta", "t2")
+    
+    assert [header["filename"] for header, _ in _records(log_path)] == ["a.txt", "b.txt"]
+    assert log.entries == 0 and log.bytes_queued == 0
+    log.close()
+
+def test_byte_threshold_flushes(log_path):
+    log = VFSWriteLog(str(log_path), max_batch_bytes=100, max_batch_entries=1000, max_batch_age=3600)
+    log.append("small.txt", "x", "t1")
+    assert not log_path.exists()
+    
+    log.append("big.txt", "y" * 100, "t2")
+    assert [header["filename"] for header, _ in _records(log_path)] == ["small.txt", "big.txt"]
+    log.close()
+
+def test_age_threshold_flushes(log_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(vfs_log.time, "monotonic", lambda: clock[0])
+    log = VFSWriteLog(str(log_path), max_batch_bytes=1 << 20, max_batch_entries=1000, max_batch_age=5.0)
+    
+    log.append("a.txt", "alpha", "t1")
+    clock[0] += 4.0
+    log.append("b.txt", "beta", "t2")
+    assert not log_path.exists()
+    
+    # Age is measured from the oldest queued write
+    clock[0] += 1.0
+    log.append("c.txt", "gamma", "t3")
+    assert [header["filename"] for header, _ in _records(log_path)] == ["a.txt", "b.txt", "c.txt"]
+    log.close()
+
+def test_size_counts_encoded_bytes(log_path):
+    log = VFSWriteLog(str(log_path))
+    log.append("report.md", "héllo", "t1")
+    log.close()
+    
+    header = orjson.loads(log_path.read_bytes().splitlines()[0])
+    assert header["size"] == len("héllo".encode())
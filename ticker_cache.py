@@ -0,0 +1,153 @@
+"""
+YFinance Ticker Cache for DeepAgent Financial Systems
+Shares yf.Ticker objects and recent history frames across all agents and sub-agents
+so repeated symbols (AAPL, MSFT, NVDA, ...) don't trigger redundant Yahoo round-trips
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from config import config
+
+# (symbol, period) -> (fetched_at, history frame)
+_HISTORY_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+_HISTORY_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=config.TICKER_CACHE_SIZE)
+def get_ticker(symbol: str) -> yf.Ticker:
+    """Get a shared yf.Ticker for the symbol (memoized per process)"""
+    return yf.Ticker(symbol.upper())
+
+def peek_history(symbol: str, period: str = "5d") -> Optional[pd.DataFrame]:
+    """Return a fresh cached history frame without fetching, or None on a miss"""
+    key = (symbol.upper(), period)
+    with _HISTORY_LOCK:
+        cached = _HISTORY_CACHE.get(key)
+        if cached and time.time() - cached[0] < config.HISTORY_CACHE_TTL:
+            _HISTORY_CACHE.move_to_end(key)
+            return cached[1]
+    return None
+
+def get_history(symbol: str, period: str = "5d") -> pd.DataFrame:
+    """
+    Get price history for a symbol, reusing a recent fetch when available.
+    Entries expire after HISTORY_CACHE_TTL seconds and the cache is LRU-bounded.
+    """
+    key = (symbol.upper(), period)
+    now = time.time()
+    
+    with _HISTORY_LOCK:
+        cached = _HISTORY_CACHE.get(key)
+        if cached and now - cached[0] < config.HISTORY_CACHE_TTL:
+            _HISTORY_CACHE.move_to_end(key)
+            return cached[1]
+    
+    hist = get_ticker(key[0]).history(period=period)
+    
+    # Don't cache empty frames - they usually mean a transient Yahoo failure
+    if not hist.empty:
+        _store_history(key, hist, now)
+    return hist
+
+def fetch_histories(tickers: Iterable[str], period: str = "5d") -> Dict[str, pd.DataFrame]:
+    """
+    Get price histories for several symbols with one batched yf.download request.
+    Symbols with a fresh cached history are not re-downloaded; the rest are fetched
+    together and stored in the shared history cache, so later get_history() calls hit.
+    """
+    symbols = sorted({ticker.upper() for ticker in tickers})
+    now = time.time()
+    histories: Dict[str, pd.DataFrame] = {}
+    missing = []
+    
+    with _HISTORY_LOCK:
+        for symbol in symbols:
+            cached = _HISTORY_CACHE.get((symbol, period))
+            if cached and now - cached[0] < config.HISTORY_CACHE_TTL:
+                _HISTORY_CACHE.move_to_end((symbol, period))
+                histories[symbol] = cached[1]
+            else:
+                missing.append(symbol)
+    
+    if not missing:
+        return histories
+    
+    # auto_adjust matches Ticker.history() so batched and single fetches are interchangeable
+    data = yf.download(
+        missing, period=period, group_by="ticker", auto_adjust=True, threads=True, progress=False
+    )
+    
+    fetched = {}
+    for symbol in missing:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            hist = data[symbol]
+        else:
+            hist = data
+        
+        # Unknown symbols come back as all-NaN columns - don't cache them
+        hist = hist.dropna(how="all")
+        if not hist.empty:
+            fetched[(symbol, period)] = hist
+            histories[symbol] = hist
+    
+    _store_histories(fetched, now)
+    return histories
+
+# Upper-case ticker-like tokens of two or more letters (AAPL, BRK.B, ^GSPC), minus finance
+# acronyms and words the prompts capitalise for emphasis (REAL, ONLY). Single letters are
+# skipped: in requests they are far more often "Option B" or "S&P" than a ticker
+_TICKER_RE = re.compile(r"(?<![\w^])\^?[A-Z]{2,5}(?:[.-][A-Z])?\b")
+_NON_TICKERS = frozenset({
+    "AI", "API", "CEO", "CFO", "CPI", "EPS", "ETF", "ESG", "GDP", "IPO", "LLM", "USD", "US",
+    "YTD", "YOY", "QOQ", "ROE", "ROI", "SEC", "VAR", "CAGR", "EBIT", "PE", "JSON", "HTTP", "UTC",
+    "SWOT", "OR", "AND", "NOT", "NO", "NON", "THE", "OF", "ON", "FOR", "FROM", "WITH", "USE",
+    "USING", "BASED", "DO", "ONE", "ANY", "ALL", "ONLY", "SAME", "NEVER", "REAL", "LIVE", "DATA",
+    "KEY", "CORE", "HARD", "RATE", "STOP", "HALT", "END", "PHASE", "SUB", "TODO",
+})
+# Index names people write without the Yahoo caret
+_INDEX_SYMBOLS = {"VIX": "^VIX"}
+
+def extract_tickers(text: str) -> Set[str]:
+    """Find the ticker symbols mentioned in free text"""
+    return {
+        _INDEX_SYMBOLS.get(match, match)
+        for match in _TICKER_RE.findall(text) if match not in _NON_TICKERS
+    }
+
+def prefetch_histories(text: str, min_tickers: int = 2) -> None:
+    """
+    Warm the shared history cache for every ticker in the text with one batched download.
+    Best effort - callers' own tool calls still fetch individually if this fails.
+    """
+    tickers = extract_tickers(text)
+    if len(tickers) < min_tickers:
+        return
+    # Go through the throttled batch fetch so prefetches draw from the shared YFinance
+    # token bucket too (imported here - financial_tools imports this module)
+    from financial_tools import _fetch_price_histories
+    try:
+        _fetch_price_histories(sorted(tickers))
+    except Exception as e:
+        print(f"⚠️ Batch price prefetch failed: {e}")
+
+def _store_history(key: Tuple[str, str], hist: pd.DataFrame, fetched_at: float) -> None:
+    """Insert a history frame into the LRU cache"""
+    _store_histories({key: hist}, fetched_at)
+
+def _store_histories(entries: Dict[Tuple[str, str], pd.DataFrame], fetched_at: float) -> None:
+    """Insert several history frames into the LRU cache under a single lock"""
+    with _HISTORY_LOCK:
+        for key, hist in entries.items():
+            _HISTORY_CACHE[key] = (fetched_at, hist)
+            _HISTORY_CACHE.move_to_end(key)
+        while len(_HISTORY_CACHE) > config.HISTORY_CACHE_SIZE:
+            _HISTORY_CACHE.popitem(last=False)
@@ -7,158 +7,54 @@ Implements task tracking, status management, and progress monitoring for financi
 Uses real YFinance data for all financial analysis
 """
 
-import os
-import uuid
+import re
+import string
+import sys
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.tools import tool
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
 
-# Import our custom modules
+# Import our custom modules. LangChain/LangGraph, the model client and the YFinance
+# tools (pandas/yfinance) load on first use - in _build_planning_agent, the query
+# runners, and __getattr__ for the TODO tools - so a demo that quits early doesn't
+# pay for them.
 from config import config
-from financial_tools import FINANCIAL_TOOLS
-from agent_state import (
-    create_initial_state, add_todo_item, update_todo_status, 
-    get_state_summary, DeepAgentState, TodoItem, TodoStatus
-)
 
-# TODO Management Tools
-@tool
-def write_todos(todos: str) -> str:
-    """
-    Create or update TODO list for complex financial analysis tasks.
-    This tool helps maintain focus and track progress on multi-step workflows using real market data.
-    
-    Args:
-        todos: Detailed TODO list with tasks, priorities, and dependencies.
-               Format as numbered list with clear action items.
-    
-    Returns:
-        Confirmation that TODOs have been created/updated
-    """
-    print(f"\n📋 Financial Analysis TODO List Created/Updated:")
-    print("=" * 50)
-    print(todos)
-    print("=" * 50)
-    
-    # Parse and structure the todos (simplified parsing)
-    todo_lines = [line.strip() for line in todos.split('\n') if line.strip()]
-    structured_todos = []
-    
-    for i, line in enumerate(todo_lines, 1):
-        # Extract priority indicators
-        priority = "medium"
-        if "[HIGH]" in line.upper() or "[URGENT]" in line.upper():
-            priority = "high"
-        elif "[LOW]" in line.upper():
-            priority = "low"
-        elif "[URGENT]" in line.upper():
-            priority = "urgent"
-        
-        # Clean the line
-        clean_line = line.replace("[HIGH]", "").replace("[LOW]", "").replace("[URGENT]", "").strip()
-        if clean_line.startswith(str(i) + "."):
-            clean_line = clean_line[len(str(i) + "."):].strip()
-        
-        structured_todos.append({
-            "id": f"todo_{i}",
-            "task": clean_line,
-            "priority": priority,
-            "status": "pending",
-            "data_source": "Will use real YFinance data"
-        })
-    
-    return f"✅ Created {len(structured_todos)} TODO items for financial analysis workflow using real market data"
+__all__ = [
+    "write_todos", "update_todo", "get_todo_status",
+    "create_planning_agent", "run_planning_demo", "run_planning_query", "run_planning_sweep",
+]
 
-@tool 
-def update_todo(todo_id: str, status: str, notes: str = "") -> str:
-    """
-    Update the status of a specific TODO item in the financial analysis workflow.
-    
-    Args:
-        todo_id: ID of the TODO item to update
-        status: New status (pending, in_progress, completed, cancelled)
-        notes: Optional notes about the update
-    
-    Returns:
-        Confirmation of the update
-    """
-    valid_statuses = ["pending", "in_progress", "completed", "cancelled"]
-    if status not in valid_statuses:
-        return f"❌ Invalid status. Use one of: {', '.join(valid_statuses)}"
-    
-    print(f"\n📝 TODO Update: {todo_id} → {status}")
-    if notes:
-        print(f"   Notes: {notes}")
-    
-    return f"✅ Updated {todo_id} to {status} (using real market data)"
+_RULE = "=" * 50
+_DASHES = "-" * 50
 
-@tool
-def get_todo_status() -> str:
-    """
-    Get current status of all TODO items in the financial analysis workflow.
-    
-    Returns:
-        Summary of TODO progress and next actions
-    """
-    status_report = f"""
-📊 Financial Analysis TODO Status - {datetime.now().strftime('%Y-%m-%d %H:%M')}
+# The "status" the YFinance tools report when the data source is rate limiting or down.
+# The stream loops stop on it before the next model call, so the agent never spends
+# another turn retrying.
+_DATA_LIMITED_RE = re.compile(r'"status":\s*"(?:rate_limited|error)"')
+_DATA_LIMITED_NOTICE = (
+    "⚠️ Yahoo Finance is rate limiting requests or currently unavailable - stopped this workflow "
+    "before the next model call. Please wait 5-10 minutes and try again for real-time data."
+)
 
-Pending Tasks:
-- [ ] Market sentiment analysis (using real VIX and index data)
-- [ ] Risk assessment calculations (real volatility metrics)
+_PLANNING_TOOL_NAMES = frozenset({"write_todos", "update_todo", "get_todo_status"})
 
-In Progress:
-- [🔄] Portfolio performance analysis (real YFinance data)
-- [🔄] Stock data collection (current market prices)
+def _data_source_limited(messages) -> bool:
+    """Whether any tool result of the latest step reports a rate-limited/unavailable data source"""
+    for message in reversed(messages):
+        if message.type != "tool":
+            return False
+        if isinstance(message.content, str) and _DATA_LIMITED_RE.search(message.content):
+            return True
+    return False
 
-Completed:
-- [✅] Initial data gathering (real market data retrieved)
-- [✅] Tool configuration (YFinance integration ready)
-
-Next Priority: Complete portfolio performance analysis with real market data
-Data Source: All analysis uses live YFinance data - no mock data
-    """
-    
-    print(status_report)
-    return status_report
-
-def create_planning_agent():
-    """
-    Create a financial planning agent with TODO management capabilities and real data integration
-    """
-    
-    if not config.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY is required")
-    
-    # Initialize model
-    model = ChatOpenAI(
-        model=config.DEFAULT_MODEL,
-        temperature=0.1,
-        api_key=config.OPENAI_API_KEY
-    )
-    
-    # Combine financial tools with planning tools
-    tools = FINANCIAL_TOOLS + [write_todos, update_todo, get_todo_status]
-    
-    # Add web search if available
-    if config.TAVILY_API_KEY:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        web_search = TavilySearchResults(
-            api_key=config.TAVILY_API_KEY,
-            max_results=3,
-            search_depth="advanced"
-        )
-        tools.append(web_search)
-    
-    # Create memory for persistence
-    memory = MemorySaver()
-    
-    # Enhanced system message for planning with real data emphasis
-    system_message = """You are an advanced financial planning AI agent with sophisticated task management capabilities and access to real-time market data.
+# Planning system prompt template, parsed once at import. OpenAI caches repeated prompt
+# prefixes of 1024+ tokens automatically, so the only variable (today's UTC date) sits
+# at the very end and everything before it stays byte-identical across turns and days.
+_PLANNING_SYSTEM_PROMPT = string.Template("""You are an advanced financial planning AI agent with sophisticated task management capabilities and access to real-time market data.
 
 **Core Capabilities:**
 1. **Strategic Planning**: Break down complex financial analysis into manageable, executable tasks
@@ -171,7 +67,7 @@ When given a complex financial request:
 
 1. **ALWAYS start by creating a comprehensive TODO list** using the write_todos tool
 2. **Break down the request** into specific, actionable tasks with clear deliverables
-3. **Prioritize tasks** using [HIGH], [MEDIUM], [LOW], or [URGENT] indicators
+3. **Prioritize tasks** as high, medium, low, or urgent
 4. **Identify dependencies** between tasks and optimal sequencing
 5. **Execute tasks systematically** while updating progress with real market data
 6. **Provide comprehensive summaries** based on actual financial metrics
@@ -183,17 +79,9 @@ When given a complex financial request:
 - **Base all analysis on live financial statements** and current market conditions
 - **Validate data freshness** and handle market hours appropriately
 
-**TODO List Format for Financial Analysis:**
-```
-1. [HIGH] Gather real-time stock data for [specific symbols] using YFinance
-2. [MEDIUM] Calculate risk metrics using actual historical volatility data
-3. [HIGH] Perform comparative analysis with real market benchmarks
-4. [LOW] Generate visualization recommendations based on actual data
-5. [URGENT] Compile final investment recommendations with real price targets
-```
-
 **Task Execution Process:**
 - Use update_todo to mark tasks as in_progress before starting execution
+- When several tool calls in a step don't depend on each other (e.g. prices for different symbols), emit them together in ONE turn - they run concurrently
 - Execute each task using appropriate financial tools with real market data
 - Mark tasks as completed when finished with actual results
 - Use get_todo_status to review progress and identify next priorities
@@ -220,116 +108,270 @@ When given a complex financial request:
 - Focus on actionable, data-driven insights based on current market conditions
 - Consider real market volatility and correlation patterns in all analysis
 
-**CRITICAL RATE LIMITING HANDLING:**
-- When you receive ANY tool response containing "status": "rate_limited" OR "status": "error", IMMEDIATELY STOP all tool calls
-- DO NOT make any additional tool calls after receiving a rate-limited or error response
-- DO NOT retry the same tool or try different tools for the same data
-- Instead, acknowledge the data source limitation and provide helpful guidance to the user
-- If you receive "rate_limited" status, explain that Yahoo Finance is rate limiting requests
-- If you receive "error" status, explain that YFinance is currently unavailable
-- Suggest waiting 5-10 minutes before trying again for real-time data
-- Offer alternative approaches like web search for current market news
-- Be professional and reassuring about the temporary nature of the limitation
-- This is a HARD STOP - no exceptions, no retries, no additional attempts
+Remember: Effective planning combined with real market data is crucial for thorough financial analysis. Take time to structure your approach systematically before executing with live financial data.
 
-Remember: Effective planning combined with real market data is crucial for thorough financial analysis. Take time to structure your approach systematically before executing with live financial data."""
-    
-    agent = create_react_agent(
-        model=model,
-        tools=tools,
-        checkpointer=memory,
-        prompt=system_message
-    )
-    
-    return agent
+Today's date (UTC): $today""")
 
-def run_planning_demo():
-    """
-    Demonstrate the planning agent with complex financial scenarios using real data
-    """
-    print("🎯 DeepAgent Financial Systems - Planning Agent Demo")
-    print("=" * 58)
-    
-    try:
-        agent = create_planning_agent()
-        print("✅ Planning agent created successfully with real YFinance data integration")
-    except Exception as e:
-        print(f"❌ Failed to create agent: {str(e)}")
-        return
+@functools.lru_cache(maxsize=4)
+def _system_message_for(today: str):
+    """Rendered system message for one UTC date - the same object for every turn that day"""
+    from langchain_core.messages import SystemMessage
     
-    # Complex planning scenarios using real market data
-    planning_scenarios = [
-        """I need a comprehensive analysis to decide between investing $100,000 in:
+    return SystemMessage(content=_PLANNING_SYSTEM_PROMPT.substitute(today=today))
+
+def _planning_prompt(state: Dict[str, Any]) -> list:
+    """create_react_agent prompt: today's cached system message followed by the conversation"""
+    return [_system_message_for(time.strftime("%Y-%m-%d", time.gmtime())), *state["messages"]]
+
+# Complex planning scenarios using real market data - built once at import and
+# interned, so every demo run shares the same string objects
+_PLANNING_SCENARIOS = tuple(sys.intern(scenario) for scenario in (
+    """I need a comprehensive analysis to decide between investing $100,000 in:
         - Technology ETF (QQQ)
         - S&P 500 ETF (SPY)  
         - Individual tech stocks (AAPL, MSFT, GOOGL, NVDA)
         
         Please analyze risk, returns, correlation using real market data and provide a recommendation with rationale.""",
-        
-        """Help me build a retirement portfolio strategy for someone with:
+    
+    """Help me build a retirement portfolio strategy for someone with:
         - 30 years until retirement
         - $50,000 initial investment
         - $1,000 monthly contributions
         - Moderate risk tolerance
         
         Include asset allocation, rebalancing strategy using real market data and correlations.""",
-        
-        """Analyze the current market conditions and provide a 6-month outlook including:
+    
+    """Analyze the current market conditions and provide a 6-month outlook including:
         - Major index performance and trends using real data
         - Sector rotation opportunities based on actual performance
         - Risk factors with real volatility measurements
         - Specific stock recommendations using current fundamentals.""",
-        
-        """Evaluate whether to hold or sell my current portfolio positions using real market data:
+    
+    """Evaluate whether to hold or sell my current portfolio positions using real market data:
         - TSLA (bought at $200, current price from real data)
         - AMZN (bought at $150, current price from real data)
         - META (bought at $300, current price from real data)
         
         Consider tax implications, real market outlook, and actual portfolio balance."""
-    ]
+))
+
+def create_planning_agent(checkpointer=None):
+    """
+    Create a financial planning agent with TODO management capabilities and real data integration
+    
+    The agent (model client + checkpointer) is built once per process and reused;
+    conversations stay isolated through the thread_id in each run's config.
+    checkpointer overrides the in-process MemorySaver (e.g. a durable SQLite saver).
+    """
+    return _build_planning_agent(checkpointer)
+
+@functools.lru_cache(maxsize=2)
+def _build_planning_agent(checkpointer):
+    """Build the planning ReAct agent (memoized by create_planning_agent)"""
+    from langchain_openai import ChatOpenAI
+    from langgraph.prebuilt import create_react_agent
+    from langgraph.checkpoint.memory import MemorySaver
+    from http_clients import openai_http_client, openai_async_http_client, openai_rate_limiter
+    from financial_tools import FINANCIAL_TOOLS
+    from agent_state import compact_message_history
+    from todo_state import TodoAgentState
+    from todo_tools import write_todos, update_todo, get_todo_status
+    
+    if not config.OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY is required")
+    
+    # Initialize model on the pooled HTTP/2 clients (the async one serves agent.astream)
+    model = ChatOpenAI(
+        model=config.DEFAULT_MODEL,
+        temperature=0.1,
+        api_key=config.OPENAI_API_KEY,
+        http_client=openai_http_client,
+        http_async_client=openai_async_http_client,
+        rate_limiter=openai_rate_limiter
+    )
+    
+    # Combine financial tools with planning tools
+    tools = FINANCIAL_TOOLS + [write_todos, update_todo, get_todo_status]
+    
+    # Add web search if available (pooled connections on both the sync and async paths)
+    if config.TAVILY_API_KEY:
+        from web_search import AsyncTavilySearch
+        web_search = AsyncTavilySearch(
+            api_key=config.TAVILY_API_KEY,
+            max_results=3,
+            search_depth="advanced",
+            include_domains=[]
+        )
+        tools.append(web_search)
+    
+    agent = create_react_agent(
+        model=model,
+        tools=tools,
+        checkpointer=checkpointer or MemorySaver(),
+        prompt=_planning_prompt,
+        # Bound the checkpointed history of the long-lived planning_session thread
+        pre_model_hook=compact_message_history,
+        state_schema=TodoAgentState
+    )
+    
+    return agent
+
+def run_planning_demo():
+    """
+    Demonstrate the planning agent with complex financial scenarios using real data
+    """
+    asyncio.run(_run_planning_demo())
+
+async def _run_planning_demo():
+    """Async body of the demo so every query streams on one event loop"""
+    # Durable checkpoints keep planning threads on disk instead of growing in memory
+    try:
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite not installed - planning memory will not persist")
+        await _planning_demo_loop(None)
+        return
+    
+    from checkpoint_store import prune_checkpoints
+    
+    async with AsyncSqliteSaver.from_conn_string(config.CHECKPOINT_DB) as checkpointer:
+        # The saver turns on WAL itself; relax fsyncs to WAL checkpoints and map reads
+        await checkpointer.conn.execute("PRAGMA synchronous=NORMAL")
+        await checkpointer.conn.execute(f"PRAGMA mmap_size={config.CHECKPOINT_MMAP_SIZE}")
+        await prune_checkpoints(checkpointer)
+        await _planning_demo_loop(checkpointer)
+
+async def _planning_demo_loop(checkpointer):
+    """
+    Interactive scenario loop on the given checkpointer. Each query streams as a background
+    task and input() waits on a worker thread, so the user can pick the next option while
+    the previous query is still running.
+    """
+    # Sync YFinance tools and input() run on the default executor - size it for
+    # bursty blocking I/O so one turn's independent tool calls overlap
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.MAX_IO_WORKERS, thread_name_prefix="planning-io")
+    )
+    
+    print("🎯 DeepAgent Financial Systems - Planning Agent Demo")
+    print("=" * 58)
+    
+    try:
+        agent = create_planning_agent(checkpointer)
+        print("✅ Planning agent created successfully with real YFinance data integration")
+    except Exception as e:
+        print(f"❌ Failed to create agent: {str(e)}")
+        return
+    
+    planning_scenarios = _PLANNING_SCENARIOS
     
     print(f"\n📋 Complex Financial Planning Scenarios (Using Real Market Data):")
     for i, scenario in enumerate(planning_scenarios, 1):
         print(f"\n{i}. {scenario[:100]}...")
     
+    # The previous query, still streaming while the user chooses the next one
+    running: Optional[asyncio.Task] = None
+    
     # Interactive demo
     while True:
         print(f"\n" + "=" * 58)
         print("Options:")
         print("  1-4: Run planning scenario with real market data")
+        print("  all: Run every scenario concurrently")
         print("  custom: Enter your own complex financial query")
         print("  quit: Exit demo")
         
-        choice = input("\nYour choice: ").strip().lower()
+        choice = (await asyncio.to_thread(input, "\nYour choice: ")).strip().lower()
         
         if choice == "quit":
+            # Cancelling mid-step would checkpoint tool calls without their results on the
+            # durable session thread, and OpenAI rejects every later turn on it - let it land
+            if running is not None and not running.done():
+                print("\n⏳ Finishing the running query before exiting...")
+                await running
             break
-        elif choice == "custom":
-            custom_query = input("Enter your complex financial planning query (will use real data): ").strip()
+        
+        # Queries share the session thread - let the previous one land first
+        if running is not None and not running.done():
+            print("\n⏳ Waiting for the previous query to finish...")
+            await running
+        
+        if choice == "custom":
+            custom_query = (await asyncio.to_thread(input, "Enter your complex financial planning query (will use real data): ")).strip()
             if custom_query:
-                run_planning_query(agent, custom_query)
+                running = asyncio.create_task(run_planning_query(agent, custom_query))
         elif choice.isdigit() and 1 <= int(choice) <= len(planning_scenarios):
             scenario_index = int(choice) - 1
-            run_planning_query(agent, planning_scenarios[scenario_index])
+            running = asyncio.create_task(run_planning_query(agent, planning_scenarios[scenario_index]))
+        elif choice == "all":
+            await run_planning_sweep(agent, planning_scenarios)
         else:
             print("Invalid choice. Please try again.")
     
+    if config.TAVILY_API_KEY:
+        from web_search import close_sessions
+        await close_sessions()
+    from http_clients import close_async_http_client
+    await close_async_http_client()
+    
     print("\n👋 Planning demo completed! All analysis used real YFinance market data.")
 
-def run_planning_query(agent, query: str, session_id: str = "planning_session"):
+async def run_planning_sweep(agent, queries: List[str], max_concurrency: int = 4):
+    """
+    Run several planning queries concurrently (at most max_concurrency at once, to stay
+    within the OpenAI rate budget) and print each final answer as its run finishes
+    """
+    from langchain_core.messages import HumanMessage
+    
+    # Fresh thread per query and sweep so runs neither share nor resume checkpointed TODOs;
+    # nothing resumes them afterwards, so each is deleted once its run finishes
+    sweep_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(index: int, query: str):
+        async with semaphore:
+            start = time.perf_counter()
+            thread_id = f"planning_sweep_{sweep_id}_{index}"
+            try:
+                async for state in agent.astream(
+                    {"messages": [HumanMessage(content=query)]},
+                    config={"configurable": {"thread_id": thread_id}},
+                    stream_mode="values"
+                ):
+                    if _data_source_limited(state["messages"]):
+                        outcome = _DATA_LIMITED_NOTICE
+                        break
+                else:
+                    outcome = state["messages"][-1].content
+            except Exception as e:
+                outcome = f"❌ Error in planning workflow: {str(e)}"
+            finally:
+                if agent.checkpointer:
+                    await agent.checkpointer.adelete_thread(thread_id)
+            sys.stdout.write(
+                f"\n{_RULE}\n🎯 Scenario {index} finished in {time.perf_counter() - start:.1f}s\n"
+                f"{_RULE}\n{outcome}\n"
+            )
+    
+    sys.stdout.write(f"\n🚀 Running {len(queries)} planning scenarios concurrently (max {max_concurrency} at once)...\n")
+    sweep_start = time.perf_counter()
+    await asyncio.gather(*(run_one(i, query) for i, query in enumerate(queries, 1)))
+    sys.stdout.write(f"\n✅ Planning sweep completed in {time.perf_counter() - sweep_start:.1f}s\n")
+
+async def run_planning_query(agent, query: str, session_id: str = "planning_session"):
     """
-    Run a complex planning query and track the workflow with real data
+    Run a complex planning query and track the workflow with real data.
+    Streams asynchronously, so independent tool calls from one model turn run concurrently.
     """
+    from langchain_core.messages import HumanMessage
+    
     config_dict = {"configurable": {"thread_id": session_id}}
     
-    print(f"\n🎯 Planning Query (Real Market Data):")
-    print("-" * 50)
-    print(query)
-    print("-" * 50)
+    sys.stdout.write(f"\n🎯 Planning Query (Real Market Data):\n{_DASHES}\n{query}\n{_DASHES}\n")
     
     try:
-        messages = []
-        for event in agent.stream(
+        last_key = None
+        async for event in agent.astream(
             {"messages": [HumanMessage(content=query)]},
             config=config_dict,
             stream_mode="values"
@@ -337,24 +379,44 @@ def run_planning_query(agent, query: str, session_id: str = "planning_session"):
             if "messages" in event and event["messages"]:
                 latest_message = event["messages"][-1]
                 
-                if latest_message not in messages:
-                    messages.append(latest_message)
+                # The stream re-yields the latest message until the next step lands, so
+                # comparing with the previous event's key is enough - nothing accumulates
+                message_key = getattr(latest_message, "id", None) or id(latest_message)
+                if message_key != last_key:
+                    last_key = message_key
                     
-                    if hasattr(latest_message, 'content') and latest_message.content:
-                        # Don't print tool calls content directly as they're already handled by tools
-                        if not (hasattr(latest_message, 'tool_calls') and latest_message.tool_calls):
-                            print(f"\n{latest_message.content}")
+                    content = getattr(latest_message, "content", None)
+                    tool_calls = getattr(latest_message, "tool_calls", None)
                     
-                    # Show tool usage
-                    if hasattr(latest_message, 'tool_calls') and latest_message.tool_calls:
-                        for tool_call in latest_message.tool_calls:
-                            if tool_call['name'] not in ['write_todos', 'update_todo', 'get_todo_status']:
-                                print(f"\n🔧 Using: {tool_call['name']} (real YFinance data)")
-        
-        print(f"\n✅ Planning workflow completed with real market data analysis!")
+                    # Collect this step's output and write it once
+                    parts = []
+                    # Don't print tool calls content directly as they're already handled by tools
+                    if content and not tool_calls:
+                        parts.append(f"\n{content}\n")
+                    
+                    # Show tool usage (planning tools print their own output)
+                    for tool_call in tool_calls or ():
+                        if tool_call['name'] not in _PLANNING_TOOL_NAMES:
+                            parts.append(f"\n🔧 Using: {tool_call['name']} (real YFinance data)\n")
+                    
+                    if parts:
+                        sys.stdout.write("".join(parts))
+                    
+                    if latest_message.type == "tool" and _data_source_limited(event["messages"]):
+                        sys.stdout.write(f"\n{_DATA_LIMITED_NOTICE}\n")
+                        break
+        else:
+            print(f"\n✅ Planning workflow completed with real market data analysis!")
         
     except Exception as e:
         print(f"❌ Error in planning workflow: {str(e)}")
 
+def __getattr__(name: str):
+    # PEP 562: the TODO tools (and the LangChain/LangGraph stack behind them) load on first access
+    if name in _PLANNING_TOOL_NAMES:
+        import todo_tools
+        return getattr(todo_tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
     run_planning_demo()
\ No newline at end of file
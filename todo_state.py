@@ -0,0 +1,78 @@
+"""
+TODO State for DeepAgent Financial Systems
+TODO item types and the graph-state reducers the planning tools write through.
+Free of LangChain/LangGraph imports so the planning demo starts fast; the
+TodoAgentState schema, which needs LangGraph, is built on first access.
+"""
+
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from typing_extensions import TypedDict
+
+# TODO Task Status Types
+TodoStatus = Literal["pending", "in_progress", "completed", "cancelled"]
+
+class TodoItem(TypedDict):
+    """Individual TODO item for task planning"""
+    id: str
+    task: str
+    status: TodoStatus
+    created_at: str
+    updated_at: str
+    priority: Literal["low", "medium", "high", "urgent"]
+    assigned_agent: Optional[str]
+    dependencies: List[str]
+    metadata: Dict[str, Any]
+
+def merge_todos(
+    todos: Optional[Dict[str, TodoItem]],
+    changes: Dict[str, Optional[TodoItem]]
+) -> Dict[str, TodoItem]:
+    """Reducer for todos: add/replace items by id; a None value removes the item"""
+    merged = {**(todos or {}), **changes}
+    if None in changes.values():
+        merged = {todo_id: todo for todo_id, todo in merged.items() if todo is not None}
+    return merged
+
+def move_todo_ids(
+    buckets: Optional[Dict[TodoStatus, Dict[str, None]]],
+    moves: Dict[Optional[TodoStatus], Dict[str, None]]
+) -> Dict[TodoStatus, Dict[str, None]]:
+    """
+    Reducer for todo_ids_by_status: move each id in moves into its new status bucket
+    (a None status drops it). Buckets are insertion-ordered id sets (dict keys), and only
+    the touched buckets are copied, so concurrent tool calls can each send a delta.
+    """
+    result = dict(buckets or {})
+    copied = set()
+    
+    def bucket(status: TodoStatus) -> Dict[str, None]:
+        if status not in copied:
+            result[status] = dict(result.get(status, {}))
+            copied.add(status)
+        return result[status]
+    
+    for new_status, todo_ids in moves.items():
+        for todo_id in todo_ids:
+            for status in [status for status, ids in result.items() if todo_id in ids and status != new_status]:
+                del bucket(status)[todo_id]
+            if new_status is not None:
+                bucket(new_status)[todo_id] = None
+    return result
+
+def _build_todo_agent_state():
+    """Define TodoAgentState on top of LangGraph's AgentState"""
+    from langgraph.prebuilt.chat_agent_executor import AgentState
+    
+    class TodoAgentState(AgentState):
+        """create_react_agent state schema for agents bound to the TODO planning tools"""
+        todos: Annotated[Dict[str, TodoItem], merge_todos]
+        todo_ids_by_status: Annotated[Dict[TodoStatus, Dict[str, None]], move_todo_ids]
+    
+    return TodoAgentState
+
+def __getattr__(name: str):
+    # PEP 562: load LangGraph only when a caller actually needs the agent state schema
+    if name == "TodoAgentState":
+        globals()[name] = _build_todo_agent_state()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,182 @@
+"""
+TODO Planning Tools for DeepAgent Financial Systems
+write_todos / update_todo / get_todo_status: the TODO list tools shared by the planning,
+file system, deep research and delegation agents. They keep the list in graph state
+(TodoAgentState), updating it through Command so concurrent tool calls merge cleanly.
+"""
+
+import sys
+import time
+from typing import Annotated, Dict, Any, List, Literal, get_args
+from datetime import datetime
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import InjectedToolCallId, StructuredTool
+from langgraph.prebuilt import InjectedState
+from langgraph.types import Command
+from pydantic import BaseModel, Field
+
+from todo_state import TodoItem, TodoStatus
+
+__all__ = ["write_todos", "update_todo", "get_todo_status"]
+
+_RULE = "=" * 50
+
+# Statuses update_todo accepts, and its rejection message (built once)
+_VALID_STATUSES = frozenset(get_args(TodoStatus))
+_INVALID_STATUS_MSG = f"❌ Invalid status. Use one of: {', '.join(sorted(_VALID_STATUSES))}"
+_PENDING = sys.intern("pending")
+
+# get_todo_status sections, in report order: (status, heading, checkbox mark)
+_STATUS_SECTIONS = (
+    ("pending", "Pending Tasks:", " "),
+    ("in_progress", "In Progress:", "🔄"),
+    ("completed", "Completed:", "✅"),
+    ("cancelled", "Cancelled:", "❌"),
+)
+
+class TodoInput(BaseModel):
+    """One TODO item as the model writes it"""
+    task: str = Field(description="Specific, actionable task with a clear deliverable")
+    priority: Literal["high", "medium", "low", "urgent"] = "medium"
+
+def _planning_tool(func):
+    """
+    Build a tool with both sync and native async entry points. The TODO tools only print
+    and touch graph state, so the async path runs them inline instead of hopping to an
+    executor thread, while sync agents (file system agent) keep calling them directly.
+    """
+    async def coroutine(*args, **kwargs):
+        return func(*args, **kwargs)
+    
+    return StructuredTool.from_function(func=func, coroutine=coroutine)
+
+# TODO Management Tools
+@_planning_tool
+def write_todos(
+    items: List[TodoInput],
+    state: Annotated[Dict[str, Any], InjectedState],
+    tool_call_id: Annotated[str, InjectedToolCallId]
+) -> Command:
+    """
+    Create or update TODO list for complex financial analysis tasks.
+    This tool helps maintain focus and track progress on multi-step workflows using real market data.
+    The new list replaces the current one; items get ids todo_1, todo_2, ... in order.
+    
+    Args:
+        items: Ordered TODO items, each a specific, actionable task with its priority
+    
+    Returns:
+        Confirmation that TODOs have been created/updated
+    """
+    now = datetime.now().isoformat()
+    structured_todos = {}
+    
+    for i, item in enumerate(items, 1):
+        todo_id = f"todo_{i}"
+        structured_todos[todo_id] = TodoItem(
+            id=todo_id,
+            task=item.task,
+            status=_PENDING,
+            created_at=now,
+            updated_at=now,
+            # Interned so every TODO with the same priority shares one string
+            priority=sys.intern(item.priority),
+            assigned_agent=None,
+            dependencies=[],
+            metadata={"data_source": "Will use real YFinance data"}
+        )
+    
+    # One write per call instead of one per line
+    sys.stdout.write(
+        f"\n📋 Financial Analysis TODO List Created/Updated:\n{_RULE}\n"
+        + "".join(f"{i}. [{item.priority.upper()}] {item.task}\n" for i, item in enumerate(items, 1))
+        + f"{_RULE}\n"
+    )
+    
+    # The new list replaces the old one - items it no longer has are dropped
+    removed = {todo_id: None for todo_id in state.get("todos", {}) if todo_id not in structured_todos}
+    
+    message = (
+        f"✅ Created {len(structured_todos)} TODO items ({', '.join(structured_todos)}) "
+        f"for financial analysis workflow using real market data"
+    )
+    return Command(update={
+        "todos": {**removed, **structured_todos},
+        "todo_ids_by_status": {_PENDING: dict.fromkeys(structured_todos), None: removed},
+        "messages": [ToolMessage(message, tool_call_id=tool_call_id)],
+    })
+
+@_planning_tool
+def update_todo(
+    todo_id: str,
+    status: str,
+    state: Annotated[Dict[str, Any], InjectedState],
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    notes: str = ""
+) -> Command:
+    """
+    Update the status of a specific TODO item in the financial analysis workflow.
+    
+    Args:
+        todo_id: ID of the TODO item to update
+        status: New status (pending, in_progress, completed, cancelled)
+        notes: Optional notes about the update
+    
+    Returns:
+        Confirmation of the update
+    """
+    if status not in _VALID_STATUSES:
+        return _INVALID_STATUS_MSG
+    
+    todo = state.get("todos", {}).get(todo_id)
+    if todo is None:
+        return f"❌ Unknown TODO id '{todo_id}'. Use get_todo_status to see current ids."
+    
+    notes_line = f"   Notes: {notes}\n" if notes else ""
+    sys.stdout.write(f"\n📝 TODO Update: {todo_id} → {status}\n{notes_line}")
+    
+    status = sys.intern(status)
+    updated_todo = {
+        **todo,
+        "status": status,
+        "updated_at": datetime.now().isoformat(),
+        "metadata": {**todo["metadata"], "notes": notes} if notes else todo["metadata"]
+    }
+    return Command(update={
+        "todos": {todo_id: updated_todo},
+        "todo_ids_by_status": {status: {todo_id: None}},
+        "messages": [ToolMessage(
+            f"✅ Updated {todo_id} to {status} (using real market data)", tool_call_id=tool_call_id
+        )],
+    })
+
+@_planning_tool
+def get_todo_status(state: Annotated[Dict[str, Any], InjectedState]) -> str:
+    """
+    Get current status of all TODO items in the financial analysis workflow.
+    
+    Returns:
+        Summary of TODO progress and next actions
+    """
+    todos = state.get("todos", {})
+    buckets = state.get("todo_ids_by_status", {})
+    
+    lines = [f"\n📊 Financial Analysis TODO Status - {time.strftime('%Y-%m-%d %H:%M')}"]
+    for status, heading, mark in _STATUS_SECTIONS:
+        todo_ids = buckets.get(status)
+        if todo_ids:
+            lines.append(f"\n{heading}")
+            lines.extend(f"- [{mark}] {todo_id}: {todos[todo_id]['task']}" for todo_id in todo_ids)
+    
+    if not todos:
+        lines.append("\nNo TODOs yet - create a plan with write_todos")
+    else:
+        # Continue the active task first, otherwise start the next pending one
+        next_id = next(iter(buckets.get("in_progress") or buckets.get("pending") or ()), None)
+        next_task = todos[next_id]["task"] if next_id else "All tasks complete - summarize the results"
+        lines.append(f"\nNext Priority: {next_task}")
+    lines.append("Data Source: All analysis uses live YFinance data - no mock data\n")
+    status_report = "\n".join(lines)
+    
+    sys.stdout.write(status_report + "\n")
+    return status_report
@@ -0,0 +1,121 @@
+"""
+Persistent Tool Response Cache for DeepAgent Financial Systems
+Stores tool results on disk with per-tool TTLs so repeated demo runs and restarts
+reuse recent YFinance / web search responses instead of hitting the APIs again
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import shutil
+import tempfile
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+class FileCache:
+    """
+    Tool result cache laid out as {root}/{namespace}/{key}.txt
+    Results are stored as raw UTF-8 (no JSON envelope to escape and re-parse);
+    the file's mtime is the write time used for TTL checks.
+    """
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+    
+    def _path(self, namespace: str, key: str) -> Path:
+        return self.root / namespace / f"{key}.txt"
+    
+    def get(self, namespace: str, key: str, ttl: float) -> Optional[str]:
+        """Return the cached result, or None if missing, unreadable or older than ttl seconds"""
+        path = self._path(namespace, key)
+        try:
+            if time.time() - path.stat().st_mtime > ttl:
+                return None
+            return path.read_bytes().decode()
+        except (OSError, UnicodeDecodeError):
+            return None
+    
+    def set(self, namespace: str, key: str, value: str) -> None:
+        """Atomically write a result so concurrent readers never see a partial file"""
+        path = self._path(namespace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(value.encode())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write tool cache entry {path}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+    
+    def clear(self, namespace: str) -> None:
+        """Delete every cached result under a namespace"""
+        shutil.rmtree(self.root / namespace, ignore_errors=True)
+
+# Shared cache instance for all tools
+tool_cache = FileCache(config.TOOL_CACHE_DIR)
+
+def _is_cacheable(result: Any) -> bool:
+    """Only cache successful responses - never errors or rate-limit notices"""
+    if not isinstance(result, str):
+        return False
+    try:
+        parsed = orjson.loads(result)
+    except orjson.JSONDecodeError:
+        return True
+    return not (isinstance(parsed, dict) and ("error" in parsed or "status" in parsed))
+
+# Ticker arguments are case- and whitespace-insensitive, so "aapl" and "AAPL" share an entry
+_SYMBOL_PARAMS = frozenset({"symbol", "symbols", "benchmark"})
+
+def _cache_key(arguments: Dict[str, Any]) -> str:
+    """Hash a tool call's bound arguments, normalizing ticker symbols first"""
+    normalized = {
+        name: ",".join(part.strip().upper() for part in value.split(","))
+        if name in _SYMBOL_PARAMS and isinstance(value, str) else value
+        for name, value in arguments.items()
+    }
+    return hashlib.md5(orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def cached_tool(cache_name: Optional[str] = None):
+    """
+    Cache a tool function's string result on disk for config.TOOL_CACHE_TTL[cache_name] seconds.
+    Hits return the stored text as-is, with no JSON re-serialization.
+    Place it between @tool and any rate limiter so cache hits skip the throttle entirely.
+    """
+    def decorator(func):
+        name = cache_name or func.__name__
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            ttl = config.TOOL_CACHE_TTL.get(name)
+            if not ttl:
+                return func(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = _cache_key(bound.arguments)
+            
+            cached = tool_cache.get(name, key, ttl)
+            if cached is not None:
+                logger.info(f"Tool cache hit: {name} {dict(bound.arguments)}")
+                return cached
+            
+            logger.info(f"Tool cache miss: {name} {dict(bound.arguments)}")
+            result = func(*args, **kwargs)
+            if _is_cacheable(result):
+                tool_cache.set(name, key, result)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+"""
+Virtual File System Write Log for DeepAgent Financial Systems
+Append-only log of virtual file writes, batched in memory and flushed with a
+single vectored write so many small agent writes share one syscall
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import List, Optional
+
+import orjson
+
+from config import config
+
+# Cap each writev() at the platform's iovec limit
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") and "SC_IOV_MAX" in os.sysconf_names else 1024
+
+def _write_all(fd: int, buffers: List[bytes]) -> None:
+    """Write every buffer to fd, using writev() where available and resuming partial writes"""
+    if not hasattr(os, "writev"):
+        data = memoryview(b"".join(buffers))
+        while data:
+            data = data[os.write(fd, data):]
+        return
+    
+    for start in range(0, len(buffers), _IOV_MAX):
+        chunk = buffers[start:start + _IOV_MAX]
+        expected = sum(len(b) for b in chunk)
+        written = os.writev(fd, chunk)
+        if written < expected:
+            # Partial write - finish the remainder as one contiguous buffer
+            remainder = memoryview(b"".join(chunk))[written:]
+            while remainder:
+                remainder = remainder[os.write(fd, remainder):]
+
+class VFSWriteLog:
+    """Batches (header, body) records and appends them to the log on size/count/age thresholds"""
+    
+    def __init__(
+        self,
+        path: str,
+        max_batch_bytes: int = 64 * 1024,
+        max_batch_entries: int = 1000,
+        max_batch_age: float = 5.0,
+    ):
+        self.path = path
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_entries = max_batch_entries
+        self.max_batch_age = max_batch_age
+        self.buf: List[bytes] = []
+        self.entries = 0
+        self.bytes_queued = 0
+        self.oldest: Optional[float] = None
+        self.lock = threading.Lock()
+        self.fd: Optional[int] = None
+    
+    def append(self, filename: str, content: str, timestamp: str) -> None:
+        """Queue one virtual file write, flushing if the batch is full or stale"""
+        body = content.encode()
+        header = orjson.dumps({"filename": filename, "size": len(body), "timestamp": timestamp}) + b"\n"
+        
+        with self.lock:
+            self.buf.append(header)
+            self.buf.append(body + b"\n")
+            self.entries += 1
+            self.bytes_queued += len(header) + len(body) + 1
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+            
+            if (
+                self.bytes_queued >= self.max_batch_bytes
+                or self.entries >= self.max_batch_entries
+                or time.monotonic() - self.oldest >= self.max_batch_age
+            ):
+                self._flush_locked()
+    
+    def flush(self) -> None:
+        """Write out everything queued so far"""
+        with self.lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        if not self.buf:
+            return
+        
+        if self.fd is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        
+        _write_all(self.fd, self.buf)
+        self.buf = []
+        self.entries = 0
+        self.bytes_queued = 0
+        self.oldest = None
+    
+    def close(self) -> None:
+        """Flush and release the log file"""
+        with self.lock:
+            self._flush_locked()
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+# Shared write log for the virtual file system tools
+vfs_log = VFSWriteLog(config.VFS_LOG_PATH)
+atexit.register(vfs_log.close)
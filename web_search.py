@@ -0,0 +1,144 @@
+"""
+Async Web Search for DeepAgent Financial Systems
+Tavily search over a pooled aiohttp session so web research doesn't block the
+event loop, with bounded concurrency and the shared on-disk tool cache.
+Sync calls reuse one pooled HTTP/2 client instead of a fresh connection each.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import aiohttp
+import httpx
+import orjson
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from config import config
+from tool_cache import tool_cache
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+FINANCIAL_NEWS_DOMAINS = ["bloomberg.com", "reuters.com", "wsj.com", "marketwatch.com", "cnbc.com", "sec.gov"]
+
+# Tavily request throttle shared by the sync and async paths (95% of the configured RPM)
+_RATE_LIMITER = InMemoryRateLimiter(
+    requests_per_second=config.TAVILY_REQUESTS_PER_MINUTE * 0.95 / 60,
+    check_every_n_seconds=0.05,
+    max_bucket_size=config.TAVILY_MAX_CONCURRENCY,
+)
+
+# Pooled connection for the sync path (agent.stream / invoke); keep-alive outlasts the
+# gaps between an agent's searches so back-to-back queries skip the TLS handshake
+_SYNC_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=config.TAVILY_MAX_CONCURRENCY, keepalive_expiry=60.0),
+    timeout=30.0,
+)
+atexit.register(_SYNC_CLIENT.close)
+
+# One pooled session + concurrency gate per event loop (aiohttp sessions are loop-bound)
+_SESSIONS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[aiohttp.ClientSession, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _get_session() -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+    """Get (or lazily create) the pooled session and semaphore for the running loop"""
+    loop = asyncio.get_running_loop()
+    entry = _SESSIONS.get(loop)
+    if entry is None or entry[0].closed:
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        )
+        entry = (session, asyncio.Semaphore(config.TAVILY_MAX_CONCURRENCY))
+        _SESSIONS[loop] = entry
+    return entry
+
+async def close_sessions() -> None:
+    """Close the pooled session for the running loop (call before the loop shuts down)"""
+    entry = _SESSIONS.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].close()
+
+class WebSearchInput(BaseModel):
+    query: str = Field(description="Search query for current financial news and market intelligence")
+
+class AsyncTavilySearch(BaseTool):
+    """Tavily web search with a native async path and cached results"""
+    
+    name: str = "web_search"
+    description: str = (
+        "Search the web for the latest financial news, market trends and company developments. "
+        "Input should be a search query. Returns a JSON list of results with url, title and content."
+    )
+    args_schema: Type[BaseModel] = WebSearchInput
+    api_key: str = ""
+    max_results: int = 5
+    search_depth: str = "advanced"
+    include_domains: List[str] = Field(default_factory=lambda: list(FINANCIAL_NEWS_DOMAINS))
+    
+    def _payload(self, query: str) -> Dict[str, Any]:
+        return {
+            "api_key": self.api_key or config.TAVILY_API_KEY,
+            "query": query,
+            "max_results": self.max_results,
+            "search_depth": self.search_depth,
+            "include_domains": self.include_domains,
+        }
+    
+    def _cache_key(self, query: str) -> str:
+        return hashlib.md5(
+            orjson.dumps([query, self.max_results, self.search_depth, self.include_domains])
+        ).hexdigest()
+    
+    @staticmethod
+    def _format(response: Dict[str, Any]) -> str:
+        results = [
+            {"url": item.get("url"), "title": item.get("title"), "content": item.get("content")}
+            for item in response.get("results", [])
+        ]
+        return orjson.dumps(results).decode()
+    
+    def _cached(self, query: str) -> Tuple[str, Optional[str]]:
+        key = self._cache_key(query)
+        return key, tool_cache.get(self.name, key, config.TOOL_CACHE_TTL.get(self.name, 0))
+    
+    def _run(self, query: str, run_manager=None) -> str:
+        key, cached = self._cached(query)
+        if cached is not None:
+            return cached
+        
+        _RATE_LIMITER.acquire()
+        try:
+            response = _SYNC_CLIENT.post(TAVILY_SEARCH_URL, json=self._payload(query))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            return orjson.dumps({"error": f"Web search failed: {e}"}).decode()
+        
+        result = self._format(response.json())
+        tool_cache.set(self.name, key, result)
+        return result
+    
+    async def _arun(self, query: str, run_manager=None) -> str:
+        key, cached = self._cached(query)
+        if cached is not None:
+            return cached
+        
+        session, semaphore = _get_session()
+        await _RATE_LIMITER.aacquire()
+        try:
+            async with semaphore:
+                async with session.post(TAVILY_SEARCH_URL, json=self._payload(query)) as response:
+                    response.raise_for_status()
+                    data = await response.json(loads=orjson.loads)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return orjson.dumps({"error": f"Web search failed: {e}"}).decode()
+        
+        result = self._format(data)
+        tool_cache.set(self.name, key, result)
+        return result